@@ -1,87 +1,193 @@
 # backend/api_clients.py
-import time
 import logging
 import requests
+import numpy as np
+import pandas as pd
 from datetime import datetime, timezone # Ensure timezone is imported from datetime
 from backend import config 
+from backend.http_transport import get_host_transport
+from backend.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+SECONDS_PER_DAY = 24 * 60 * 60
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+class ProviderUnavailableError(Exception):
+    """
+    A provider could not be asked at all: network error, 5xx/429 that outlasted the retries, rate limit,
+    or an open circuit breaker. Unlike a None result (the provider answered but had no candle), this says
+    nothing about whether the day exists, so callers must not negative-cache it.
+    """
+
+
+def _is_unavailable_status(status_code: int) -> bool:
+    """HTTP statuses that mean "try again later" rather than "no such data"."""
+    return status_code == 429 or status_code >= 500
+
+
+def _today_start_ts() -> int:
+    now_ts = int(datetime.now(timezone.utc).timestamp())
+    return now_ts - now_ts % SECONDS_PER_DAY
+
+def _kraken_response_ok(response) -> bool:
+    """Response-cache validator: Kraken reports errors (e.g. EAPI:Rate limit exceeded) inside 200 responses."""
+    try:
+        return not response.json().get('error')
+    except ValueError:
+        return False
+
+def _kraken_rate_limited(response) -> bool:
+    """Transport check: a 200 carrying EAPI:Rate limit exceeded counts against Kraken's circuit breaker, like a 429."""
+    try:
+        return "EAPI:Rate limit exceeded" in str(response.json().get('error'))
+    except ValueError:
+        return False
+
+def _empty_ohlcv_frame() -> pd.DataFrame:
+    """Range results share one layout: float64 OHLCV plus 'source', indexed by UTC day-start timestamps."""
+    return pd.DataFrame({**{col: pd.Series(dtype=np.float64) for col in OHLCV_COLUMNS}, 'source': pd.Series(dtype=object)},
+                        index=pd.DatetimeIndex([], tz='UTC'))
+
 class CoinGeckoAPI:
+    def __init__(self):
+        # Pooled session, rate limiter, concurrency slot and 429/5xx retries, shared with every other
+        # CoinGeckoAPI user in this process (request threads and scripts alike)
+        self.rate_limiter = get_rate_limiter('coingecko')
+
+    @property
+    def transport(self):
+        # Resolved per call, so pointing config.COINGECKO_API_BASE_URL elsewhere (e.g. the local mock exchange) takes effect
+        return get_host_transport(config.COINGECKO_API_BASE_URL, 'coingecko')
+
     def get_ohlcv_for_date(self, date_obj_utc: datetime, 
                            retries=config.COINGECKO_RETRIES, 
                            delay=config.COINGECKO_DELAY):
         date_str_coingecko_format = date_obj_utc.strftime('%d-%m-%Y')
         url = f"{config.COINGECKO_API_BASE_URL}/coins/bitcoin/history?date={date_str_coingecko_format}&localization=false"
-        for attempt in range(retries):
-            try:
-                # Apply delay logic: initial delay * attempt for simple linear backoff,
-                # or delay * (2**attempt) for exponential if preferred for rate limits.
-                # For now, simple incremental delay based on attempt number.
-                time.sleep(delay * attempt if attempt > 0 else 0) 
-                logger.info(f"CoinGeckoAPI: Fetching history for {date_str_coingecko_format} (Date: {date_obj_utc.date()}), Attempt {attempt + 1}")
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if data.get('market_data') and data['market_data'].get('current_price') and data['market_data']['current_price'].get('usd'):
-                    price = data['market_data']['current_price']['usd']
-                    volume = data['market_data'].get('total_volume', {}).get('usd', 0)
-                    return {'open': price, 'high': price, 'low': price, 'close': price, 
-                            'volume': volume, 'source': 'coingecko'}
-                else: 
-                    logger.warning(f"CoinGeckoAPI: No price data for {date_str_coingecko_format}. Response: {str(data)[:200]}")
-                    return None
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 429: 
-                    current_retry_delay = delay * (2 ** (attempt + 1)) # Exponential backoff for rate limit
-                    logger.warning(f"CoinGeckoAPI: Rate limit hit for {date_str_coingecko_format} (Attempt {attempt + 1}). Retrying in {current_retry_delay}s...")
-                    if attempt == retries - 1: 
-                        logger.error(f"CoinGeckoAPI: Error after {retries} retries for {date_str_coingecko_format}: {e}")
-                        return None
-                    time.sleep(current_retry_delay) 
-                    continue
-                logger.error(f"CoinGeckoAPI: HTTP error for {date_str_coingecko_format}: {e} - Response: {str(e.response.text)[:200]}"); return None
-            except requests.exceptions.RequestException as e: # More general network issues
-                logger.error(f"CoinGeckoAPI: Request error for {date_str_coingecko_format}: {e}")
-                if attempt == retries - 1: return None
-                time.sleep(delay * (attempt + 1)) # Simple linear backoff for other request errors
-            except Exception as e: 
-                logger.error(f"CoinGeckoAPI: Unexpected error for {date_str_coingecko_format}: {e}", exc_info=True); return None
-        return None
+        try:
+            logger.info(f"CoinGeckoAPI: Fetching history for {date_str_coingecko_format} (Date: {date_obj_utc.date()})")
+            # The transport paces the call and retries 429/5xx/network errors (retries = total attempts here)
+            response = self.transport.get(url, timeout=10, retries=retries - 1, backoff_base_seconds=delay,
+                                          cache_endpoint='coingecko_history',
+                                          cache_permanent=int(date_obj_utc.timestamp()) < _today_start_ts())
+            response.raise_for_status()
+            data = response.json()
+            if data.get('market_data') and data['market_data'].get('current_price') and data['market_data']['current_price'].get('usd'):
+                price = data['market_data']['current_price']['usd']
+                volume = data['market_data'].get('total_volume', {}).get('usd', 0)
+                return {'open': price, 'high': price, 'low': price, 'close': price, 
+                        'volume': volume, 'source': 'coingecko'}
+            else: 
+                logger.warning(f"CoinGeckoAPI: No price data for {date_str_coingecko_format}. Response: {str(data)[:200]}")
+                return None
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"CoinGeckoAPI: HTTP error for {date_str_coingecko_format}: {e} - Response: {str(e.response.text)[:200]}")
+            if _is_unavailable_status(e.response.status_code):
+                raise ProviderUnavailableError(f"CoinGecko HTTP {e.response.status_code} for {date_str_coingecko_format}") from e
+            return None
+        except requests.exceptions.RequestException as e: # Network issues that outlasted the transport's retries, open breaker
+            logger.error(f"CoinGeckoAPI: Request error for {date_str_coingecko_format}: {e}")
+            raise ProviderUnavailableError(f"CoinGecko request failed for {date_str_coingecko_format}: {e}") from e
+        except Exception as e: 
+            logger.error(f"CoinGeckoAPI: Unexpected error for {date_str_coingecko_format}: {e}", exc_info=True); return None
+
+    def get_ohlcv_range(self, start_date_utc: datetime, end_date_utc: datetime,
+                        retries=config.COINGECKO_RETRIES,
+                        delay=config.COINGECKO_DELAY) -> pd.DataFrame:
+        """
+        Fetches daily prices and volumes for a whole window from /coins/bitcoin/market_chart/range.
+        Like /history, each day uses the first price point of that UTC day for O=H=L=C and the
+        24h volume reported at that point. CoinGecko returns hourly points for windows up to 90 days
+        and daily points beyond that; either way one response covers the window.
+        Result: float64 OHLCV + 'source' DataFrame indexed by UTC day-start timestamps (empty on failure).
+        """
+        start_day_utc = start_date_utc.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_day_utc = end_date_utc.replace(hour=0, minute=0, second=0, microsecond=0)
+        range_label = f"{start_day_utc.date()}..{end_day_utc.date()}"
+        url = f"{config.COINGECKO_API_BASE_URL}/coins/bitcoin/market_chart/range"
+        params = {'vs_currency': 'usd',
+                  'from': int(start_day_utc.timestamp()),
+                  'to': int(end_day_utc.timestamp()) + SECONDS_PER_DAY - 1} # Include the whole last day
+
+        try:
+            logger.info(f"CoinGeckoAPI: Fetching market_chart range {range_label}")
+            response = self.transport.get(url, params=params, timeout=20, retries=retries - 1, backoff_base_seconds=delay,
+                                          cache_endpoint='coingecko_market_chart_range',
+                                          cache_permanent=params['to'] < _today_start_ts())
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"CoinGeckoAPI: HTTP error for range {range_label}: {e} - Response: {str(e.response.text)[:200]}")
+            return _empty_ohlcv_frame()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"CoinGeckoAPI: Request error for range {range_label}: {e}")
+            return _empty_ohlcv_frame()
+        except Exception as e:
+            logger.error(f"CoinGeckoAPI: Unexpected error for range {range_label}: {e}", exc_info=True)
+            return _empty_ohlcv_frame()
+
+        if not data or not data.get('prices'):
+            logger.warning(f"CoinGeckoAPI: No price data for range {range_label}. Response: {str(data)[:200]}")
+            return _empty_ohlcv_frame()
+
+        prices = pd.DataFrame(data['prices'], columns=['ts_ms', 'price']).dropna()
+        volumes = pd.DataFrame(data.get('total_volumes') or [], columns=['ts_ms', 'volume'])
+        points = prices.merge(volumes, on='ts_ms', how='left').sort_values('ts_ms')
+        points['day'] = pd.to_datetime(points['ts_ms'], unit='ms', utc=True).dt.floor('D')
+        daily_points = points.groupby('day', sort=True).first()
+        daily_points = daily_points.loc[(daily_points.index >= pd.Timestamp(start_day_utc)) & (daily_points.index <= pd.Timestamp(end_day_utc))]
+
+        price_values = daily_points['price'].to_numpy(dtype=np.float64)
+        range_df = pd.DataFrame({'open': price_values, 'high': price_values, 'low': price_values, 'close': price_values,
+                                 'volume': daily_points['volume'].fillna(0).to_numpy(dtype=np.float64),
+                                 'source': 'coingecko'}, index=daily_points.index.rename(None))
+        logger.info(f"CoinGeckoAPI: Got {len(range_df)} daily prices for range {range_label}.")
+        return range_df
 
 
 class KrakenAPI:
+    def __init__(self):
+        # Pooled session, rate limiter, concurrency slot and 429/5xx retries, shared with every other
+        # KrakenAPI user in this process (request threads and scripts alike)
+        self.rate_limiter = get_rate_limiter('kraken')
+
+    @property
+    def transport(self):
+        # Resolved per call, so pointing config.KRAKEN_API_BASE_URL elsewhere (e.g. the local mock exchange) takes effect
+        return get_host_transport(config.KRAKEN_API_BASE_URL, 'kraken')
+
     def get_ohlcv_for_date(self, date_obj_utc: datetime, pair='XXBTZUSD', interval=1440, 
                            retries=config.KRAKEN_RETRIES, 
                            delay_seconds=config.KRAKEN_DELAY_SECONDS):
         target_day_start_ts = int(date_obj_utc.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
-        current_since_ts = target_day_start_ts 
+        current_since_ts = target_day_start_ts - SECONDS_PER_DAY # 'since' is exclusive on Kraken's side; start one day early
 
         url = config.KRAKEN_API_BASE_URL
         
         for attempt in range(retries):
-            if attempt > 0 and current_since_ts == target_day_start_ts: 
-                logger.info(f"KrakenAPI: Retrying with 'since' as 1 day earlier for {date_obj_utc.date()}")
-                current_since_ts = target_day_start_ts - (24 * 60 * 60)
-            
             params = {'pair': pair, 'interval': interval, 'since': current_since_ts}
 
             try:
-                if attempt > 0: time.sleep(delay_seconds * (2**attempt)) 
-                
                 logger.info(f"KrakenAPI: Attempt {attempt+1} for {pair} on {date_obj_utc.strftime('%Y-%m-%d')} (Target TS: {target_day_start_ts}, using since={current_since_ts})")
-                response = requests.get(url, params=params, timeout=15)
+                # HTTP-level retries (429/5xx/network) happen inside the transport; this loop handles Kraken's own errors
+                # Once the target day is over its candle is final, so the response can be cached for good
+                response = self.transport.get(url, params=params, timeout=15, backoff_base_seconds=delay_seconds,
+                                              cache_endpoint='kraken_ohlc', cache_validator=_kraken_response_ok, rate_limited=_kraken_rate_limited,
+                                              cache_permanent=target_day_start_ts < _today_start_ts())
                 response.raise_for_status()
                 data = response.json()
 
                 if 'error' in data and data['error']:
                     error_str = str(data['error'])
                     logger.error(f"KrakenAPI: API error for {date_obj_utc.date()}: {error_str}")
-                    if "EAPI:Rate limit exceeded" in error_str and attempt < retries - 1:
+                    if "EAPI:Rate limit exceeded" in error_str:
                         current_retry_delay = delay_seconds * (2**(attempt + 1))
-                        logger.info(f"KrakenAPI: Rate limit, retrying in {current_retry_delay}s...")
-                        time.sleep(current_retry_delay)
-                        continue 
+                        self.rate_limiter.penalize(current_retry_delay) # Holds back every thread, not just this one
+                        if attempt < retries - 1:
+                            logger.info(f"KrakenAPI: Rate limit, retrying in {current_retry_delay}s...")
+                            continue 
+                        raise ProviderUnavailableError(f"Kraken rate limit for {date_obj_utc.date()} after {retries} attempts")
                     return None 
 
                 result_pair_key = pair
@@ -94,10 +200,6 @@ class KrakenAPI:
 
                 if result_pair_key and data['result'].get(result_pair_key):
                     candles = data['result'][result_pair_key]
-                    if not candles and attempt == 0 and current_since_ts == target_day_start_ts:
-                        logger.warning(f"KrakenAPI: No candles returned for {date_obj_utc.date()} with precise since={target_day_start_ts}. Will retry with earlier 'since'.")
-                        continue 
-
                     for candle_data_list in candles:
                         if int(candle_data_list[0]) == target_day_start_ts:
                             logger.info(f"KrakenAPI: Found exact match for TS {target_day_start_ts} for date {date_obj_utc.date()}")
@@ -105,16 +207,15 @@ class KrakenAPI:
                                     'low': float(candle_data_list[3]), 'close': float(candle_data_list[4]), 
                                     'volume': float(candle_data_list[6]), 'source': 'kraken'}
                     
-                    if current_since_ts < target_day_start_ts: 
-                        for candle_data_list in candles:
-                            candle_ts = int(candle_data_list[0])
-                            # Use datetime.timezone.utc directly
-                            candle_dt_utc = datetime.fromtimestamp(candle_ts, tz=timezone.utc)
-                            if candle_dt_utc.date() == date_obj_utc.date():
-                                logger.warning(f"KrakenAPI: No exact 00:00 UTC candle for {date_obj_utc.date()}. Using first available candle for that day (starts at {candle_dt_utc.time()}).")
-                                return {'open': float(candle_data_list[1]), 'high': float(candle_data_list[2]),
-                                        'low': float(candle_data_list[3]), 'close': float(candle_data_list[4]), 
-                                        'volume': float(candle_data_list[6]), 'source': 'kraken_adjusted_time'}
+                    for candle_data_list in candles:
+                        candle_ts = int(candle_data_list[0])
+                        # Use datetime.timezone.utc directly
+                        candle_dt_utc = datetime.fromtimestamp(candle_ts, tz=timezone.utc)
+                        if candle_dt_utc.date() == date_obj_utc.date():
+                            logger.warning(f"KrakenAPI: No exact 00:00 UTC candle for {date_obj_utc.date()}. Using first available candle for that day (starts at {candle_dt_utc.time()}).")
+                            return {'open': float(candle_data_list[1]), 'high': float(candle_data_list[2]),
+                                    'low': float(candle_data_list[3]), 'close': float(candle_data_list[4]), 
+                                    'volume': float(candle_data_list[6]), 'source': 'kraken_adjusted_time'}
                     
                     logger.warning(f"KrakenAPI: No suitable candle found for {date_obj_utc.date()} (Target TS: {target_day_start_ts}). Returned (up to 2): {str(candles[:2])[:200]}")
                     return None 
@@ -123,16 +224,131 @@ class KrakenAPI:
                     return None
             except requests.exceptions.HTTPError as e:
                 logger.error(f"KrakenAPI: HTTP error {e.response.status_code} for {date_obj_utc.date()}: {str(e.response.text)[:200]}")
-                if e.response.status_code in [500,502,503,504,520] and attempt < retries-1: continue
+                if _is_unavailable_status(e.response.status_code):
+                    raise ProviderUnavailableError(f"Kraken HTTP {e.response.status_code} for {date_obj_utc.date()}") from e
                 return None
-            except requests.exceptions.RequestException as e:
+            except requests.exceptions.RequestException as e: # Outlasted the transport's retries, or open breaker
                 logger.error(f"KrakenAPI: Request error for {date_obj_utc.date()}: {e}")
-                if attempt == retries - 1: return None
-                time.sleep(delay_seconds * (attempt+1))
+                raise ProviderUnavailableError(f"Kraken request failed for {date_obj_utc.date()}: {e}") from e
             except Exception as e:
                 logger.error(f"KrakenAPI: Unexpected error for {date_obj_utc.date()}: {e}", exc_info=True)
                 return None
         return None
 
+    def _fetch_ohlc_page(self, pair: str, interval: int, since_ts: int, retries: int, delay_seconds: float, label: str,
+                         cache_permanent: bool = False):
+        """
+        Requests one OHLC page (Kraken returns up to 720 candles after 'since').
+        Returns (candles, last_cursor) or None if the request failed after all retries.
+        """
+        params = {'pair': pair, 'interval': interval, 'since': since_ts}
+        for attempt in range(retries):
+            try:
+                logger.info(f"KrakenAPI: Attempt {attempt+1} for {pair} page {label} (since={since_ts})")
+                response = self.transport.get(config.KRAKEN_API_BASE_URL, params=params, timeout=15, backoff_base_seconds=delay_seconds,
+                                              cache_endpoint='kraken_ohlc', cache_validator=_kraken_response_ok, rate_limited=_kraken_rate_limited,
+                                              cache_permanent=cache_permanent)
+                response.raise_for_status()
+                data = response.json()
+
+                if 'error' in data and data['error']:
+                    error_str = str(data['error'])
+                    logger.error(f"KrakenAPI: API error for page {label}: {error_str}")
+                    if "EAPI:Rate limit exceeded" in error_str:
+                        current_retry_delay = delay_seconds * (2**(attempt + 1))
+                        self.rate_limiter.penalize(current_retry_delay)
+                        if attempt < retries - 1:
+                            logger.info(f"KrakenAPI: Rate limit, retrying in {current_retry_delay}s...")
+                            continue
+                    return None
+
+                result = data.get('result', {})
+                result_pair_key = pair if pair in result else None
+                if result_pair_key is None:
+                    alt_pair = pair.replace("XXBT", "XBT") if "XXBT" in pair else pair.replace("XBT", "XXBT")
+                    result_pair_key = alt_pair if alt_pair in result else None
+                if result_pair_key is None:
+                    logger.warning(f"KrakenAPI: No data for {pair} or unexpected format for page {label}. Response: {str(data)[:200]}")
+                    return None
+                last_cursor = result.get('last')
+                candles = result[result_pair_key] or []
+                cache_stored_at = getattr(response, 'cache_stored_at', None)
+                if cache_stored_at is not None:
+                    # A page always runs up to the time it was fetched; drop candles that were still forming then
+                    candles = [c for c in candles if int(c[0]) + interval * 60 <= cache_stored_at]
+                return candles, (int(last_cursor) if last_cursor is not None else None)
+            except requests.exceptions.HTTPError as e:
+                logger.error(f"KrakenAPI: HTTP error {e.response.status_code} for page {label}: {str(e.response.text)[:200]}")
+                return None
+            except requests.exceptions.RequestException as e: # Outlasted the transport's retries
+                logger.error(f"KrakenAPI: Request error for page {label}: {e}")
+                return None
+            except Exception as e:
+                logger.error(f"KrakenAPI: Unexpected error for page {label}: {e}", exc_info=True)
+                return None
+        return None
+
+    def get_ohlcv_range(self, start_date_utc: datetime, end_date_utc: datetime, pair='XXBTZUSD', interval=1440,
+                        retries=config.KRAKEN_RETRIES,
+                        delay_seconds=config.KRAKEN_DELAY_SECONDS) -> pd.DataFrame:
+        """
+        Returns every daily candle from start to end (inclusive), paging through 'since'.
+        Each page covers up to 720 days, so a one-year gap normally takes a single call.
+        Note Kraken only serves roughly the most recent 720 candles per interval; older days come back empty.
+        Result: float64 OHLCV + 'source' DataFrame indexed by UTC day-start timestamps (empty on failure).
+        result.attrs['oldest_served_utc'] is the day of the oldest candle Kraken returned, before the
+        start..end filter (None if no page came back), so callers can tell where Kraken's window begins
+        even when none of the requested days are in it.
+        """
+        start_ts = int(start_date_utc.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+        end_ts = int(end_date_utc.replace(hour=0, minute=0, second=0, microsecond=0).timestamp())
+        range_label = f"{start_date_utc.date()}..{end_date_utc.date()}"
+
+        rows_by_day_ts = {}
+        oldest_served_ts = None
+        since_ts = start_ts - SECONDS_PER_DAY # 'since' is exclusive on Kraken's side; start one day early
+        for page_num in range(config.KRAKEN_RANGE_MAX_PAGES):
+            page = self._fetch_ohlc_page(pair, interval, since_ts, retries, delay_seconds, f"{range_label} #{page_num + 1}",
+                                         cache_permanent=end_ts < _today_start_ts())
+            if page is None:
+                break
+            candles, last_cursor = page
+            page_oldest_ts = min((int(c[0]) for c in candles), default=None)
+            if page_oldest_ts is not None and (oldest_served_ts is None or page_oldest_ts < oldest_served_ts):
+                oldest_served_ts = page_oldest_ts
+            for candle_data_list in candles:
+                candle_ts = int(candle_data_list[0])
+                day_ts = candle_ts - candle_ts % SECONDS_PER_DAY
+                if not (start_ts <= day_ts <= end_ts):
+                    continue
+                exact_match = candle_ts == day_ts
+                if not exact_match and day_ts in rows_by_day_ts:
+                    continue # Keep the exact (or first) candle for the day
+                rows_by_day_ts[day_ts] = [float(candle_data_list[1]), float(candle_data_list[2]),
+                                          float(candle_data_list[3]), float(candle_data_list[4]),
+                                          float(candle_data_list[6]), 'kraken' if exact_match else 'kraken_adjusted_time']
+
+            newest_candle_ts = max((int(c[0]) for c in candles), default=None)
+            if newest_candle_ts is None or newest_candle_ts >= end_ts or last_cursor is None or last_cursor <= since_ts:
+                break
+            since_ts = last_cursor
+
+        oldest_served_utc = None
+        if oldest_served_ts is not None:
+            oldest_served_utc = datetime.fromtimestamp(oldest_served_ts - oldest_served_ts % SECONDS_PER_DAY, tz=timezone.utc)
+
+        if not rows_by_day_ts:
+            logger.warning(f"KrakenAPI: No candles returned for range {range_label}"
+                           f"{f' (oldest candle served: {oldest_served_utc.date()})' if oldest_served_utc else ''}.")
+            range_df = _empty_ohlcv_frame()
+        else:
+            range_df = pd.DataFrame.from_dict(rows_by_day_ts, orient='index', columns=OHLCV_COLUMNS + ['source'])
+            range_df.index = pd.to_datetime(range_df.index, unit='s', utc=True)
+            range_df[OHLCV_COLUMNS] = range_df[OHLCV_COLUMNS].astype(np.float64)
+            range_df = range_df.sort_index()
+            logger.info(f"KrakenAPI: Got {len(range_df)} daily candles for range {range_label}.")
+        range_df.attrs['oldest_served_utc'] = oldest_served_utc
+        return range_df
+
 coingecko_api_client = CoinGeckoAPI()
 kraken_api_client = KrakenAPI()
\ No newline at end of file
@@ -0,0 +1,177 @@
+# backend/asof_indicators.py
+import time
+import logging
+import numpy as np
+import pandas as pd
+
+from backend import config
+from backend.indicator_calculator import crsi_rank_len, resample_bin_end_days
+from backend.indicators import batch
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+ASOF_TIMEFRAMES = (('monthly', 'ME'), ('weekly', 'W-MON')) # Same rules as indicator_service
+# Output column prefix per indicator key, as in the calculated_indicators table (rsi_monthly, stoch_rsi_weekly, ...)
+ASOF_COLUMN_NAMES = {
+    'rsi': 'rsi', 'stochRsi': 'stoch_rsi', 'mfi': 'mfi', 'crsi': 'crsi',
+    'williamsR': 'williams_r', 'rvi': 'rvi', 'adaptiveRsi': 'adaptive_rsi',
+}
+
+
+def _aggregate_bins(ohlcv: pd.DataFrame, bin_ids: np.ndarray):
+    """
+    Three OHLCV tables for the bins (weeks/months) of a sorted daily frame, with resample_ohlc_data's
+    NaN handling (first/last valid open/close, NaN-skipping max/min, volume sum):
+    complete bins (one row per bin), bin-to-date per day (bin start through that day, the
+    partial last bar of a window) and day-to-bin-end per day (the truncated first bar of a window).
+    """
+    bins = pd.Series(bin_ids, index=ohlcv.index)
+    grouped = ohlcv.groupby(bins, sort=False)
+    complete = pd.DataFrame({'open': grouped['open'].first(), 'high': grouped['high'].max(), 'low': grouped['low'].min(),
+                             'close': grouped['close'].last(), 'volume': grouped['volume'].sum()})
+
+    def to_date(frame: pd.DataFrame, frame_bins: pd.Series, frame_grouped) -> pd.DataFrame:
+        opened = frame_grouped['open'].ffill().notna() # A valid open has been seen in this bin
+        return pd.DataFrame({
+            'open': frame_grouped['open'].transform('first').where(opened),
+            'high': frame_grouped['high'].cummax().groupby(frame_bins).ffill(),
+            'low': frame_grouped['low'].cummin().groupby(frame_bins).ffill(),
+            'close': frame_grouped['close'].ffill(),
+            'volume': frame['volume'].fillna(0.0).groupby(frame_bins).cumsum(),
+        })
+
+    bin_to_date = to_date(ohlcv, bins, grouped)
+    # Day-to-bin-end is bin-to-date over the reversed days, with open and close swapping roles
+    reversed_ohlcv = ohlcv.iloc[::-1].rename(columns={'open': 'close', 'close': 'open'})
+    reversed_bins = bins.iloc[::-1]
+    to_bin_end = to_date(reversed_ohlcv, reversed_bins, reversed_ohlcv.groupby(reversed_bins, sort=False))
+    to_bin_end = to_bin_end.rename(columns={'open': 'close', 'close': 'open'}).iloc[::-1]
+    return complete, bin_to_date, to_bin_end
+
+
+def _timeframe_frames(daily_values: np.ndarray, bin_ids: np.ndarray, window_starts: np.ndarray, targets: np.ndarray):
+    """
+    Yields (target positions, (frames, bars, 5) array) groups: for each target day, the OHLCV bars
+    resample_ohlc_data would build from the daily rows window_starts[t]..targets[t]. A window's bars are
+    its truncated first bin, the complete bins in between (shared by every window, never re-aggregated)
+    and its partial last bin. Targets are grouped by frame layout so each group stacks into one array.
+    """
+    ohlcv = pd.DataFrame(daily_values, columns=OHLCV_COLUMNS)
+    complete, bin_to_date, to_bin_end = _aggregate_bins(ohlcv, bin_ids)
+    complete_values = complete[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+    bin_to_date_values = bin_to_date[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+    to_bin_end_values = to_bin_end[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+
+    # Like resample_ohlc_data, bins whose open/high/low/close are all NaN are dropped
+    complete_kept = ~np.isnan(complete_values[:, :4]).all(axis=1)
+    kept_values = complete_values[complete_kept]
+    kept_before = np.concatenate([[0], np.cumsum(complete_kept)]) # Kept bins among the first k bins
+    bin_positions = np.concatenate([[0], np.cumsum(bin_ids[1:] != bin_ids[:-1])]) # Bin number of each day
+
+    first_bins, last_bins = bin_positions[window_starts], bin_positions[targets]
+    # Windows always span two or more bins here (callers only pass windows of MIN_DAILY_ROWS_FOR_INDICATORS+ days)
+    middle_starts = kept_before[first_bins + 1]
+    middle_counts = kept_before[last_bins] - middle_starts
+    head_kept = ~np.isnan(to_bin_end_values[window_starts, :4]).all(axis=1)
+    tail_kept = ~np.isnan(bin_to_date_values[targets, :4]).all(axis=1)
+
+    layouts = np.stack([head_kept, tail_kept, middle_counts], axis=1)
+    for layout in np.unique(layouts, axis=0):
+        has_head, has_tail, middle_count = bool(layout[0]), bool(layout[1]), int(layout[2])
+        members = np.flatnonzero((layouts == layout).all(axis=1))
+        parts = []
+        if has_head:
+            parts.append(to_bin_end_values[window_starts[members]][:, None, :])
+        parts.append(kept_values[middle_starts[members][:, None] + np.arange(middle_count)])
+        if has_tail:
+            parts.append(bin_to_date_values[targets[members]][:, None, :])
+        yield members, np.concatenate(parts, axis=1)
+
+
+def _frame_indicators(frames: np.ndarray, timeframe_label: str) -> dict:
+    """Last value of every indicator for each frame of a (frames, bars, 5) group, like calculate_indicators_from_ohlc_df."""
+    open_, high, low, close, volume = (np.ascontiguousarray(frames[:, :, column]) for column in range(5))
+    bar_count = frames.shape[1]
+    params = {key: config.get_indicator_params(key, timeframe_label) for key in ASOF_COLUMN_NAMES}
+
+    # Shared intermediates, as IndicatorContext shares them for a single frame
+    rsi_cache = {}
+    def rsi_of_close(period):
+        if period not in rsi_cache:
+            rsi_cache[period] = batch.rsi(close, period)
+        return rsi_cache[period]
+
+    stoch_params, crsi_params, adaptive_params = params['stochRsi'], params['crsi'], params['adaptiveRsi']
+    series = {
+        'rsi': rsi_of_close(params['rsi'].get('period', 14)),
+        'stochRsi': batch.stoch_rsi(close, stoch_params.get('rsi_period', 14), stoch_params.get('stoch_period', 14), stoch_params.get('k_smooth', 3),
+                                    rsi_series=rsi_of_close(stoch_params.get('rsi_period', 14))),
+        'mfi': batch.mfi(high, low, close, volume, params['mfi'].get('period', 14)),
+        'crsi': batch.crsi(close, crsi_params.get('rsi_short_len', 3), crsi_params.get('rsi_streak_len', 2),
+                           crsi_rank_len(crsi_params, timeframe_label, bar_count),
+                           rsi_short=rsi_of_close(crsi_params.get('rsi_short_len', 3))),
+        'williamsR': batch.williams_r(high, low, close, params['williamsR'].get('period', 14)),
+        'rvi': batch.rvi(open_, high, low, close, params['rvi'].get('period', 10)),
+        'adaptiveRsi': batch.adaptive_rsi(close, adaptive_params.get('period', 14), adaptive_params.get('kama_n', 10),
+                                          adaptive_params.get('kama_fast_ema', 2), adaptive_params.get('kama_slow_ema', 30),
+                                          rsi_fallback=rsi_of_close(adaptive_params.get('period', 14))),
+    }
+    results = {key: batch.last_valid(values) for key, values in series.items()}
+
+    # calculate_indicators_from_ohlc_df's frame-level guards: too few bars, or no close at all
+    unusable = np.isnan(close).all(axis=1) | (bar_count < config.MIN_CANDLES_FOR_CALCULATION)
+    for values in results.values():
+        values[unusable] = np.nan
+    return results
+
+
+def compute_asof_indicators(daily_df: pd.DataFrame, start_date=None, end_date=None, years: int = 2) -> pd.DataFrame:
+    """
+    For every day D of daily_df (optionally limited to start_date..end_date), the monthly and weekly
+    indicator values get_indicator_data would calculate on D: the daily rows of the `years`-year window
+    ending at D, resampled with the current month/week as a partial bar. Returns one row per day with
+    price_at_event (D's close) and <indicator>_monthly / <indicator>_weekly columns named as in the
+    calculated_indicators table; NaN where the service would return None.
+
+    Instead of resampling and recalculating D's frames one date at a time, bins are aggregated once
+    (complete bins plus running bin-to-date and day-to-bin-end aggregates), every window's frame is
+    assembled from them, and frames with the same number of bars are evaluated together by the batched
+    indicators in backend/indicators/batch.py.
+    """
+    started = time.perf_counter()
+    daily_df = daily_df.sort_index()
+    day_numbers = np.asarray(pd.DatetimeIndex(daily_df.index).as_unit('s').asi8 // SECONDS_PER_DAY, dtype=np.int64)
+    daily_values = np.column_stack([pd.to_numeric(daily_df[col], errors='coerce').to_numpy(dtype=np.float64) if col in daily_df.columns
+                                    else np.full(len(daily_df), np.nan) for col in OHLCV_COLUMNS])
+
+    first_target = 0 if start_date is None else int(np.searchsorted(day_numbers, pd.Timestamp(start_date).value // (SECONDS_PER_DAY * 10**9), side='left'))
+    stop_target = len(day_numbers) if end_date is None else int(np.searchsorted(day_numbers, pd.Timestamp(end_date).value // (SECONDS_PER_DAY * 10**9), side='right'))
+    targets = np.arange(first_target, stop_target)
+    result = pd.DataFrame(index=daily_df.index[targets])
+    result['price_at_event'] = daily_values[targets, 3]
+    for key, column_name in ASOF_COLUMN_NAMES.items():
+        for timeframe_label, _ in ASOF_TIMEFRAMES:
+            result[f"{column_name}_{timeframe_label}"] = np.nan
+    if len(targets) == 0:
+        return result
+
+    # Same window as get_historical_data_for_indicators(D, years): D - years*365 days through D
+    window_starts = np.searchsorted(day_numbers, day_numbers[targets] - years * 365, side='left')
+    # Windows with too few daily rows get no indicators (indicator_service returns price only)
+    eligible = (targets - window_starts + 1) >= config.MIN_DAILY_ROWS_FOR_INDICATORS
+    eligible_rows = np.flatnonzero(eligible)
+
+    for timeframe_label, rule in ASOF_TIMEFRAMES:
+        bin_ids = resample_bin_end_days(day_numbers, rule)
+        group_count = 0
+        for members, frames in _timeframe_frames(daily_values, bin_ids, window_starts[eligible], targets[eligible]):
+            group_count += 1
+            rows = eligible_rows[members]
+            for key, values in _frame_indicators(frames, timeframe_label).items():
+                result.iloc[rows, result.columns.get_loc(f"{ASOF_COLUMN_NAMES[key]}_{timeframe_label}")] = values
+        logger.debug(f"AsOf: {timeframe_label} frames for {len(eligible_rows)} days evaluated in {group_count} batches.")
+
+    logger.info(f"AsOf: Indicators for {len(targets)} days ({len(eligible_rows)} with enough history) in {time.perf_counter() - started:.2f}s.")
+    return result
@@ -0,0 +1,147 @@
+# backend/circuit_breaker.py
+import time
+import logging
+import threading
+from collections import deque
+import requests
+
+from backend import config
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """The provider's breaker is open; the call was skipped without touching the network."""
+
+
+class CircuitBreaker:
+    """
+    Per-provider breaker over a rolling window of recent call outcomes (last window_size calls, none
+    older than window_seconds). A call counts as bad when it failed (connection error, 429, 5xx) or
+    took longer than slow_call_seconds. Once min_calls outcomes are in the window and the bad share
+    reaches failure_rate_threshold, the breaker opens and every call is refused for cooldown_seconds.
+    After that a single trial call is let through (half-open): success closes the breaker, failure
+    opens it for another cooldown.
+    """
+    def __init__(self, name: str, settings: dict = None):
+        self.name = name
+        settings = {**config.CIRCUIT_BREAKER_SETTINGS, **(settings or {})}
+        self.window_size = int(settings['window_size'])
+        self.window_seconds = float(settings['window_seconds'])
+        self.min_calls = int(settings['min_calls'])
+        self.failure_rate_threshold = float(settings['failure_rate_threshold'])
+        self.slow_call_seconds = float(settings['slow_call_seconds'])
+        self.cooldown_seconds = float(settings['cooldown_seconds'])
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=self.window_size) # (monotonic time, ok, latency_seconds)
+        self._state = CLOSED
+        self._opened_at = None
+        self._trial_started_at = None # Set while the half-open trial call is in flight
+        self.times_opened = 0
+
+    def _prune(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _refresh_state(self, now: float):
+        if self._state == OPEN and now - self._opened_at >= self.cooldown_seconds:
+            self._state = HALF_OPEN
+            self._trial_started_at = None
+            logger.info(f"CircuitBreaker[{self.name}]: Cooldown over, letting one trial call through (half-open).")
+
+    def _open(self, now: float, reason: str):
+        self._state = OPEN
+        self._opened_at = now
+        self._trial_started_at = None
+        self.times_opened += 1
+        logger.warning(f"CircuitBreaker[{self.name}]: Opened ({reason}). Skipping provider for {self.cooldown_seconds:.0f}s.")
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_state(time.monotonic())
+            return self._state
+
+    def allow_request(self) -> bool:
+        """True if a call may go out now. In half-open state only one trial call is in flight at a time."""
+        with self._lock:
+            now = time.monotonic()
+            self._refresh_state(now)
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                return False
+            # Half-open: a trial that never reported back (e.g. a non-HTTP exception) stops blocking after a cooldown
+            if self._trial_started_at is None or now - self._trial_started_at >= self.cooldown_seconds:
+                self._trial_started_at = now
+                return True
+            return False
+
+    def record(self, ok: bool, latency_seconds: float):
+        """Adds one call outcome; slow successes count as bad."""
+        with self._lock:
+            now = time.monotonic()
+            good = ok and latency_seconds <= self.slow_call_seconds
+            if self._state == HALF_OPEN:
+                if good:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    logger.info(f"CircuitBreaker[{self.name}]: Trial call succeeded, closed again.")
+                else:
+                    self._open(now, "trial call failed" if not ok else f"trial call took {latency_seconds:.1f}s")
+                self._outcomes.append((now, ok, latency_seconds))
+                return
+            self._outcomes.append((now, ok, latency_seconds))
+            if self._state != CLOSED:
+                return
+            self._prune(now)
+            bad_calls = sum(1 for _, call_ok, latency in self._outcomes if not call_ok or latency > self.slow_call_seconds)
+            if len(self._outcomes) >= self.min_calls and bad_calls / len(self._outcomes) >= self.failure_rate_threshold:
+                self._open(now, f"{bad_calls} of the last {len(self._outcomes)} calls failed or were slow")
+
+    def is_healthy(self) -> bool:
+        """Closed, and (once min_calls outcomes are in) a recent bad-call rate below half the tripping threshold."""
+        return self.snapshot()['healthy']
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            self._refresh_state(now)
+            self._prune(now)
+            outcomes = list(self._outcomes)
+            state, opened_at = self._state, self._opened_at
+        calls = len(outcomes)
+        failures = sum(1 for _, ok, _ in outcomes if not ok)
+        slow_calls = sum(1 for _, ok, latency in outcomes if ok and latency > self.slow_call_seconds)
+        return {
+            'state': state,
+            'calls_in_window': calls,
+            'failures': failures,
+            'slow_calls': slow_calls,
+            'failure_rate': round((failures + slow_calls) / calls, 3) if calls else None,
+            'latency_avg_ms': round(sum(latency for _, _, latency in outcomes) / calls * 1000, 1) if calls else None,
+            'latency_max_ms': round(max(latency for _, _, latency in outcomes) * 1000, 1) if calls else None,
+            'cooldown_remaining_seconds': round(max(0.0, self.cooldown_seconds - (now - opened_at)), 1) if state == OPEN else 0.0,
+            'times_opened': self.times_opened,
+            'healthy': state == CLOSED and (calls < self.min_calls or (failures + slow_calls) / calls < self.failure_rate_threshold / 2),
+        }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Returns the process-wide breaker for a provider, created on first use."""
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = _breakers[provider] = CircuitBreaker(provider)
+        return breaker
+
+def get_circuit_breaker_states() -> dict:
+    """Snapshot of every breaker created so far, keyed by provider."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
@@ -7,12 +7,30 @@ LOG_LEVEL = "INFO" # e.g., "DEBUG", "INFO", "WARNING"
 # Number of years of daily data to fetch for calculating indicators
 HISTORICAL_DATA_YEARS = 2
 
+# --- Database (SQLite) ---
+# Each thread reuses one connection (see db_utils.get_connection); these are applied when it is opened.
+SQLITE_PAGE_CACHE_KIB = 16384 # PRAGMA cache_size, in KiB (16 MiB per connection)
+SQLITE_MMAP_SIZE_BYTES = 256 * 1024 * 1024 # PRAGMA mmap_size; 0 disables memory-mapped reads
+SQLITE_STATEMENT_CACHE_SIZE = 64 # Prepared statements kept per connection
+SQLITE_BUSY_TIMEOUT_SECONDS = 10 # How long a writer waits for the lock before raising
+
+# --- Negative cache for days no source can supply ---
+# Failed lookups are recorded in ohlcv_fetch_failures and skipped by get_historical_data_for_indicators until retry-after.
+OHLCV_FAILURE_RETRY_SECONDS = 6 * 60 * 60 # First retry delay; doubles with each consecutive failure
+OHLCV_FAILURE_MAX_RETRY_SECONDS = 30 * 24 * 60 * 60
+OHLCV_FAILURE_RECENT_DAYS = 2 # Days this recent may just not be published yet...
+OHLCV_FAILURE_RECENT_RETRY_SECONDS = 15 * 60 # ...so they are retried soon
+
 # --- Indicator Calculation Parameters ---
 
 # Minimum number of data points (candles) required in a resampled OHLCV DataFrame
 # before attempting to calculate any indicators for that period.
 # If a resampled monthly_df has fewer rows than this, all monthly indicators will be None.
 MIN_CANDLES_FOR_CALCULATION = 20 # Was 30, then 20. Let's keep it at 20 for now.
+MIN_DAILY_ROWS_FOR_INDICATORS = 60 # Fewer daily rows in a date's window: price only, no indicators
+# "Today" keeps streaming indicator states (backend/live_indicators.py): the complete weekly/monthly
+# bars are committed once a day, a refreshed daily candle only re-evaluates the current partial bars.
+LIVE_INDICATOR_STATE_ENABLED = True
 
 # Default parameters (can be used for weekly or if not overridden by timeframe-specific)
 DEFAULT_INDICATOR_PARAMS = {
@@ -82,10 +100,76 @@ COMPOSITE_MAX_NORMALIZED_SCORE_COMPONENT = 150.0
 COINGECKO_API_BASE_URL = "https://api.coingecko.com/api/v3"
 COINGECKO_RETRIES = 3
 COINGECKO_DELAY = 2 # seconds, initial delay
+COINGECKO_MAX_HISTORY_DAYS = 365 # Public API only serves this much history; older days go to Kraken
 
 KRAKEN_API_BASE_URL = "https://api.kraken.com/0/public/OHLC"
 KRAKEN_RETRIES = 3
 KRAKEN_DELAY_SECONDS = 1
+KRAKEN_RANGE_MAX_PAGES = 5 # Upper bound on 'since' pages per range request (720 daily candles per page)
+
+# Shared token-bucket limits per provider (see backend/rate_limiter.py). Calls only wait once the
+# budget is used up; a 429 / "EAPI:Rate limit exceeded" response empties the bucket for a cooldown.
+PROVIDER_RATE_LIMITS = {
+    "coingecko": {"rate_per_second": 0.25, "burst": 3, "max_concurrency": 2}, # Public API allows roughly 15 calls/minute
+    "kraken": {"rate_per_second": 1.0, "burst": 3, "max_concurrency": 2}, # Public endpoints decay about one call/second
+    "default": {"rate_per_second": 1.0, "burst": 1, "max_concurrency": 1},
+}
+
+# Shared HTTP transport (backend/http_transport.py): one pooled keep-alive session per host.
+# Connection errors, 429 and 5xx are retried with full-jitter exponential backoff.
+HTTP_POOL_MAXSIZE = 4 # Kept-alive connections per host (>= max_concurrency above)
+HTTP_RETRIES = 2 # Retries after the first attempt, unless a client passes its own
+HTTP_BACKOFF_BASE_SECONDS = 1.0
+HTTP_BACKOFF_MAX_SECONDS = 30.0
+
+# --- Provider Response Cache (backend/response_cache.py) ---
+# Raw CoinGecko/Kraken responses on disk, keyed by normalized URL + params.
+# "off": always hit the network. "record": serve unexpired cached responses, store new 200s.
+# "replay": serve only from the cache (expired entries included); a miss fails like a network error.
+HTTP_RESPONSE_CACHE_MODE = "off"
+HTTP_RESPONSE_CACHE_DIR = None # None -> <project root>/.response_cache/
+# TTL (seconds) for responses that still cover an unfinished UTC day; responses covering only
+# finished days never change and are kept forever.
+HTTP_RESPONSE_CACHE_TTL_SECONDS = {
+    "coingecko_history": 3600,
+    "coingecko_market_chart_range": 900,
+    "kraken_ohlc": 300,
+    "default": 300,
+}
+
+# --- Provider Circuit Breakers (backend/circuit_breaker.py) ---
+# Each provider's breaker watches its recent HTTP attempts. When too many fail (errors, 429, 5xx) or
+# are slow, the provider is skipped for a cooldown instead of every missing day running its full
+# retry ladder; the other provider is tried first while one is unhealthy.
+CIRCUIT_BREAKER_SETTINGS = {
+    "window_size": 20, # Most recent attempts considered...
+    "window_seconds": 300, # ...as long as they are younger than this
+    "min_calls": 5, # Never trip on fewer attempts than this
+    "failure_rate_threshold": 0.5, # Open once this share of the window failed or was slow
+    "slow_call_seconds": 8.0, # A response slower than this counts against the provider
+    "cooldown_seconds": 60, # How long an open breaker skips the provider before one trial call
+}
+
+# Worker threads used to fetch missing days in parallel (provider latency dominates cold starts).
+# Each provider call still goes through its rate limiter and max_concurrency slot above.
+FETCH_MAX_WORKERS = 4
+
+# Rows per chunk when streaming OHLCVT CSVs (plain or inside Kraken's zip exports) into daily bars
+CSV_STREAM_CHUNK_ROWS = 500_000
+
+# --- CSV Hot Reload ---
+# How often (seconds) indicator requests check csv/ for new or changed files; 0 disables the check
+# (POST /api/refresh always checks).
+CSV_RELOAD_CHECK_SECONDS = 60
+# Also write days from new/changed CSVs into daily_ohlcv right away (replacing existing rows for those days).
+# When False they still reach the DB through the normal backfill of missing days.
+CSV_RELOAD_UPSERT_TO_DB = False
+
+# --- Request Coalescing (single-flight) ---
+# Threads asking for something another thread is already computing wait for that result instead of
+# repeating the work; these are the longest they wait before giving up.
+SINGLE_FLIGHT_INDICATOR_TIMEOUT_SECONDS = 120 # Full indicator pipeline for one target date
+SINGLE_FLIGHT_FETCH_TIMEOUT_SECONDS = 60 # One day's CSV -> CoinGecko -> Kraken lookup
 
 # You can add other configurations here, e.g., database path if you want it configurable,
 # though DB_PATH is currently derived in db_utils.py.
@@ -1,8 +1,14 @@
 # backend/csv_data_loader.py
 import os
+import json
+import hashlib
 import logging
+import threading
+import numpy as np
 import pandas as pd
 from datetime import datetime, timezone
+from backend.startup_timing import timed_phase
+from backend.ohlcv_ingest import aggregate_csv_to_daily
 
 logger = logging.getLogger(__name__)
 
@@ -10,13 +16,32 @@ logger = logging.getLogger(__name__)
 # Assuming this file is in backend/, and csv/ is in project root.
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CSV_DIR = os.path.join(PROJECT_ROOT, 'csv/')
+# Parsed CSV columns as .npy files (one subdirectory per CSV), so unchanged CSVs are never re-parsed
+CSV_CACHE_DIR = os.path.join(PROJECT_ROOT, '.csv_cache/')
+CSV_CACHE_FORMAT_VERSION = 3 # v2: 'trades' column no longer kept; v3: rows aggregated to daily bars
+# Kraken exports have a 7th 'trades' column; nothing uses it, so it is never parsed or kept in memory
+CSV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+OHLCV_COLUMNS = CSV_COLUMNS[1:]
+SECONDS_PER_DAY = 24 * 60 * 60
+
+def _day_number(date_like) -> int:
+    """Days since 1970-01-01 for a UTC (or naive, read as UTC) datetime; time of day is dropped."""
+    return int(pd.Timestamp(date_like).value // (SECONDS_PER_DAY * 1_000_000_000))
 
 class CSVDataLoader:
-    def __init__(self, csv_dir_path=CSV_DIR):
+    def __init__(self, csv_dir_path=CSV_DIR, cache_dir_path=CSV_CACHE_DIR):
         self.csv_dir = csv_dir_path
+        self.cache_dir = cache_dir_path # None disables the parsed-column cache
         self.df = None # DataFrame with DatetimeIndex (UTC)
         self.min_date_in_csv = None
         self.max_date_in_csv = None
+        # Per-day index built at load time: sorted day numbers (days since 1970-01-01), the
+        # matching OHLCV rows and the frame, so lookups are a searchsorted instead of a scan over every row
+        self._day_index = (np.empty(0, dtype=np.int64), np.empty((0, len(OHLCV_COLUMNS)), dtype=np.float64), None)
+        # Per-file fingerprints and daily frames, so reload_changed() only touches files that changed
+        self._file_signatures = {}
+        self._file_frames = {}
+        self._reload_lock = threading.Lock()
         
         logger.info(f"CSVDataLoader: Initializing with csv_dir_path: {csv_dir_path}")
         logger.info(f"CSVDataLoader: Resolved self.csv_dir to: {self.csv_dir}")
@@ -32,64 +57,165 @@ class CSVDataLoader:
         else:
             logger.error(f"CSVDataLoader: Directory {self.csv_dir} DOES NOT EXIST or is not a directory.")
             
-        self._load_all_csvs()
+        with timed_phase('csv_parse'):
+            self._load_all_csvs()
+
+    def _list_csv_files(self) -> list:
+        return [os.path.join(self.csv_dir, filename) for filename in os.listdir(self.csv_dir)
+                if filename.lower().endswith(".csv")]
+
+    def _load_file_frame(self, filepath: str):
+        """One CSV's daily rows (from the .npy cache when unchanged) as a DataFrame with a UTC day-start index, or None."""
+        logger.debug(f"CSVDataLoader: Attempting to load CSV: {filepath}")
+        try:
+            columns = self._load_cached_columns(filepath)
+            if columns is None:
+                columns = self._parse_csv_columns(filepath)
+                if columns is None:
+                    return None
+                self._store_cached_columns(filepath, columns)
+            if len(columns['timestamp']) == 0:
+                logger.warning(f"CSVDataLoader: No valid numeric data rows found in {filepath} after conversion.")
+                return None
+
+            temp_df = pd.DataFrame({name: columns[name] for name in OHLCV_COLUMNS}, copy=False)
+            temp_df.index = pd.to_datetime(columns['timestamp'], unit='s', utc=True).normalize()
+            temp_df.index.name = 'timestamp'
+            return temp_df
+        except Exception as e:
+            logger.error(f"CSVDataLoader: Error loading or processing CSV file {filepath}: {e}")
+            return None
 
     def _load_all_csvs(self):
-        all_dfs = []
         if not os.path.isdir(self.csv_dir): 
             return # Already logged in __init__
         
-        found_csv_files_in_loop = False
-        for filename in os.listdir(self.csv_dir):
-            if filename.lower().endswith(".csv"):
-                found_csv_files_in_loop = True
-                filepath = os.path.join(self.csv_dir, filename) 
-                logger.debug(f"CSVDataLoader: Attempting to load CSV: {filepath}")
-                try:
-                    temp_df = pd.read_csv(
-                        filepath, 
-                        header=None, 
-                        names=['timestamp', 'open', 'high', 'low', 'close', 'volume', 'trades'],
-                        dtype={'timestamp': str, 'open': str, 'high': str, 'low': str, 'close': str, 'volume': str, 'trades': str},
-                        keep_default_na=False, na_values=[''] 
-                    )
-                    if temp_df.empty:
-                        logger.warning(f"CSVDataLoader: CSV file {filepath} is empty or contains no data rows.")
-                        continue
-
-                    temp_df['timestamp'] = pd.to_numeric(temp_df['timestamp'], errors='coerce')
-                    temp_df['open'] = pd.to_numeric(temp_df['open'], errors='coerce')
-                    temp_df['high'] = pd.to_numeric(temp_df['high'], errors='coerce')
-                    temp_df['low'] = pd.to_numeric(temp_df['low'], errors='coerce')
-                    temp_df['close'] = pd.to_numeric(temp_df['close'], errors='coerce')
-                    temp_df['volume'] = pd.to_numeric(temp_df['volume'], errors='coerce')
-                    
-                    temp_df.dropna(subset=['timestamp', 'open', 'high', 'low', 'close', 'volume'], inplace=True)
-                    if temp_df.empty:
-                        logger.warning(f"CSVDataLoader: No valid numeric data rows found in {filepath} after conversion.")
-                        continue
-
-                    temp_df['timestamp'] = pd.to_datetime(temp_df['timestamp'], unit='s', utc=True).dt.normalize()
-                    all_dfs.append(temp_df)
-                except Exception as e:
-                    logger.error(f"CSVDataLoader: Error loading or processing CSV file {filepath}: {e}")
-        
-        if not found_csv_files_in_loop and os.path.isdir(self.csv_dir):
+        csv_files = self._list_csv_files()
+        if not csv_files:
             logger.warning(f"CSVDataLoader: No files ending with .csv found in directory: {self.csv_dir}")
+            return
+        for filepath in csv_files:
+            self._file_signatures[filepath] = self._file_signature(filepath)
+            self._file_frames[filepath] = self._load_file_frame(filepath)
 
+        all_dfs = [frame for frame in self._file_frames.values() if frame is not None]
         if all_dfs:
-            self.df = pd.concat(all_dfs).drop_duplicates(subset=['timestamp']).set_index('timestamp').sort_index()
+            merged_df = pd.concat(all_dfs)
+            self._set_frame(merged_df[~merged_df.index.duplicated(keep='first')].sort_index())
             logger.info(f"CSVDataLoader: Loaded {len(self.df)} unique records from CSV files.")
-            if not self.df.empty:
-                self.min_date_in_csv = self.df.index.min().date()
-                self.max_date_in_csv = self.df.index.max().date()
-                logger.info(f"CSVDataLoader: CSV data range: {self.min_date_in_csv} to {self.max_date_in_csv}")
-            if not self.df.index.is_monotonic_increasing:
-                 logger.warning("CSVDataLoader: DataFrame index is not monotonically increasing. Sorting again.")
-                 self.df.sort_index(inplace=True)
+            logger.info(f"CSVDataLoader: CSV data range: {self.min_date_in_csv} to {self.max_date_in_csv}")
         else:
-            if found_csv_files_in_loop: # Only log this if CSVs were found but resulted in no data
-                 logger.warning(f"CSVDataLoader: No valid data loaded from CSV files in {self.csv_dir}, though .csv files were present.")
+            logger.warning(f"CSVDataLoader: No valid data loaded from CSV files in {self.csv_dir}, though .csv files were present.")
+
+    def _set_frame(self, daily_df: pd.DataFrame):
+        """Swaps in a new sorted daily frame and its day index in one assignment, so readers never see a mix."""
+        day_numbers = np.asarray(daily_df.index.as_unit('s').asi8 // SECONDS_PER_DAY, dtype=np.int64)
+        self._day_index = (day_numbers, daily_df[OHLCV_COLUMNS].to_numpy(dtype=np.float64), daily_df)
+        self.df = daily_df
+        self.min_date_in_csv = daily_df.index.min().date() if not daily_df.empty else None
+        self.max_date_in_csv = daily_df.index.max().date() if not daily_df.empty else None
+
+    def reload_changed(self) -> pd.DataFrame:
+        """
+        Picks up CSVs added to, changed in or removed from csv_dir since the last (re)load, comparing each
+        file's size/mtime fingerprint. Only new or changed files are parsed (or read from the .npy cache);
+        the held frame is then rebuilt from the per-file frames, with new/changed files taking precedence,
+        so days a file no longer has disappear unless another file supplies them.
+        Returns the daily rows that came from new/changed files (empty frame if nothing changed).
+        """
+        with self._reload_lock:
+            if not os.path.isdir(self.csv_dir):
+                return pd.DataFrame(columns=OHLCV_COLUMNS, dtype=np.float64)
+            current_files = self._list_csv_files()
+            changed_files = [path for path in current_files if self._file_signatures.get(path) != self._file_signature(path)]
+            removed_files = [path for path in self._file_signatures if path not in current_files]
+            if not changed_files and not removed_files:
+                return pd.DataFrame(columns=OHLCV_COLUMNS, dtype=np.float64)
+
+            changed_frames = {}
+            for filepath in changed_files:
+                logger.info(f"CSVDataLoader: {'Changed' if filepath in self._file_signatures else 'New'} CSV file detected: {filepath}")
+                self._file_signatures[filepath] = self._file_signature(filepath)
+                changed_frames[filepath] = self._load_file_frame(filepath)
+            for filepath in removed_files:
+                logger.info(f"CSVDataLoader: CSV file removed: {filepath}")
+                self._file_signatures.pop(filepath, None)
+                self._file_frames.pop(filepath, None)
+
+            # Most recently changed files first: the rebuild below keeps the first row per day, so their days win
+            self._file_frames = {**changed_frames, **{path: frame for path, frame in self._file_frames.items() if path not in changed_frames}}
+            all_dfs = [frame for frame in self._file_frames.values() if frame is not None]
+            merged_df = pd.concat(all_dfs) if all_dfs else pd.DataFrame(columns=OHLCV_COLUMNS, dtype=np.float64)
+            self._set_frame(merged_df[~merged_df.index.duplicated(keep='first')].sort_index())
+
+            changed_dfs = [frame for frame in changed_frames.values() if frame is not None]
+            changed_days = pd.concat(changed_dfs).index if changed_dfs else pd.DatetimeIndex([], tz='UTC')
+            new_df = self.df[self.df.index.isin(changed_days)]
+            logger.info(f"CSVDataLoader: Reloaded {len(changed_files)} new/changed and {len(removed_files)} removed CSV file(s); {len(new_df)} days updated, {len(self.df)} held.")
+            return new_df
+
+    def _parse_csv_columns(self, filepath: str):
+        """
+        Streams one CSV into daily numeric column arrays (rows with any unparseable OHLCV value dropped).
+        Files of any interval work: intraday rows are folded into UTC daily bars chunk by chunk.
+        """
+        daily_df = aggregate_csv_to_daily(filepath)
+        columns = {'timestamp': np.asarray(daily_df.index.as_unit('s').asi8, dtype=np.int64)}
+        for name in OHLCV_COLUMNS:
+            columns[name] = daily_df[name].to_numpy(dtype=np.float64)
+        return columns
+
+    def _cache_entry_dir(self, filepath: str) -> str:
+        abs_path = os.path.abspath(filepath)
+        path_hash = hashlib.sha1(abs_path.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{os.path.basename(abs_path)}.{path_hash}")
+
+    @staticmethod
+    def _file_signature(filepath: str) -> dict:
+        stat_result = os.stat(filepath)
+        return {'path': os.path.abspath(filepath), 'size': stat_result.st_size,
+                'mtime_ns': stat_result.st_mtime_ns, 'version': CSV_CACHE_FORMAT_VERSION}
+
+    def _load_cached_columns(self, filepath: str):
+        """
+        Returns the cached column arrays if the cache entry matches the file's path, size and mtime; else None.
+        The arrays are read into memory (they are copied into the merged frame anyway); the saving is the skipped CSV parse.
+        """
+        if not self.cache_dir:
+            return None
+        entry_dir = self._cache_entry_dir(filepath)
+        try:
+            with open(os.path.join(entry_dir, 'meta.json')) as meta_file:
+                meta = json.load(meta_file)
+            if meta.get('signature') != self._file_signature(filepath):
+                logger.info(f"CSVDataLoader: {filepath} changed since it was cached. Re-parsing.")
+                return None
+            columns = {name: np.load(os.path.join(entry_dir, f"{name}.npy")) for name in CSV_COLUMNS}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"CSVDataLoader: Ignoring unreadable cache entry {entry_dir}: {e}")
+            return None
+        logger.debug(f"CSVDataLoader: Loaded {len(columns['timestamp'])} rows for {filepath} from cache.")
+        return columns
+
+    def _store_cached_columns(self, filepath: str, columns: dict):
+        """Writes parsed columns as .npy files; meta.json goes last so a half-written entry is never used."""
+        if not self.cache_dir:
+            return
+        entry_dir = self._cache_entry_dir(filepath)
+        try:
+            os.makedirs(entry_dir, exist_ok=True)
+            meta_path = os.path.join(entry_dir, 'meta.json')
+            if os.path.exists(meta_path):
+                os.remove(meta_path)
+            for name, values in columns.items():
+                np.save(os.path.join(entry_dir, f"{name}.npy"), values)
+            with open(meta_path + '.tmp', 'w') as meta_file:
+                json.dump({'signature': self._file_signature(filepath), 'rows': len(columns['timestamp'])}, meta_file)
+            os.replace(meta_path + '.tmp', meta_path)
+        except OSError as e:
+            logger.warning(f"CSVDataLoader: Could not write CSV cache for {filepath} (continuing without it): {e}")
 
     def get_ohlcv_for_date(self, date_obj_utc: datetime): 
         if self.df is None or self.df.empty:
@@ -103,33 +229,44 @@ class CSVDataLoader:
                 logger.debug(f"CSVDataLoader: Requested date {target_date_date} is outside CSV range ({self.min_date_in_csv} - {self.max_date_in_csv}).")
                 return None
         
-        try:
-            day_start_utc_dt_obj = date_obj_utc.replace(hour=0, minute=0, second=0, microsecond=0)
-            
-            if day_start_utc_dt_obj in self.df.index:
-                row = self.df.loc[day_start_utc_dt_obj]
-                logger.debug(f"CSVDataLoader: Exact timestamp match found for {target_date_date} in CSV.")
-                return {'open': row['open'], 'high': row['high'], 'low': row['low'],
-                        'close': row['close'], 'volume': row['volume'], 'source': 'csv_exact'}
-            else: # Fallback for days that might not have 00:00:00 UTC entry
-                data_on_day = self.df[self.df.index.date == target_date_date]
-                if not data_on_day.empty:
-                    row = data_on_day.iloc[0] 
-                    logger.debug(f"CSVDataLoader: Found data for {target_date_date} within the day (first entry timestamp: {data_on_day.index[0]}). Using this for day start.")
-                    return {'open': row['open'], 'high': row['high'], 'low': row['low'],
-                            'close': row['close'], 'volume': row['volume'], 'source': 'csv_day_match'}
-                else:
-                    logger.debug(f"CSVDataLoader: No data found for {target_date_date} in CSV, either by exact timestamp or by date match.")
-                    
-        except KeyError: 
-            logger.debug(f"CSVDataLoader: KeyError for {target_date_date}. Date not in CSV index.")
-            return None
-        except Exception as e:
-            logger.error(f"CSVDataLoader: Error accessing CSV data for {target_date_date}: {e}")
+        # Timestamps are normalized to day start at load time, so every CSV day has an exact 00:00 UTC row
+        day_numbers, ohlcv_values, _ = self._day_index
+        day_number = _day_number(date_obj_utc)
+        pos = int(np.searchsorted(day_numbers, day_number))
+        if pos >= len(day_numbers) or day_numbers[pos] != day_number:
+            logger.debug(f"CSVDataLoader: No data found for {target_date_date} in CSV.")
             return None
-        return None
+        row = ohlcv_values[pos]
+        logger.debug(f"CSVDataLoader: Exact timestamp match found for {target_date_date} in CSV.")
+        return {'open': row[0], 'high': row[1], 'low': row[2],
+                'close': row[3], 'volume': row[4], 'source': 'csv_exact'}
+
+    def get_ohlcv_range(self, start_date_utc: datetime, end_date_utc: datetime) -> pd.DataFrame:
+        """
+        Returns the CSV days between start and end (inclusive) as a float64 OHLCV DataFrame indexed
+        by UTC day-start timestamps. Two searchsorted calls on the per-day index, no per-row work.
+        """
+        day_numbers, _, daily_df = self._day_index
+        if daily_df is None or daily_df.empty:
+            return pd.DataFrame(columns=OHLCV_COLUMNS, dtype=np.float64)
+        lo = int(np.searchsorted(day_numbers, _day_number(start_date_utc), side='left'))
+        hi = int(np.searchsorted(day_numbers, _day_number(end_date_utc), side='right'))
+        return daily_df.iloc[lo:hi][OHLCV_COLUMNS]
+
+# Shared instance, built on first use (not at import time) so modules and scripts that never
+# look at CSV data - db_checker, api-loader for API-only days, csv_importer's CSV_DIR import - don't pay for parsing.
+_shared_loader = None
+_shared_loader_lock = threading.Lock()
+
+def get_csv_data_loader_if_loaded():
+    """Returns the shared CSVDataLoader if something has already built it, else None (never parses)."""
+    return _shared_loader
 
-# Global instance to be imported by other modules if they need direct CSV access,
-# though data_fetch_orchestrator will usually instantiate it.
-# If multiple scripts import this, they'll share this instance unless they create their own.
-csv_data_loader_instance = CSVDataLoader()
\ No newline at end of file
+def get_csv_data_loader() -> CSVDataLoader:
+    """Returns the process-wide CSVDataLoader, parsing ./csv/ the first time it is called."""
+    global _shared_loader
+    if _shared_loader is None:
+        with _shared_loader_lock:
+            if _shared_loader is None:
+                _shared_loader = CSVDataLoader()
+    return _shared_loader
@@ -1,77 +1,335 @@
 # backend/data_sources.py
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 from datetime import datetime, timedelta, timezone
 import numpy as np
 from backend import config
 
 # Imports from sibling modules within the 'backend' package
-from .db_utils import store_daily_ohlcv_data, get_daily_ohlcv_from_db, iso_string_to_date
-from .csv_data_loader import CSVDataLoader # Import the class
-from .api_clients import coingecko_api_client, kraken_api_client # Import instances
+from .db_utils import (
+    store_daily_ohlcv_data, store_daily_ohlcv_bulk, OHLCV_COLUMNS,
+    record_ohlcv_fetch_failure, get_blocked_ohlcv_dates, date_to_iso_string, get_daily_ohlcv_range,
+    clear_ohlcv_fetch_failures
+)
+from .csv_data_loader import get_csv_data_loader, get_csv_data_loader_if_loaded # Shared, lazily built instance
+from .api_clients import coingecko_api_client, kraken_api_client, ProviderUnavailableError # Import instances
+from .single_flight import SingleFlight, SingleFlightTimeout
+from .ohlcv_store import get_daily_ohlcv_store
+from .circuit_breaker import get_circuit_breaker, OPEN as BREAKER_OPEN
 
 logger = logging.getLogger(__name__)
 
-# Instantiate CSVDataLoader ONCE, when the module is loaded.
-# This assumes the CSV files don't change during the runtime of the application.
-# If they do, a more complex refresh mechanism for global_csv_loader would be needed.
-global_csv_loader = CSVDataLoader()
-logger.info("Data_sources: Global CSVDataLoader instance created and CSVs pre-loaded.")
+# One provider lookup per day at a time, however many threads want that day
+_daily_fetch_flight = SingleFlight('daily_ohlcv_fetch')
 
-def fetch_and_store_daily_ohlcv(date_obj_utc: datetime):
+# Last time csv/ was checked for new or changed files (see maybe_reload_csv_data)
+_last_csv_reload_check = time.monotonic()
+_csv_reload_check_lock = threading.Lock()
+
+
+def reload_csv_data(upsert_to_db: bool = None) -> int:
     """
-    Orchestrates fetching daily OHLCV, prioritizing local CSV, then CoinGecko, then Kraken.
-    Stores data in DB if found.
-    Returns (values_dict, error_message_or_none).
-    'values_dict' contains o,h,l,c,v,source but NOT the date/timestamp itself.
+    Merges new or changed CSV files into the shared CSV loader without a restart or a full re-parse.
+    With upsert_to_db (default config.CSV_RELOAD_UPSERT_TO_DB) their days are also written to daily_ohlcv
+    and the in-memory OHLCV store. Either way, negative-cache entries for those days are dropped so the
+    next window picks them up from the CSV. Returns the number of days that came from new/changed files.
+    """
+    if upsert_to_db is None:
+        upsert_to_db = config.CSV_RELOAD_UPSERT_TO_DB
+    try:
+        changed_df = get_csv_data_loader().reload_changed()
+    except OSError as e: # A file vanished mid-check; the next check will see a consistent directory
+        logger.warning(f"Orchestrator: CSV reload skipped: {e}")
+        return 0
+    if changed_df.empty:
+        return 0
+    cleared = clear_ohlcv_fetch_failures(changed_df.index.strftime('%Y-%m-%d'))
+    if cleared:
+        logger.info(f"Orchestrator: Cleared {cleared} negative-cache entries for days the reloaded CSV files supply.")
+    if upsert_to_db:
+        written, _ = store_daily_ohlcv_bulk(changed_df, source='csv_import')
+        get_daily_ohlcv_store().upsert(changed_df)
+        logger.info(f"Orchestrator: Upserted {written} days from new/changed CSV files into daily_ohlcv.")
+    return len(changed_df)
+
+
+def maybe_reload_csv_data():
+    """
+    Runs reload_csv_data at most once every config.CSV_RELOAD_CHECK_SECONDS (cheap stat calls when nothing changed).
+    Does nothing until the CSV loader has been built: its first build reads the current files anyway.
+    """
+    global _last_csv_reload_check
+    if config.CSV_RELOAD_CHECK_SECONDS <= 0 or get_csv_data_loader_if_loaded() is None:
+        return
+    with _csv_reload_check_lock:
+        if time.monotonic() - _last_csv_reload_check < config.CSV_RELOAD_CHECK_SECONDS:
+            return
+        _last_csv_reload_check = time.monotonic()
+    reload_csv_data()
+
+class SourceFetchStats:
+    """Thread-safe per-source success/failure counters for one batch of per-day fetches."""
+    SOURCES = ('csv', 'coingecko', 'kraken')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {source: {'ok': 0, 'failed': 0} for source in self.SOURCES}
+
+    def record(self, source: str, ok: bool):
+        with self._lock:
+            self._counts.setdefault(source, {'ok': 0, 'failed': 0})['ok' if ok else 'failed'] += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {source: dict(counts) for source, counts in self._counts.items()}
+
+    def summary(self) -> str:
+        return ", ".join(f"{source} {counts['ok']} ok/{counts['failed']} failed" for source, counts in self.as_dict().items())
+
+
+def _fetch_daily_ohlcv_from_sources(date_obj_utc: datetime, stats: SourceFetchStats = None, kraken_earliest_utc: datetime = None):
+    """
+    Runs the CSV -> CoinGecko -> Kraken chain for one day; providers with an open circuit breaker are
+    skipped and an unhealthy CoinGecko is tried after Kraken. Days before kraken_earliest_utc (the oldest
+    candle a Kraken range response returned) are outside Kraken's 720-candle window and skip Kraken. Days every provider answered for without
+    a candle go to the negative cache; skipped or unreachable providers keep the day out of it.
     """
-    # USE THE GLOBAL INSTANCE: global_csv_loader
-    # REMOVED: local_csv_loader = CSVDataLoader() 
-    
     date_obj_utc = date_obj_utc.replace(hour=0, minute=0, second=0, microsecond=0)
     date_str_log = date_obj_utc.strftime('%Y-%m-%d') 
 
-    logger.debug(f"Orchestrator: Checking CSV for {date_str_log} using global CSV instance.")
-    csv_values = global_csv_loader.get_ohlcv_for_date(date_obj_utc)
+    logger.debug(f"Orchestrator: Checking CSV for {date_str_log} using the shared CSV loader.")
+    csv_values = get_csv_data_loader().get_ohlcv_for_date(date_obj_utc)
+    if stats: stats.record('csv', bool(csv_values))
     if csv_values:
-        store_daily_ohlcv_data(date_obj_utc, {**csv_values}) # Pass datetime and values dict
-        logger.info(f"Orchestrator: Found and stored data for {date_str_log} from CSV (source: {csv_values.get('source')}).")
+        logger.info(f"Orchestrator: Found data for {date_str_log} in CSV (source: {csv_values.get('source')}).")
         return csv_values, None
 
     logger.info(f"Orchestrator: Data for {date_str_log} not found in CSV. Attempting APIs.")
-    # Apply a slightly longer delay if CSV fails, as API calls are slower.
-    # The original 1.5s delay was here, but might be better before each API type.
+    # No fixed delays here: the API clients pace themselves through the shared per-provider rate limiters.
     
     now_utc_start_of_day = datetime.now(timezone.utc).replace(hour=0,minute=0,second=0,microsecond=0)
     days_ago = (now_utc_start_of_day - date_obj_utc).days
     
-    if 0 <= days_ago <= 365: # CoinGecko for data within the last year
-        logger.info(f"Orchestrator: Attempting CoinGecko for recent date {date_str_log}.")
-        time.sleep(1.2) # Delay before CoinGecko call
-        cg_values = coingecko_api_client.get_ohlcv_for_date(date_obj_utc)
-        if cg_values:
-            store_daily_ohlcv_data(date_obj_utc, {**cg_values})
-            logger.info(f"Orchestrator: Found and stored data for {date_str_log} from CoinGecko.")
-            return cg_values, None
-        else:
-            logger.warning(f"Orchestrator: CoinGecko failed for {date_str_log} after all retries. Now trying Kraken.")
-    else:
-        logger.info(f"Orchestrator: Date {date_str_log} is older than 365 days ({days_ago} days ago). Skipping CoinGecko, trying Kraken directly.")
-    
-    logger.info(f"Orchestrator: Attempting Kraken for {date_str_log}.")
-    time.sleep(1.2) # Delay before Kraken call
-    kraken_values = kraken_api_client.get_ohlcv_for_date(date_obj_utc)
-    if kraken_values:
-        store_daily_ohlcv_data(date_obj_utc, {**kraken_values})
-        logger.info(f"Orchestrator: Found and stored data for {date_str_log} from Kraken.")
-        return kraken_values, None
-    
+    skipped_providers, unavailable_providers = [], []
+    for provider, api_client in _api_providers_for_day(days_ago, date_str_log):
+        if provider == 'kraken' and kraken_earliest_utc is not None and date_obj_utc < kraken_earliest_utc:
+            # Kraken already answered for this day: its range response starts later
+            logger.info(f"Orchestrator: Skipping Kraken for {date_str_log}: before its earliest candle ({kraken_earliest_utc.date()}).")
+            continue
+        if get_circuit_breaker(provider).state == BREAKER_OPEN:
+            logger.info(f"Orchestrator: Skipping {provider} for {date_str_log}: circuit breaker open.")
+            skipped_providers.append(provider)
+            continue
+        logger.info(f"Orchestrator: Attempting {provider} for {date_str_log}.")
+        try:
+            api_values = api_client.get_ohlcv_for_date(date_obj_utc)
+        except ProviderUnavailableError as e:
+            # Outage, exhausted 429/5xx retries or a breaker that opened mid-call: no answer about the day
+            if stats: stats.record(provider, False)
+            logger.warning(f"Orchestrator: {provider} unavailable for {date_str_log}: {e}")
+            unavailable_providers.append(provider)
+            continue
+        if stats: stats.record(provider, bool(api_values))
+        if api_values:
+            logger.info(f"Orchestrator: Found data for {date_str_log} from {provider}.")
+            return api_values, None
+        logger.warning(f"Orchestrator: {provider} has no candle for {date_str_log}.")
+
+    if skipped_providers or unavailable_providers:
+        # Not a real miss: the day may well exist once the provider recovers, so no negative-cache entry
+        reasons = ([f"skipped {', '.join(skipped_providers)} (circuit breaker open)"] if skipped_providers else []) + \
+                  ([f"{', '.join(unavailable_providers)} unavailable"] if unavailable_providers else [])
+        skipped_msg = f"Data not found for {date_str_log}; {'; '.join(reasons)}."
+        logger.error(f"Orchestrator: {skipped_msg}")
+        return None, skipped_msg
+
     final_error_msg = f"Data not found for {date_str_log} in any source (CSV, CoinGecko, Kraken)."
     logger.error(f"Orchestrator: {final_error_msg}")
+    # Remember the miss so indicator windows covering this day stop re-trying every source on each request
+    _record_fetch_failure(date_obj_utc, final_error_msg)
     return None, final_error_msg
 
 
+def _api_providers_for_day(days_ago: int, date_str_log: str) -> list:
+    """
+    (provider, client) pairs that can serve a day, in the order to try them. CoinGecko (only within
+    COINGECKO_MAX_HISTORY_DAYS) comes before Kraken unless its circuit breaker reports it unhealthy
+    while Kraken's does not; healthy providers always go first.
+    """
+    providers = []
+    if 0 <= days_ago <= config.COINGECKO_MAX_HISTORY_DAYS: # CoinGecko for data within the last year
+        providers.append(('coingecko', coingecko_api_client))
+    else:
+        logger.info(f"Orchestrator: Date {date_str_log} is older than {config.COINGECKO_MAX_HISTORY_DAYS} days ({days_ago} days ago). Skipping CoinGecko, trying Kraken directly.")
+    providers.append(('kraken', kraken_api_client))
+    # Stable sort: among equally healthy providers the CoinGecko-first priority stays
+    return sorted(providers, key=lambda provider: not get_circuit_breaker(provider[0]).is_healthy())
+
+
+def fetch_daily_ohlcv(date_obj_utc: datetime, stats: SourceFetchStats = None, kraken_earliest_utc: datetime = None):
+    """
+    Fetches one day of OHLCV, prioritizing local CSV, then CoinGecko, then Kraken. Does NOT store it.
+    Concurrent lookups of the same day (request threads, pool workers) are coalesced into one provider
+    round-trip; a coalesced lookup is counted in the stats of the thread that made it.
+    Returns (values_dict, error_message_or_none); 'values_dict' contains o,h,l,c,v,source.
+    """
+    date_obj_utc = date_obj_utc.replace(hour=0, minute=0, second=0, microsecond=0)
+    try:
+        return _daily_fetch_flight.do(date_obj_utc.strftime('%Y-%m-%d'),
+                                      lambda: _fetch_daily_ohlcv_from_sources(date_obj_utc, stats, kraken_earliest_utc),
+                                      timeout=config.SINGLE_FLIGHT_FETCH_TIMEOUT_SECONDS)
+    except SingleFlightTimeout as e:
+        logger.warning(f"Orchestrator: {e}")
+        return None, str(e)
+
+
+def _record_fetch_failure(date_obj_utc: datetime, error_msg: str):
+    """Remembers a day no source could supply (negative cache); recent days are retried much sooner."""
+    now_utc_start_of_day = datetime.now(timezone.utc).replace(hour=0,minute=0,second=0,microsecond=0)
+    days_ago = (now_utc_start_of_day - date_obj_utc.replace(hour=0, minute=0, second=0, microsecond=0)).days
+    if days_ago <= config.OHLCV_FAILURE_RECENT_DAYS:
+        record_ohlcv_fetch_failure(date_obj_utc, error_msg, config.OHLCV_FAILURE_RECENT_RETRY_SECONDS, config.OHLCV_FAILURE_RECENT_RETRY_SECONDS)
+    else:
+        record_ohlcv_fetch_failure(date_obj_utc, error_msg, config.OHLCV_FAILURE_RETRY_SECONDS, config.OHLCV_FAILURE_MAX_RETRY_SECONDS)
+
+
+def fetch_and_store_daily_ohlcv(date_obj_utc: datetime):
+    """
+    Fetches one day via fetch_daily_ohlcv (CSV, then CoinGecko, then Kraken) and stores it in the DB if found.
+    Returns (values_dict, error_message_or_none).
+    'values_dict' contains o,h,l,c,v,source but NOT the date/timestamp itself.
+    """
+    date_obj_utc = date_obj_utc.replace(hour=0, minute=0, second=0, microsecond=0)
+    values, error = fetch_daily_ohlcv(date_obj_utc)
+    if values:
+        store_daily_ohlcv_data(date_obj_utc, {**values}) # Pass datetime and values dict
+        get_daily_ohlcv_store().upsert_day(date_obj_utc, values)
+        return values, None
+    return None, error
+
+
+def fetch_missing_days_concurrently(missing_dates_utc: list, kraken_earliest_utc: datetime = None):
+    """
+    Fetches each missing day through the CSV -> CoinGecko -> Kraken chain on a bounded thread pool
+    (config.FETCH_MAX_WORKERS), so provider round-trips overlap instead of running back to back.
+    kraken_earliest_utc is passed on to fetch_daily_ohlcv (days before it skip Kraken).
+    Results are collected in date order and written with one bulk upsert; days nothing could supply
+    were already put in the negative cache by fetch_daily_ohlcv. Returns (float64 OHLCV DataFrame, SourceFetchStats).
+    """
+    stats = SourceFetchStats()
+    sorted_dates = sorted(d.replace(hour=0, minute=0, second=0, microsecond=0) for d in missing_dates_utc)
+    if not sorted_dates:
+        return pd.DataFrame(columns=OHLCV_COLUMNS, dtype=np.float64), stats
+
+    max_workers = max(1, min(config.FETCH_MAX_WORKERS, len(sorted_dates)))
+    logger.info(f"Orchestrator: Fetching {len(sorted_dates)} missing days with {max_workers} worker(s).")
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ohlcv-fetch') as pool:
+        # map() yields results in input order, so rows come back sorted by date
+        results = list(pool.map(lambda d: fetch_daily_ohlcv(d, stats, kraken_earliest_utc), sorted_dates))
+
+    fetched_rows = {}
+    for date_utc, (values, error) in zip(sorted_dates, results):
+        if values:
+            fetched_rows[pd.Timestamp(date_utc)] = [values.get(col) for col in OHLCV_COLUMNS] + [values.get('source')]
+        else:
+            logger.warning(f"Orchestrator: Could not fetch data for {date_utc.date()} for indicator window. Error: {error}")
+
+    logger.info(f"Orchestrator: Per-day fetch finished, {len(fetched_rows)} of {len(sorted_dates)} days found ({stats.summary()}).")
+    if not fetched_rows:
+        return pd.DataFrame(columns=OHLCV_COLUMNS, dtype=np.float64), stats
+    fetched_df = _ohlcv_rows_to_frame(fetched_rows, OHLCV_COLUMNS + ['source'])
+    store_daily_ohlcv_bulk(fetched_df)
+    return fetched_df[OHLCV_COLUMNS], stats
+
+
+def _group_into_gaps(dates_utc: list) -> list:
+    """Groups day-start datetimes into contiguous (gap_start, gap_end) runs, in date order."""
+    gaps = []
+    for date_utc in sorted(dates_utc):
+        if gaps and (date_utc - gaps[-1][1]).days == 1:
+            gaps[-1][1] = date_utc
+        else:
+            gaps.append([date_utc, date_utc])
+    return [(gap_start, gap_end) for gap_start, gap_end in gaps]
+
+
+def _ohlcv_rows_to_frame(rows_by_ts: dict, columns: list) -> pd.DataFrame:
+    """Builds a float64 OHLCV frame (plus any extra columns) from {pd.Timestamp: [values...]}."""
+    frame = pd.DataFrame.from_dict(rows_by_ts, orient='index', columns=columns)
+    frame[OHLCV_COLUMNS] = frame[OHLCV_COLUMNS].apply(pd.to_numeric, errors='coerce').astype(np.float64)
+    return frame
+
+
+def backfill_missing_daily_ohlcv(missing_dates_utc: list) -> pd.DataFrame:
+    """
+    Fills a set of missing days with as few provider calls as possible.
+    CSV is checked with one range lookup. For each multi-day gap, the part younger than
+    COINGECKO_MAX_HISTORY_DAYS is fetched with one CoinGecko range request and whatever is still
+    missing with one Kraken range request; everything found that way is written with a single bulk upsert. Single-day holes and days the
+    range requests did not return go through the per-date chain on a worker pool (fetch_missing_days_concurrently);
+    days older than the earliest candle a Kraken range response returned skip Kraken there.
+    Returns a float64 OHLCV DataFrame indexed by UTC day-start timestamps.
+    """
+    # One range lookup on the CSV day index covers every missing day at once
+    missing_index = pd.DatetimeIndex([pd.Timestamp(d) for d in missing_dates_utc])
+    csv_df = get_csv_data_loader().get_ohlcv_range(min(missing_dates_utc), max(missing_dates_utc))
+    csv_df = csv_df[csv_df.index.isin(missing_index)].assign(source='csv_exact')
+    found_frames = [csv_df] if not csv_df.empty else []
+
+    still_missing = [d for d in missing_dates_utc if pd.Timestamp(d) not in csv_df.index]
+    now_utc_start_of_day = datetime.now(timezone.utc).replace(hour=0,minute=0,second=0,microsecond=0)
+    coingecko_cutoff_utc = now_utc_start_of_day - timedelta(days=config.COINGECKO_MAX_HISTORY_DAYS)
+    kraken_earliest_utc = None # Oldest candle Kraken returned for a range starting before it (its 720-candle window)
+    for gap_start_utc, gap_end_utc in _group_into_gaps(still_missing):
+        if gap_start_utc == gap_end_utc:
+            continue # Single day: the per-date chain below keeps the CoinGecko-first priority
+        gap_label = f"{(gap_end_utc - gap_start_utc).days + 1}-day gap {gap_start_utc.date()}..{gap_end_utc.date()}"
+        gap_days = pd.date_range(start=gap_start_utc, end=gap_end_utc, freq='D')
+        covered_days = set()
+
+        # Several recent days missing: one CoinGecko range request instead of one /history call per day
+        recent_start_utc = max(gap_start_utc, coingecko_cutoff_utc)
+        if recent_start_utc < gap_end_utc and get_circuit_breaker('coingecko').state == BREAKER_OPEN:
+            logger.info(f"Orchestrator: CoinGecko circuit breaker open; leaving {gap_label} to Kraken.")
+        elif recent_start_utc < gap_end_utc:
+            logger.info(f"Orchestrator: Filling recent part ({recent_start_utc.date()}..{gap_end_utc.date()}) of {gap_label} with a CoinGecko range request.")
+            coingecko_df = coingecko_api_client.get_ohlcv_range(recent_start_utc, gap_end_utc)
+            if not coingecko_df.empty:
+                found_frames.append(coingecko_df)
+                covered_days.update(coingecko_df.index)
+
+        remaining_days = [day_ts for day_ts in gap_days if day_ts not in covered_days]
+        if len(remaining_days) > 1 and get_circuit_breaker('kraken').state == BREAKER_OPEN:
+            logger.info(f"Orchestrator: Kraken circuit breaker open; {len(remaining_days)} days of {gap_label} left to the per-date chain.")
+        elif len(remaining_days) > 1:
+            logger.info(f"Orchestrator: Filling {len(remaining_days)} remaining days of {gap_label} with a Kraken range request.")
+            kraken_df = kraken_api_client.get_ohlcv_range(remaining_days[0].to_pydatetime(), remaining_days[-1].to_pydatetime())
+            # Oldest candle Kraken served before the range filter: set even when none of the gap's days came back
+            earliest_utc = kraken_df.attrs.get('oldest_served_utc')
+            if earliest_utc is not None and pd.Timestamp(earliest_utc) > remaining_days[0]:
+                kraken_earliest_utc = earliest_utc if kraken_earliest_utc is None else min(kraken_earliest_utc, earliest_utc)
+            kraken_df = kraken_df[kraken_df.index.isin(remaining_days)]
+            if not kraken_df.empty:
+                found_frames.append(kraken_df)
+
+    found_df = pd.concat(found_frames) if found_frames else pd.DataFrame(columns=OHLCV_COLUMNS, dtype=np.float64)
+    if not found_df.empty:
+        store_daily_ohlcv_bulk(found_df)
+        logger.info(f"Orchestrator: Backfilled {len(found_df)} of {len(missing_dates_utc)} missing days from CSV/range requests.")
+
+    leftover_dates = [d for d in missing_dates_utc if pd.Timestamp(d) not in found_df.index]
+    backfilled_df = found_df[OHLCV_COLUMNS]
+    if leftover_dates:
+        logger.info(f"Orchestrator: {len(leftover_dates)} days not covered by CSV or range requests. Fetching them per day.")
+        per_date_df, _ = fetch_missing_days_concurrently(leftover_dates, kraken_earliest_utc)
+        if not per_date_df.empty:
+            backfilled_df = pd.concat([backfilled_df, per_date_df]) if not backfilled_df.empty else per_date_df
+    return backfilled_df.sort_index()
+
+
 def get_historical_data_for_indicators(end_date_utc: datetime, years=None) -> pd.DataFrame:
     if years is None:
         years = config.HISTORICAL_DATA_YEARS # Use from config if not specified
@@ -79,63 +337,42 @@ def get_historical_data_for_indicators(end_date_utc: datetime, years=None) -> pd
     # Ensure dates are normalized to start of day UTC for the range
     norm_start_date_utc = start_date_utc.replace(hour=0,minute=0,second=0,microsecond=0)
     norm_end_date_utc = end_date_utc.replace(hour=0,minute=0,second=0,microsecond=0)
-    
-    date_range = pd.date_range(
-        start=norm_start_date_utc, 
-        end=norm_end_date_utc, 
-        freq='D', tz='UTC'
-    )
-    all_daily_data_dicts = []
-    
+
     # Debug: Log the DB path being used by this process
     # This import needs to be here to avoid circular dependency if DB_PATH is logged at module level
     from .db_utils import DB_PATH 
     logger.debug(f"get_historical_data_for_indicators is using DB_PATH: {DB_PATH}")
 
-    for date_in_range_dt_obj in date_range:
-        # date_in_range_dt_obj is a pandas.Timestamp. get_daily_ohlcv_from_db expects datetime.datetime.
-        # Convert pandas.Timestamp to python datetime.datetime, ensuring it's UTC.
-        # While .date() conversion worked for keying, being explicit with datetime obj might be safer.
-        py_datetime_obj_utc = date_in_range_dt_obj.to_pydatetime()
-
-        db_entry_dict = get_daily_ohlcv_from_db(py_datetime_obj_utc) 
-        if db_entry_dict:
-            # Ensure the 'date_str' from DB is correctly converted to a datetime.date object for indexing
-            # The 'date_str' is 'YYYY-MM-DD'
-            db_entry_dict['datetime_obj_for_index'] = iso_string_to_date(db_entry_dict['date_str'])
-            all_daily_data_dicts.append(db_entry_dict)
-        else:
-            # DB miss, try to fetch and store
-            logger.info(f"Orchestrator: DB miss for {py_datetime_obj_utc.date()}. Will attempt fetch_and_store.")
-            fetched_values_dict, error = fetch_and_store_daily_ohlcv(py_datetime_obj_utc)
-            if fetched_values_dict:
-                entry_to_append = fetched_values_dict.copy()
-                # The date for indexing should be the date we were trying to fetch for
-                entry_to_append['datetime_obj_for_index'] = py_datetime_obj_utc.date() 
-                all_daily_data_dicts.append(entry_to_append)
-            else:
-                logger.warning(f"Orchestrator: Could not fetch data for {py_datetime_obj_utc.date()} for indicator window. Error: {error}")
-    
-    if not all_daily_data_dicts: 
+    maybe_reload_csv_data() # New exports dropped into csv/ become visible without a restart
+
+    # The window is a slice of the process-wide in-memory store (loaded from SQLite once);
+    # only the days it reports as missing go to the fetch chain.
+    ohlcv_store = get_daily_ohlcv_store()
+    daily_df, missing_dates = ohlcv_store.window(norm_start_date_utc, norm_end_date_utc)
+    if missing_dates:
+        # Other processes (api-loader, csv_importer, the filler scripts) write daily_ohlcv while we run:
+        # pick up whatever they stored for the missing days before asking any provider
+        db_df, _ = get_daily_ohlcv_range(min(missing_dates), max(missing_dates))
+        db_df = db_df[db_df.index.isin(pd.DatetimeIndex([pd.Timestamp(d) for d in missing_dates]))]
+        if not db_df.empty:
+            ohlcv_store.upsert(db_df)
+            daily_df, missing_dates = ohlcv_store.window(norm_start_date_utc, norm_end_date_utc)
+            logger.info(f"Orchestrator: {len(db_df)} missing days found in daily_ohlcv (written by another process); merged into the in-memory store.")
+    if missing_dates:
+        blocked_date_keys = get_blocked_ohlcv_dates(norm_start_date_utc, norm_end_date_utc)
+        if blocked_date_keys:
+            missing_dates = [d for d in missing_dates if date_to_iso_string(d.date()) not in blocked_date_keys]
+            logger.info(f"Orchestrator: Skipping {len(blocked_date_keys)} days with a recent failed lookup (negative cache).")
+
+    if missing_dates:
+        logger.info(f"Orchestrator: {len(missing_dates)} of {len(daily_df) + len(missing_dates)} days missing from DB for {norm_start_date_utc.date()} to {norm_end_date_utc.date()}.")
+        backfilled_df = backfill_missing_daily_ohlcv(missing_dates)
+        if not backfilled_df.empty:
+            ohlcv_store.upsert(backfilled_df) # Already in SQLite; keep the in-memory copy in step
+            daily_df, _ = ohlcv_store.window(norm_start_date_utc, norm_end_date_utc)
+
+    if daily_df.empty: 
         logger.warning(f"Orchestrator: No daily data found for the range {norm_start_date_utc.date()} to {norm_end_date_utc.date()} for indicator calculation.")
         return pd.DataFrame()
-    
-    df = pd.DataFrame(all_daily_data_dicts)
-    if 'datetime_obj_for_index' not in df.columns:
-        logger.error("Orchestrator: 'datetime_obj_for_index' column missing after data assembly. Cannot create DataFrame for indicators.")
-        return pd.DataFrame()
-    
-    # Ensure 'datetime_obj_for_index' is pd.Timestamp UTC for set_index
-    df['datetime_obj_for_index'] = pd.to_datetime(df['datetime_obj_for_index'], utc=True)
-    df.set_index('datetime_obj_for_index', inplace=True)
-    
-    # Drop columns that might have come from DB ('date_str', 'timestamp') or were intermediate
-    df.drop(columns=['date_str', 'timestamp', 'fetched_at', 'source'], inplace=True, errors='ignore') 
-    
-    # Ensure essential OHLCV columns exist and are numeric
-    for col in ['open', 'high', 'low', 'close', 'volume']:
-        if col not in df.columns: 
-            df[col] = pd.NA # Use pandas NA for missing numeric data
-        df[col] = pd.to_numeric(df[col], errors='coerce') # Coerce converts problematic values to NaT/NaN
-    
-    return df.sort_index()
\ No newline at end of file
+
+    return daily_df # Sorted view on the store; resampling/indicators only read it
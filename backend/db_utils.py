@@ -1,15 +1,22 @@
 # backend/db_utils.py
 import sqlite3
 import logging
+import threading
 import time
 import os
 from datetime import datetime, timezone, date as DtDate # For type hinting
+import numpy as np
+import pandas as pd
+from backend import config
 
 logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.path.join(PROJECT_ROOT, 'bitcoin_daily_data.db')
 
+# Numeric columns of daily_ohlcv, in the order returned by range reads
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
 def date_to_iso_string(date_obj: DtDate) -> str:
     """Converts a date object to 'YYYY-MM-DD' ISO string."""
     return date_obj.strftime('%Y-%m-%d')
@@ -18,12 +25,52 @@ def iso_string_to_date(date_str: str) -> DtDate:
     """Converts 'YYYY-MM-DD' ISO string to a date object."""
     return datetime.strptime(date_str, '%Y-%m-%d').date()
 
+# --- Connection manager ---
+# Each thread keeps one open connection per DB file instead of connecting/closing
+# inside every helper. Keyed by path so tests (or scripts) that repoint DB_PATH get
+# a fresh connection. Connections are closed when their thread exits.
+_thread_local = threading.local()
+
+def _open_connection(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        db_path,
+        timeout=config.SQLITE_BUSY_TIMEOUT_SECONDS,
+        cached_statements=config.SQLITE_STATEMENT_CACHE_SIZE # Prepared statements reused across calls
+    )
+    conn.row_factory = sqlite3.Row
+    # WAL lets readers proceed while a writer (e.g. today's recompute) holds the write lock
+    journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+    if str(journal_mode).lower() != 'wal':
+        logger.warning(f"DB_UTILS: Could not enable WAL journaling for {db_path} (journal_mode={journal_mode}).")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA cache_size=-{int(config.SQLITE_PAGE_CACHE_KIB)}") # Negative value = size in KiB
+    conn.execute(f"PRAGMA mmap_size={int(config.SQLITE_MMAP_SIZE_BYTES)}")
+    logger.debug(f"DB_UTILS: Opened connection to {db_path} for thread {threading.current_thread().name}.")
+    return conn
+
+def get_connection() -> sqlite3.Connection:
+    """Returns the calling thread's connection to DB_PATH, opening it on first use."""
+    connections = getattr(_thread_local, 'connections', None)
+    if connections is None:
+        connections = _thread_local.connections = {}
+    conn = connections.get(DB_PATH)
+    if conn is None:
+        conn = connections[DB_PATH] = _open_connection(DB_PATH)
+    return conn
+
+def close_thread_connections():
+    """Closes every connection held by the calling thread (e.g. at the end of a script)."""
+    connections = getattr(_thread_local, 'connections', None) or {}
+    for conn in connections.values():
+        conn.close()
+    connections.clear()
+
 def init_db():
     """Initializes the database and ensures the schema is up-to-date."""
     # Log the DB_PATH being used by this function
     logger.info(f"DB_UTILS: init_db() called. Using DB_PATH: {os.path.abspath(DB_PATH)}")
     
-    conn = sqlite3.connect(DB_PATH)
+    conn = get_connection()
     cursor = conn.cursor()
 
     # Create daily_ohlcv table with TEXT date if it doesn't exist
@@ -35,6 +82,22 @@ def init_db():
     )
     ''')
 
+    # Negative cache: days no source could supply, and when they may be tried again
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS ohlcv_fetch_failures (
+        date_str TEXT PRIMARY KEY,  -- 'YYYY-MM-DD'
+        reason TEXT, attempted_at INTEGER, retry_after INTEGER, attempts INTEGER
+    )
+    ''')
+
+    # Streaming indicator state for "today" (backend/live_indicators.py), one JSON snapshot per timeframe
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS live_indicator_state (
+        timeframe TEXT PRIMARY KEY,  -- 'monthly' / 'weekly'
+        state_json TEXT, saved_at INTEGER
+    )
+    ''')
+
     # Create calculated_indicators table with TEXT date if it doesn't exist
     # And ensure 'calculated_at' column is present if table already exists
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='calculated_indicators';")
@@ -74,95 +137,248 @@ def init_db():
 
 
     conn.commit()
-    conn.close()
     # No need to log DB_PATH again here, already logged at the start of function
     # logger.info(f"Database {DB_PATH} initialized/verified.")
 
 # --- store_daily_ohlcv_data ---
 def store_daily_ohlcv_data(date_obj_utc: datetime, data_values: dict):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    conn = get_connection()
     # Ensure we are using just the date part, normalized to a string
     date_key_str = date_to_iso_string(date_obj_utc.date()) 
     try:
-        cursor.execute('''
-        INSERT OR REPLACE INTO daily_ohlcv
-        (date_str, open, high, low, close, volume, source, fetched_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            date_key_str, data_values['open'], data_values['high'],
-            data_values['low'], data_values['close'], data_values['volume'],
-            data_values['source'], int(time.time())
-        ))
-        conn.commit()
+        with conn: # Commits on success, rolls back on error
+            conn.execute('''
+            INSERT OR REPLACE INTO daily_ohlcv
+            (date_str, open, high, low, close, volume, source, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                date_key_str, data_values['open'], data_values['high'],
+                data_values['low'], data_values['close'], data_values['volume'],
+                data_values['source'], int(time.time())
+            ))
+            conn.execute("DELETE FROM ohlcv_fetch_failures WHERE date_str = ?", (date_key_str,))
         logger.info(f"Stored/Replaced daily_ohlcv for date {date_key_str} from {data_values['source']}")
     except Exception as e:
         logger.error(f"Error storing daily_ohlcv for date {date_key_str}: {e}")
-    finally:
-        conn.close()
+
+# --- store_daily_ohlcv_bulk ---
+def store_daily_ohlcv_bulk(frame_or_records, source: str = None):
+    """
+    Upserts many daily_ohlcv rows in a single transaction with executemany.
+    frame_or_records: DataFrame (or list of dicts) with OHLCV_COLUMNS and the day given either as a
+        'timestamp' column (Unix seconds or datetimes) or as a DatetimeIndex. Timestamps are
+        normalized to their UTC day; naive datetimes are taken as UTC.
+    source: Value stored in the 'source' column. A per-row 'source' column, if present, takes precedence.
+    Rows with an unparseable day or non-numeric OHLCV values are skipped.
+    Returns (rows_written, rows_skipped).
+    """
+    df = frame_or_records if isinstance(frame_or_records, pd.DataFrame) else pd.DataFrame(list(frame_or_records))
+    if df.empty:
+        return 0, 0
+
+    raw_ts = df['timestamp'] if 'timestamp' in df.columns else pd.Series(df.index, index=df.index)
+    if pd.api.types.is_datetime64_any_dtype(raw_ts):
+        day_ts = pd.to_datetime(raw_ts, utc=True)
+    else:
+        numeric_ts = pd.to_numeric(raw_ts, errors='coerce')
+        if numeric_ts.notna().any(): # Unix seconds, as in the Kraken OHLCVT exports
+            day_ts = pd.to_datetime(numeric_ts, unit='s', utc=True)
+        else: # datetime objects or date strings
+            day_ts = pd.to_datetime(raw_ts, utc=True, errors='coerce')
+    date_keys = day_ts.dt.strftime('%Y-%m-%d')
+
+    numeric_df = df.reindex(columns=OHLCV_COLUMNS).apply(pd.to_numeric, errors='coerce').astype(np.float64)
+    if 'source' in df.columns:
+        sources = df['source'].where(df['source'].notna(), source)
+    else:
+        sources = pd.Series(source, index=df.index)
+
+    valid_mask = date_keys.notna() & numeric_df.notna().all(axis=1) & sources.notna()
+    rows_skipped = int((~valid_mask).sum())
+    if rows_skipped:
+        logger.warning(f"DB BULK: Skipping {rows_skipped} of {len(df)} rows with unparseable dates, non-numeric OHLCV values or no source.")
+
+    fetched_at = int(time.time())
+    valid_keys = date_keys[valid_mask]
+    valid_values = numeric_df[valid_mask].to_numpy()
+    rows_to_write = [
+        (date_key, *ohlcv, row_source, fetched_at)
+        for date_key, ohlcv, row_source in zip(valid_keys, valid_values.tolist(), sources[valid_mask])
+    ]
+    if not rows_to_write:
+        return 0, rows_skipped
+
+    conn = get_connection()
+    try:
+        with conn: # One transaction for the whole batch
+            conn.executemany('''
+            INSERT OR REPLACE INTO daily_ohlcv
+            (date_str, open, high, low, close, volume, source, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows_to_write)
+            conn.executemany("DELETE FROM ohlcv_fetch_failures WHERE date_str = ?", [(row[0],) for row in rows_to_write])
+    except Exception as e:
+        logger.error(f"Error bulk storing {len(rows_to_write)} daily_ohlcv rows: {e}")
+        return 0, len(df)
+    logger.info(f"DB BULK: Stored/Replaced {len(rows_to_write)} daily_ohlcv rows ({valid_keys.min()} .. {valid_keys.max()}).")
+    return len(rows_to_write), rows_skipped
 
 # --- get_daily_ohlcv_from_db ---
 def get_daily_ohlcv_from_db(date_obj_utc: datetime):
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row 
-    cursor = conn.cursor()
+    conn = get_connection()
     date_key_str = date_to_iso_string(date_obj_utc.date())
-    cursor.execute("SELECT * FROM daily_ohlcv WHERE date_str = ?", (date_key_str,))
-    row = cursor.fetchone()
-    conn.close()
+    row = conn.execute("SELECT * FROM daily_ohlcv WHERE date_str = ?", (date_key_str,)).fetchone()
     if row:
         logger.debug(f"DB GET: Found daily_ohlcv for {date_key_str}.")
         return dict(row)
     logger.debug(f"DB GET: No daily_ohlcv for {date_key_str}.")
     return None
 
+# --- get_daily_ohlcv_range ---
+def get_daily_ohlcv_range(start_date_utc: datetime, end_date_utc: datetime):
+    """
+    Reads all daily_ohlcv rows between start and end (inclusive) with a single
+    indexed BETWEEN query on the date_str primary key.
+    Returns (ohlcv_df, missing_dates):
+        ohlcv_df: float64 DataFrame of OHLCV_COLUMNS indexed by UTC day-start timestamps.
+        missing_dates: list of UTC day-start datetimes in the range with no row in the DB.
+    """
+    start_key_str = date_to_iso_string(start_date_utc.date())
+    end_key_str = date_to_iso_string(end_date_utc.date())
+    rows = get_connection().execute(
+        "SELECT date_str, open, high, low, close, volume FROM daily_ohlcv "
+        "WHERE date_str BETWEEN ? AND ? ORDER BY date_str",
+        (start_key_str, end_key_str)
+    ).fetchall()
+
+    # NULLs in the DB become NaN in the float64 block
+    values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(OHLCV_COLUMNS))
+    index = pd.to_datetime([row[0] for row in rows], format='%Y-%m-%d', utc=True)
+    ohlcv_df = pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS)
+
+    expected_days = pd.date_range(start=start_key_str, end=end_key_str, freq='D', tz='UTC')
+    missing_dates = [ts.to_pydatetime() for ts in expected_days.difference(ohlcv_df.index)]
+    logger.debug(f"DB GET RANGE: {len(ohlcv_df)} rows for {start_key_str}..{end_key_str}, {len(missing_dates)} missing.")
+    return ohlcv_df, missing_dates
+
+def get_all_daily_ohlcv() -> pd.DataFrame:
+    """Reads the whole daily_ohlcv table in date order as a float64 OHLCV DataFrame (UTC day-start index)."""
+    rows = get_connection().execute(
+        "SELECT date_str, open, high, low, close, volume FROM daily_ohlcv ORDER BY date_str"
+    ).fetchall()
+    values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(OHLCV_COLUMNS))
+    index = pd.to_datetime([row[0] for row in rows], format='%Y-%m-%d', utc=True)
+    logger.debug(f"DB GET ALL: {len(rows)} daily rows.")
+    return pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS)
+
+# --- record_ohlcv_fetch_failure ---
+def record_ohlcv_fetch_failure(date_obj_utc: datetime, reason: str, base_retry_seconds: int, max_retry_seconds: int = None) -> int:
+    """
+    Records that no source could supply a day. The retry delay starts at base_retry_seconds and
+    doubles with each consecutive failure (capped at max_retry_seconds). Storing data for the day clears it.
+    Returns the retry_after Unix time.
+    """
+    conn = get_connection()
+    date_key_str = date_to_iso_string(date_obj_utc.date())
+    now_ts = int(time.time())
+    retry_after_ts = now_ts + base_retry_seconds
+    try:
+        with conn:
+            row = conn.execute("SELECT attempts FROM ohlcv_fetch_failures WHERE date_str = ?", (date_key_str,)).fetchone()
+            attempts = (row['attempts'] or 0) + 1 if row else 1
+            retry_seconds = base_retry_seconds * 2 ** (attempts - 1)
+            if max_retry_seconds is not None:
+                retry_seconds = min(retry_seconds, max_retry_seconds)
+            retry_after_ts = now_ts + int(retry_seconds)
+            conn.execute('''
+            INSERT OR REPLACE INTO ohlcv_fetch_failures (date_str, reason, attempted_at, retry_after, attempts)
+            VALUES (?, ?, ?, ?, ?)
+            ''', (date_key_str, reason, now_ts, retry_after_ts, attempts))
+        logger.info(f"Recorded fetch failure #{attempts} for {date_key_str}; retry after {datetime.fromtimestamp(retry_after_ts, tz=timezone.utc).isoformat()}.")
+    except Exception as e:
+        logger.error(f"Error recording fetch failure for date {date_key_str}: {e}")
+    return retry_after_ts
+
+# --- get_blocked_ohlcv_dates ---
+def get_blocked_ohlcv_dates(start_date_utc: datetime, end_date_utc: datetime) -> set:
+    """Returns the 'YYYY-MM-DD' keys in the range whose recorded fetch failure has not reached retry_after yet."""
+    rows = get_connection().execute(
+        "SELECT date_str FROM ohlcv_fetch_failures WHERE date_str BETWEEN ? AND ? AND retry_after > ?",
+        (date_to_iso_string(start_date_utc.date()), date_to_iso_string(end_date_utc.date()), int(time.time()))
+    ).fetchall()
+    return {row[0] for row in rows}
+
+# --- clear_ohlcv_fetch_failures ---
+def clear_ohlcv_fetch_failures(date_keys) -> int:
+    """Drops negative-cache entries for the given 'YYYY-MM-DD' keys (e.g. days a new CSV now supplies). Returns rows removed."""
+    date_keys = list(date_keys)
+    if not date_keys:
+        return 0
+    conn = get_connection()
+    try:
+        with conn:
+            cursor = conn.executemany("DELETE FROM ohlcv_fetch_failures WHERE date_str = ?", [(key,) for key in date_keys])
+        return cursor.rowcount
+    except Exception as e:
+        logger.error(f"Error clearing fetch failures for {len(date_keys)} days: {e}")
+        return 0
+
 # --- store_full_indicator_set ---
 def store_full_indicator_set(date_obj_utc: datetime, price_at_event, indicators_m, indicators_w, composite_metrics, outcomes):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
+    conn = get_connection()
     date_key_str = date_to_iso_string(date_obj_utc.date())
     current_calc_time = int(time.time())
     try:
-        cursor.execute('''
-            INSERT OR REPLACE INTO calculated_indicators (
-                date_str, price_at_event,
-                rsi_monthly, rsi_weekly, stoch_rsi_monthly, stoch_rsi_weekly,
-                mfi_monthly, mfi_weekly, crsi_monthly, crsi_weekly,
-                williams_r_monthly, williams_r_weekly, rvi_monthly, rvi_weekly,
-                adaptive_rsi_monthly, adaptive_rsi_weekly,
-                cos_monthly, cos_weekly, bsi_monthly, bsi_weekly,
-                outcome_1m_direction, outcome_1m_percentage, outcome_1m_price,
-                outcome_6m_direction, outcome_6m_percentage, outcome_6m_price,
-                outcome_12m_direction, outcome_12m_percentage, outcome_12m_price,
-                calculated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            date_key_str, price_at_event,
-            indicators_m.get('rsi'), indicators_w.get('rsi'), indicators_m.get('stochRsi'), indicators_w.get('stochRsi'),
-            indicators_m.get('mfi'), indicators_w.get('mfi'), indicators_m.get('crsi'), indicators_w.get('crsi'),
-            indicators_m.get('williamsR'), indicators_w.get('williamsR'), indicators_m.get('rvi'), indicators_w.get('rvi'),
-            indicators_m.get('adaptiveRsi'), indicators_w.get('adaptiveRsi'),
-            composite_metrics['cos']['monthly'], composite_metrics['cos']['weekly'],
-            composite_metrics['bsi']['monthly'], composite_metrics['bsi']['weekly'],
-            outcomes['1M']['direction'], outcomes['1M']['percentage'], outcomes['1M']['price'],
-            outcomes['6M']['direction'], outcomes['6M']['percentage'], outcomes['6M']['price'],
-            outcomes['12M']['direction'], outcomes['12M']['percentage'], outcomes['12M']['price'],
-            current_calc_time
-        ))
-        conn.commit()
+        with conn: # Commits on success, rolls back on error
+            conn.execute('''
+                INSERT OR REPLACE INTO calculated_indicators (
+                    date_str, price_at_event,
+                    rsi_monthly, rsi_weekly, stoch_rsi_monthly, stoch_rsi_weekly,
+                    mfi_monthly, mfi_weekly, crsi_monthly, crsi_weekly,
+                    williams_r_monthly, williams_r_weekly, rvi_monthly, rvi_weekly,
+                    adaptive_rsi_monthly, adaptive_rsi_weekly,
+                    cos_monthly, cos_weekly, bsi_monthly, bsi_weekly,
+                    outcome_1m_direction, outcome_1m_percentage, outcome_1m_price,
+                    outcome_6m_direction, outcome_6m_percentage, outcome_6m_price,
+                    outcome_12m_direction, outcome_12m_percentage, outcome_12m_price,
+                    calculated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                date_key_str, price_at_event,
+                indicators_m.get('rsi'), indicators_w.get('rsi'), indicators_m.get('stochRsi'), indicators_w.get('stochRsi'),
+                indicators_m.get('mfi'), indicators_w.get('mfi'), indicators_m.get('crsi'), indicators_w.get('crsi'),
+                indicators_m.get('williamsR'), indicators_w.get('williamsR'), indicators_m.get('rvi'), indicators_w.get('rvi'),
+                indicators_m.get('adaptiveRsi'), indicators_w.get('adaptiveRsi'),
+                composite_metrics['cos']['monthly'], composite_metrics['cos']['weekly'],
+                composite_metrics['bsi']['monthly'], composite_metrics['bsi']['weekly'],
+                outcomes['1M']['direction'], outcomes['1M']['percentage'], outcomes['1M']['price'],
+                outcomes['6M']['direction'], outcomes['6M']['percentage'], outcomes['6M']['price'],
+                outcomes['12M']['direction'], outcomes['12M']['percentage'], outcomes['12M']['price'],
+                current_calc_time
+            ))
         logger.info(f"Stored/Replaced calculated_indicators for date {date_key_str}")
     except Exception as e:
         logger.error(f"Error storing calculated_indicators for date {date_key_str}: {e}")
-    finally:
-        conn.close()
+
+# --- live indicator state ---
+def store_live_indicator_state_json(timeframe: str, state_json: str):
+    conn = get_connection()
+    try:
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO live_indicator_state (timeframe, state_json, saved_at) VALUES (?, ?, ?)",
+                         (timeframe, state_json, int(time.time())))
+        logger.debug(f"Stored live indicator state for {timeframe} ({len(state_json)} bytes)")
+    except Exception as e:
+        logger.error(f"Error storing live indicator state for {timeframe}: {e}")
+
+def get_live_indicator_state_json(timeframe: str):
+    """The last saved state snapshot for a timeframe, or None."""
+    row = get_connection().execute("SELECT state_json FROM live_indicator_state WHERE timeframe = ?", (timeframe,)).fetchone()
+    return row[0] if row else None
 
 # --- get_full_indicator_set_from_db ---
 def get_full_indicator_set_from_db(date_obj_utc: datetime):
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    conn = get_connection()
     date_key_str = date_to_iso_string(date_obj_utc.date())
-    cursor.execute("SELECT * FROM calculated_indicators WHERE date_str = ?", (date_key_str,))
-    row = cursor.fetchone()
-    conn.close()
+    row = conn.execute("SELECT * FROM calculated_indicators WHERE date_str = ?", (date_key_str,)).fetchone()
     return dict(row) if row else None
\ No newline at end of file
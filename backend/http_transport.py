@@ -0,0 +1,195 @@
+# backend/http_transport.py
+import time
+import random
+import logging
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend import config
+from backend.rate_limiter import get_rate_limiter, get_concurrency_slot
+from backend.circuit_breaker import get_circuit_breaker, CircuitOpenError
+from backend.response_cache import (get_response_cache, get_response_cache_mode,
+                                    response_cache_ttl_seconds, ResponseCacheMiss, normalize_request_url)
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504, 520}
+
+def _retry_after_seconds(response, default_seconds: float) -> float:
+    """Cooldown to apply after a rate-limit response: the Retry-After header when the provider sends one."""
+    header_value = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return max(float(header_value), 0.0) if header_value is not None else default_seconds
+    except ValueError:
+        return default_seconds
+
+
+class HostMetrics:
+    """Per-host counters: requests, retries, errors, status codes, bytes received and latency."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0 # Connection errors / timeouts (no HTTP status)
+        self.status_counts = {}
+        self.bytes_received = 0
+        self.latency_total_seconds = 0.0
+        self.latency_max_seconds = 0.0
+        self.cache_hits = 0 # Served from the on-disk response cache (not counted as requests)
+
+    def record_response(self, status_code: int, num_bytes: int, latency_seconds: float):
+        with self._lock:
+            self.requests += 1
+            self.status_counts[status_code] = self.status_counts.get(status_code, 0) + 1
+            self.bytes_received += num_bytes
+            self.latency_total_seconds += latency_seconds
+            self.latency_max_seconds = max(self.latency_max_seconds, latency_seconds)
+
+    def record_error(self, latency_seconds: float):
+        with self._lock:
+            self.requests += 1
+            self.errors += 1
+            self.latency_total_seconds += latency_seconds
+            self.latency_max_seconds = max(self.latency_max_seconds, latency_seconds)
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_cache_hit(self):
+        with self._lock:
+            self.cache_hits += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                'requests': self.requests, 'retries': self.retries, 'errors': self.errors,
+                'status_counts': {str(code): count for code, count in sorted(self.status_counts.items())},
+                'bytes_received': self.bytes_received,
+                'latency_avg_ms': round(self.latency_total_seconds / self.requests * 1000, 1) if self.requests else None,
+                'latency_max_ms': round(self.latency_max_seconds * 1000, 1),
+                'cache_hits': self.cache_hits,
+            }
+
+
+class HostTransport:
+    """
+    Shared HTTP transport for one host: a pooled keep-alive requests.Session (so bulk backfills reuse
+    TCP+TLS connections), the provider's rate limiter and concurrency slot around every attempt, and
+    retries on connection errors, 429 and 5xx with jittered exponential backoff. A 429 penalizes the
+    provider's rate limiter (Retry-After when sent), so all threads back off, not just this one.
+    Calls that name a cache endpoint can be served from / recorded to the on-disk response cache.
+    Every attempt reports to the provider's circuit breaker; while it is open, attempts fail fast
+    with CircuitOpenError instead of working through the retry ladder. 429s and 5xx count as failures,
+    and so do 200s the caller's rate_limited(response) check flags (Kraken's in-body rate limit).
+    """
+    def __init__(self, host: str, provider: str):
+        self.host = host
+        self.provider = provider
+        self.rate_limiter = get_rate_limiter(provider)
+        self.concurrency_slot = get_concurrency_slot(provider)
+        self.circuit_breaker = get_circuit_breaker(provider)
+        self.metrics = HostMetrics()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.HTTP_POOL_MAXSIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _backoff_seconds(self, attempt: int, base_seconds: float) -> float:
+        """Full jitter: uniform in [0, min(max, base * 2**attempt)], so concurrent retries spread out."""
+        return random.uniform(0, min(config.HTTP_BACKOFF_MAX_SECONDS, base_seconds * (2 ** attempt)))
+
+    def get(self, url: str, params: dict = None, timeout: float = 10, retries: int = None,
+            backoff_base_seconds: float = None, cache_endpoint: str = None, cache_permanent: bool = False,
+            cache_validator=None, rate_limited=None) -> requests.Response:
+        """
+        GET with transport-level retries. Returns the final response (callers still raise_for_status()
+        for non-retryable or exhausted errors); re-raises the last RequestException if no response came back.
+
+        Passing cache_endpoint (e.g. 'kraken_ohlc') opts the call into the response cache when
+        config.HTTP_RESPONSE_CACHE_MODE is 'record' or 'replay'. cache_permanent marks responses that only
+        cover finished days (kept forever instead of for the endpoint's TTL); cache_validator(response)
+        can veto storing a 200 that carries an application-level error.
+
+        rate_limited(response) flags a 200 that is really a rate-limit rejection (Kraken's
+        EAPI:Rate limit exceeded): the circuit breaker records it as a failure, like a 429. Retrying and
+        penalizing the rate limiter for it is left to the caller, which knows the provider's error format.
+        """
+        mode = get_response_cache_mode() if cache_endpoint else 'off'
+        if mode == 'off':
+            return self._get_live(url, params, timeout, retries, backoff_base_seconds, rate_limited)
+
+        cache = get_response_cache()
+        cached_response = cache.lookup(url, params, allow_expired=(mode == 'replay'))
+        if cached_response is not None:
+            self.metrics.record_cache_hit()
+            return cached_response
+        if mode == 'replay':
+            raise ResponseCacheMiss(f"No cached response for {normalize_request_url(url, params)} (replay mode)")
+
+        response = self._get_live(url, params, timeout, retries, backoff_base_seconds, rate_limited)
+        if response.status_code == 200 and (cache_validator is None or cache_validator(response)):
+            cache.store(url, params, response, None if cache_permanent else response_cache_ttl_seconds(cache_endpoint))
+        return response
+
+    def _get_live(self, url: str, params: dict, timeout: float, retries: int, backoff_base_seconds: float,
+                  rate_limited=None) -> requests.Response:
+        retries = config.HTTP_RETRIES if retries is None else retries
+        backoff_base_seconds = config.HTTP_BACKOFF_BASE_SECONDS if backoff_base_seconds is None else backoff_base_seconds
+        for attempt in range(retries + 1):
+            if not self.circuit_breaker.allow_request():
+                raise CircuitOpenError(f"Circuit breaker for {self.provider} is open; skipped GET {url}")
+            self.rate_limiter.acquire() # Waits only if the shared budget is used up (or a 429 cooldown is active)
+            started = time.perf_counter()
+            try:
+                with self.concurrency_slot:
+                    response = self.session.get(url, params=params, timeout=timeout)
+                    num_bytes = len(response.content) # Body is read inside the slot, like a plain requests.get
+            except requests.exceptions.RequestException as e:
+                self.metrics.record_error(time.perf_counter() - started)
+                self.circuit_breaker.record(False, time.perf_counter() - started)
+                if attempt == retries:
+                    raise
+                backoff_seconds = self._backoff_seconds(attempt, backoff_base_seconds)
+                logger.warning(f"HTTPTransport[{self.host}]: {type(e).__name__} (attempt {attempt + 1}/{retries + 1}). Retrying in {backoff_seconds:.2f}s.")
+                self.metrics.record_retry()
+                time.sleep(backoff_seconds)
+                continue
+
+            latency_seconds = time.perf_counter() - started
+            self.metrics.record_response(response.status_code, num_bytes, latency_seconds)
+            throttled = response.status_code == 200 and rate_limited is not None and rate_limited(response)
+            self.circuit_breaker.record(response.status_code not in RETRYABLE_STATUS_CODES and not throttled, latency_seconds)
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == retries:
+                return response
+            self.metrics.record_retry()
+            if response.status_code == 429:
+                cooldown_seconds = _retry_after_seconds(response, self._backoff_seconds(attempt, backoff_base_seconds))
+                logger.warning(f"HTTPTransport[{self.host}]: 429 (attempt {attempt + 1}/{retries + 1}). Cooling down {cooldown_seconds:.2f}s.")
+                self.rate_limiter.penalize(cooldown_seconds) # The next acquire() waits it out
+            else:
+                backoff_seconds = self._backoff_seconds(attempt, backoff_base_seconds)
+                logger.warning(f"HTTPTransport[{self.host}]: HTTP {response.status_code} (attempt {attempt + 1}/{retries + 1}). Retrying in {backoff_seconds:.2f}s.")
+                time.sleep(backoff_seconds)
+        return response
+
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+def get_host_transport(base_url: str, provider: str) -> HostTransport:
+    """Returns the process-wide transport for base_url's host (one pooled session per host)."""
+    host = urlsplit(base_url).netloc
+    with _transports_lock:
+        transport = _transports.get(host)
+        if transport is None:
+            transport = _transports[host] = HostTransport(host, provider)
+        return transport
+
+def get_transport_metrics() -> dict:
+    """Counter snapshot for every host used so far, keyed by host."""
+    with _transports_lock:
+        transports = list(_transports.values())
+    return {transport.host: {'provider': transport.provider, **transport.metrics.as_dict()} for transport in transports}
@@ -12,6 +12,7 @@ from backend.indicators import connors_rsi
 from backend.indicators import williams_r
 from backend.indicators import rvi
 from backend.indicators import adaptive_rsi
+from backend.indicators.context import IndicatorContext
 
 # Import config
 from backend import config # Assuming config.py is in backend/
@@ -30,51 +31,58 @@ def _get_last_value_from_series(series: pd.Series):
 # --- Wrapper functions calling the new indicator modules ---
 # These wrappers will now fetch params from config.
 
-def calculate_rsi_series(ohlc_df: pd.DataFrame, timeframe_label: str = None) -> pd.Series:
+def calculate_rsi_series(ohlc_df: pd.DataFrame, timeframe_label: str = None, context: IndicatorContext = None) -> pd.Series:
     params = config.get_indicator_params("rsi", timeframe_label)
-    return rsi.calculate(ohlc_df, period=params.get("period", 14))
+    return rsi.calculate(ohlc_df, period=params.get("period", 14), context=context)
 
-def calculate_stoch_rsi_series(ohlc_df: pd.DataFrame, timeframe_label: str = None) -> pd.Series:
+def calculate_stoch_rsi_series(ohlc_df: pd.DataFrame, timeframe_label: str = None, context: IndicatorContext = None) -> pd.Series:
     params = config.get_indicator_params("stochRsi", timeframe_label)
     return stochastic_rsi.calculate(ohlc_df, 
                                     rsi_period=params.get("rsi_period", 14), 
                                     stoch_period=params.get("stoch_period", 14), 
-                                    k_smooth=params.get("k_smooth", 3))
+                                    k_smooth=params.get("k_smooth", 3),
+                                    context=context)
 
-def calculate_mfi_series(ohlc_df: pd.DataFrame, timeframe_label: str = None) -> pd.Series:
+def calculate_mfi_series(ohlc_df: pd.DataFrame, timeframe_label: str = None, context: IndicatorContext = None) -> pd.Series:
     params = config.get_indicator_params("mfi", timeframe_label)
-    return mfi.calculate(ohlc_df, period=params.get("period", 14))
+    return mfi.calculate(ohlc_df, period=params.get("period", 14), context=context)
 
-def calculate_crsi_series(ohlc_df: pd.DataFrame, timeframe_label: str = None) -> pd.Series:
-    params = config.get_indicator_params("crsi", timeframe_label)
+def crsi_rank_len(params: dict, timeframe_label: str, bar_count: int) -> int:
+    """CRSI rank_len for a frame of bar_count bars (also used by the as-of engine)."""
     # Dynamic adjustment of rank_len based on actual data length for this timeframe
-    # This is better done here where ohlc_df is available.
     dynamic_rank_len = params.get("rank_len", 100) # Start with configured/default
     if timeframe_label == 'monthly':
-        dynamic_rank_len = min(params.get("rank_len", 12), max(5, len(ohlc_df) - 10)) 
+        dynamic_rank_len = min(params.get("rank_len", 12), max(5, bar_count - 10)) 
     elif timeframe_label == 'weekly':
-        dynamic_rank_len = min(params.get("rank_len", 50), max(10, len(ohlc_df) - 10))
+        dynamic_rank_len = min(params.get("rank_len", 50), max(10, bar_count - 10))
+    return dynamic_rank_len
+
+def calculate_crsi_series(ohlc_df: pd.DataFrame, timeframe_label: str = None, context: IndicatorContext = None) -> pd.Series:
+    params = config.get_indicator_params("crsi", timeframe_label)
+    dynamic_rank_len = crsi_rank_len(params, timeframe_label, len(ohlc_df))
     
     return connors_rsi.calculate(ohlc_df, 
                                  rsi_short_len=params.get("rsi_short_len", 3), 
                                  rsi_streak_len=params.get("rsi_streak_len", 2), 
-                                 rank_len=dynamic_rank_len) # Use dynamically adjusted rank_len
+                                 rank_len=dynamic_rank_len, # Use dynamically adjusted rank_len
+                                 context=context)
 
-def calculate_williams_r_series(ohlc_df: pd.DataFrame, timeframe_label: str = None) -> pd.Series:
+def calculate_williams_r_series(ohlc_df: pd.DataFrame, timeframe_label: str = None, context: IndicatorContext = None) -> pd.Series:
     params = config.get_indicator_params("williamsR", timeframe_label)
-    return williams_r.calculate(ohlc_df, period=params.get("period", 14))
+    return williams_r.calculate(ohlc_df, period=params.get("period", 14), context=context)
 
-def calculate_rvi_series(ohlc_df: pd.DataFrame, timeframe_label: str = None) -> pd.Series:
+def calculate_rvi_series(ohlc_df: pd.DataFrame, timeframe_label: str = None, context: IndicatorContext = None) -> pd.Series:
     params = config.get_indicator_params("rvi", timeframe_label)
-    return rvi.calculate(ohlc_df, period=params.get("period", 10))
+    return rvi.calculate(ohlc_df, period=params.get("period", 10), context=context)
 
-def calculate_adaptive_rsi_series(ohlc_df: pd.DataFrame, timeframe_label: str = None) -> pd.Series:
+def calculate_adaptive_rsi_series(ohlc_df: pd.DataFrame, timeframe_label: str = None, context: IndicatorContext = None) -> pd.Series:
     params = config.get_indicator_params("adaptiveRsi", timeframe_label)
     return adaptive_rsi.calculate(ohlc_df, 
                                   period=params.get("period", 14), 
                                   kama_n=params.get("kama_n", 10), 
                                   kama_fast_ema=params.get("kama_fast_ema", 2), 
-                                  kama_slow_ema=params.get("kama_slow_ema", 30))
+                                  kama_slow_ema=params.get("kama_slow_ema", 30),
+                                  context=context)
 
 
 # --- Core Orchestration and Other Utility Functions ---
@@ -119,6 +127,17 @@ def resample_ohlc_data(daily_df: pd.DataFrame, rule='W-MON') -> pd.DataFrame:
     return resampled_df
 
 
+def resample_bin_end_days(day_numbers: np.ndarray, rule: str) -> np.ndarray:
+    """For day numbers (days since 1970-01-01), the last day of the resample_ohlc_data bin each falls into."""
+    if rule == 'W-MON':
+        weekday = (day_numbers + 3) % 7 # 1970-01-01 was a Thursday; Monday = 0
+        return day_numbers + (7 - weekday) % 7
+    if rule == 'ME':
+        months = day_numbers.astype('datetime64[D]').astype('datetime64[M]')
+        return ((months + 1).astype('datetime64[D]') - 1).astype(np.int64)
+    raise ValueError(f"Unsupported resample rule '{rule}'")
+
+
 def calculate_indicators_from_ohlc_df(ohlc_df: pd.DataFrame, timeframe_label: str) -> dict:
     date_info_str = ohlc_df.index[-1].strftime('%Y-%m-%d') if not ohlc_df.empty and isinstance(ohlc_df.index, pd.DatetimeIndex) else "N/A"
 
@@ -140,16 +159,21 @@ def calculate_indicators_from_ohlc_df(ohlc_df: pd.DataFrame, timeframe_label: st
         logger.error(f"Critical: 'close' prices are all NaN or missing in {timeframe_label} OHLC df for {date_info_str} after prep.")
         return {key: None for key in config.DEFAULT_INDICATOR_PARAMS.keys()}
 
+    # One context per frame: intermediate series (close diff, RSI gains/losses and RSI(p), streaks, typical price, rolling min/max)
+    # are computed the first time an indicator asks for them and shared with the others
+    context = IndicatorContext(df_for_calc, label=f"{timeframe_label} ending {date_info_str}")
+
     # Call wrapper functions, passing timeframe_label for parameter selection
     series_dict = {
-        'rsi': calculate_rsi_series(df_for_calc, timeframe_label), 
-        'stochRsi': calculate_stoch_rsi_series(df_for_calc, timeframe_label),
-        'mfi': calculate_mfi_series(df_for_calc, timeframe_label), 
-        'crsi': calculate_crsi_series(df_for_calc, timeframe_label),
-        'williamsR': calculate_williams_r_series(df_for_calc, timeframe_label), 
-        'rvi': calculate_rvi_series(df_for_calc, timeframe_label), 
-        'adaptiveRsi': calculate_adaptive_rsi_series(df_for_calc, timeframe_label)
+        'rsi': calculate_rsi_series(df_for_calc, timeframe_label, context), 
+        'stochRsi': calculate_stoch_rsi_series(df_for_calc, timeframe_label, context),
+        'mfi': calculate_mfi_series(df_for_calc, timeframe_label, context), 
+        'crsi': calculate_crsi_series(df_for_calc, timeframe_label, context),
+        'williamsR': calculate_williams_r_series(df_for_calc, timeframe_label, context), 
+        'rvi': calculate_rvi_series(df_for_calc, timeframe_label, context), 
+        'adaptiveRsi': calculate_adaptive_rsi_series(df_for_calc, timeframe_label, context)
     }
+    context.log_stats()
     
     for key, series_data in series_dict.items():
         indicators_results[key] = _get_last_value_from_series(series_data)
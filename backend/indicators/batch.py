@@ -0,0 +1,170 @@
+# backend/indicators/batch.py
+# Batched versions of the indicator modules for many frames of the same length at once: every input
+# is a (frames, bars) float64 array with one OHLC frame per row, every output has the same shape.
+# Used by the as-of engine (backend/asof_indicators.py), which evaluates one frame per calendar day.
+# The formulas themselves come from kernels.py, shared with the single-frame modules (rsi.py, mfi.py, ...);
+# this module only batches the rolling windows and recursions and mirrors the modules' guards and NaN
+# handling, so the last valid value of each row equals what calculate_indicators_from_ohlc_df returns
+# for that frame. tests/modular/test_asof_indicators.py checks that parity.
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from backend.indicators import kernels
+
+
+def _nan_rows(values: np.ndarray) -> np.ndarray:
+    return np.full(values.shape, np.nan)
+
+
+def rolling(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """
+    rolling(window, min_periods=window).<reducer>() along the bars axis: positions before the first
+    full window, and windows with any NaN, are NaN.
+    """
+    result = _nan_rows(values)
+    if 0 < window <= values.shape[1]:
+        result[:, window - 1:] = reducer(sliding_window_view(values, window, axis=1), axis=-1)
+    return result
+
+
+def last_valid(values: np.ndarray) -> np.ndarray:
+    """Last non-NaN value of each row (NaN for rows without one), like _get_last_value_from_series."""
+    if values.shape[1] == 0:
+        return np.full(values.shape[0], np.nan)
+    valid = ~np.isnan(values)
+    last_position = values.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+    return np.where(valid.any(axis=1), values[np.arange(values.shape[0]), last_position], np.nan)
+
+
+def wilder_average(values: np.ndarray, period: int) -> np.ndarray:
+    """kernels.wilder_average for every row; the recursion loops over bars and is vectorized over frames."""
+    averages = _nan_rows(values)
+    if values.shape[1] <= period:
+        return averages
+    seed_window = values[:, 1:period + 1]
+    seed_count = (~np.isnan(seed_window)).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        previous = np.where(seed_count > 0, np.nansum(seed_window, axis=1) / seed_count, np.nan)
+    averages[:, period] = previous
+    for position in range(period + 1, values.shape[1]):
+        previous = (previous * (period - 1) + values[:, position]) / period # NaN stays NaN to the end
+        averages[:, position] = previous
+    return averages
+
+
+def rsi(close: np.ndarray, period: int) -> np.ndarray:
+    """rsi.calculate for every row (its length and all-NaN guards come out of the recursion as NaN)."""
+    gain, loss = kernels.gains_losses(kernels.first_diff(close))
+    return kernels.rsi_from_averages(wilder_average(gain, period), wilder_average(loss, period))
+
+
+def stoch_rsi(close: np.ndarray, rsi_period: int, stoch_period: int, k_smooth: int, rsi_series: np.ndarray = None) -> np.ndarray:
+    rsi_series = rsi(close, rsi_period) if rsi_series is None else rsi_series
+    min_rsi = rolling(rsi_series, stoch_period, np.min)
+    max_rsi = rolling(rsi_series, stoch_period, np.max)
+    k_raw = kernels.stochastic_k(rsi_series, min_rsi, max_rsi)
+    return rolling(k_raw, max(1, k_smooth), np.mean)
+
+
+def mfi(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, period: int) -> np.ndarray:
+    if high.shape[1] < period + 1:
+        return _nan_rows(close)
+    typical_price = (high + low + close) / 3.0
+    raw_money_flow = typical_price * volume
+    direction = kernels.first_diff(typical_price)
+    with np.errstate(invalid='ignore'):
+        positive_flow = np.where(direction > 0, raw_money_flow, 0.0)
+        negative_flow = np.where(direction < 0, raw_money_flow, 0.0)
+    sum_positive = rolling(positive_flow, period, np.sum)
+    sum_negative = rolling(negative_flow, period, np.sum)
+    mfi_values = kernels.money_flow_index(sum_positive, sum_negative)
+    # mfi.calculate returns all NaN when high, low, close or volume is entirely NaN
+    missing_column = np.zeros(close.shape[0], dtype=bool)
+    for column in (high, low, close, volume):
+        missing_column |= np.isnan(column).all(axis=1)
+    mfi_values[missing_column] = np.nan
+    return mfi_values
+
+
+def streaks(close: np.ndarray) -> np.ndarray:
+    """kernels.streak_values for every row."""
+    delta = kernels.first_diff(close)
+    streak_values = np.zeros(close.shape)
+    streak = np.zeros(close.shape[0])
+    for position in range(1, close.shape[1]):
+        diff = delta[:, position]
+        streak = np.where(diff > 0, np.where(streak > 0, streak + 1, 1.0),
+                          np.where(diff < 0, np.where(streak < 0, streak - 1, -1.0), 0.0))
+        streak_values[:, position] = streak
+    return streak_values
+
+
+def rolling_percent_rank(values: np.ndarray, window: int) -> np.ndarray:
+    """kernels.rolling_percent_rank for every row (windows are short here, so it compares whole windows)."""
+    values = np.where(np.isinf(values), np.nan, values)
+    ranks = _nan_rows(values)
+    if window <= 0 or values.shape[1] < window:
+        return ranks
+    windows = sliding_window_view(values, window, axis=1)
+    current = windows[..., -1:]
+    below = (windows < current).sum(axis=-1)
+    ties = (windows == current).sum(axis=-1)
+    ranked = (below + (ties + 1) / 2.0) / window * 100
+    ranks[:, window - 1:] = np.where(np.isnan(windows).any(axis=-1), np.nan, ranked)
+    return ranks
+
+
+def crsi(close: np.ndarray, rsi_short_len: int, rsi_streak_len: int, rank_len: int, rsi_short: np.ndarray = None) -> np.ndarray:
+    if close.shape[1] < rank_len + rsi_short_len + rsi_streak_len + 5:
+        return _nan_rows(close)
+    rsi_short = rsi(close, rsi_short_len) if rsi_short is None else rsi_short
+    rsi_streak = rsi(streaks(close), rsi_streak_len)
+    return (rsi_short + rsi_streak + rolling_percent_rank(kernels.rate_of_change(close), rank_len)) / 3.0
+
+
+def williams_r(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    highest_high = rolling(high, period, np.max)
+    lowest_low = rolling(low, period, np.min)
+    return kernels.williams_r_values(highest_high, lowest_low, close)
+
+
+def rvi(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    return rolling(kernels.rvi_values(open_, close, high - low), period, np.mean)
+
+
+def kama(values: np.ndarray, smoothing_constant: np.ndarray) -> np.ndarray:
+    """kernels.kama_values for every row: each row starts at its own first valid smoothing constant."""
+    kama_values = _nan_rows(values)
+    previous = np.full(values.shape[0], np.nan)
+    started = np.zeros(values.shape[0], dtype=bool)
+    for position in range(values.shape[1]):
+        value, sc = values[:, position], smoothing_constant[:, position]
+        starts_here = ~started & ~np.isnan(sc)
+        update = started & ~np.isnan(previous) & ~np.isnan(sc) & ~np.isnan(value)
+        previous = np.where(update, previous + sc * (value - previous), previous)
+        previous = np.where(starts_here, value, previous)
+        started |= starts_here
+        kama_values[:, position] = np.where(started, previous, np.nan)
+    return kama_values
+
+
+def adaptive_rsi(close: np.ndarray, period: int, kama_n: int, kama_fast_ema: int, kama_slow_ema: int, rsi_fallback: np.ndarray = None) -> np.ndarray:
+    """adaptive_rsi.calculate: RSI of the KAMA of close, falling back to RSI(close) like the single-frame module."""
+    valid_closes = (~np.isnan(close)).sum(axis=1)
+    result = _nan_rows(close)
+    enough_data = valid_closes >= (kama_n + 1) + (period + 1)
+    if not enough_data.any():
+        return result
+
+    change = np.abs(close - kernels.shift_bars(close, kama_n))
+    volatility = rolling(np.abs(kernels.first_diff(close)), kama_n, np.sum)
+    smoothing_constant = kernels.kama_smoothing_constant(change, volatility, kama_fast_ema, kama_slow_ema)
+    kama_values = kama(close, smoothing_constant)
+
+    adaptive = rsi(kama_values, period)
+    rsi_fallback = rsi(close, period) if rsi_fallback is None else rsi_fallback
+    # KAMA or its RSI all NaN for a frame: the module falls back to the plain RSI of close
+    use_fallback = np.isnan(kama_values).all(axis=1) | np.isnan(adaptive).all(axis=1)
+    adaptive = np.where(use_fallback[:, None], rsi_fallback, adaptive)
+    result[enough_data] = adaptive[enough_data]
+    return result
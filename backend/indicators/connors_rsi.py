@@ -1,13 +1,19 @@
 # backend/indicators/connors_rsi.py
+# Twins: batch.crsi (as-of engine) and streaming.ConnorsRSIState (live updates) compute this indicator too;
+# formulas are shared via kernels.py, but guard/NaN/recursion changes must be made in all three.
+# Parity: tests/modular/test_asof_indicators.py and tests/modular/test_live_indicators.py.
 import pandas as pd
 import numpy as np
 import logging
 from .rsi import calculate as calculate_rsi # Import from sibling rsi module
+from . import kernels
 
 logger = logging.getLogger(__name__)
 
-def calculate(ohlc_df: pd.DataFrame, rsi_short_len: int = 3, rsi_streak_len: int = 2, rank_len: int = 100) -> pd.Series:
-    """Calculates ConnorsRSI manually."""
+def calculate(ohlc_df: pd.DataFrame, rsi_short_len: int = 3, rsi_streak_len: int = 2, rank_len: int = 100, context=None) -> pd.Series:
+    """Calculates ConnorsRSI manually. An IndicatorContext supplies the shared RSI(rsi_short_len) and close-diff streaks."""
+    if context is not None:
+        context.check_frame(ohlc_df)
     if 'close' not in ohlc_df.columns or ohlc_df['close'].isnull().all():
         logger.warning(f"CRSI Calc: 'close' column missing or all NaN. Len: {len(ohlc_df)}")
         return pd.Series(dtype=float, index=ohlc_df.index)
@@ -19,40 +25,24 @@ def calculate(ohlc_df: pd.DataFrame, rsi_short_len: int = 3, rsi_streak_len: int
     close = ohlc_df['close']
 
     # 1. RSI(Close, rsi_short_len)
-    rsi1 = calculate_rsi(ohlc_df, period=rsi_short_len)
+    rsi1 = calculate_rsi(ohlc_df, period=rsi_short_len, context=context)
 
     # 2. RSI(Streak, rsi_streak_len)
-    close_diff = close.diff() # close_diff[0] is NaN
-    streaks = pd.Series(0.0, index=ohlc_df.index) # Initialize with 0.0 for float type
-
-    for i in range(1, len(close)): # Iterate based on original close length
-        current_idx = ohlc_df.index[i]
-        prev_idx = ohlc_df.index[i-1]
-        
-        if pd.isna(close_diff.loc[current_idx]): # Should only be the first diff
-            streaks.loc[current_idx] = 0.0
-            continue
-
-        if close_diff.loc[current_idx] > 0: # Price increased
-            streaks.loc[current_idx] = streaks.loc[prev_idx] + 1 if streaks.loc[prev_idx] > 0 else 1.0
-        elif close_diff.loc[current_idx] < 0: # Price decreased
-            streaks.loc[current_idx] = streaks.loc[prev_idx] - 1 if streaks.loc[prev_idx] < 0 else -1.0
-        else: # Price unchanged
-            streaks.loc[current_idx] = 0.0
+    # Up/down streak lengths, from the shared array kernel (first bar and NaN diffs count as 0)
+    if context is not None:
+        streaks = context.streaks('close')
+    else:
+        streaks = pd.Series(kernels.streak_values(close.to_numpy(dtype=np.float64)), index=ohlc_df.index)
     
     streak_df = pd.DataFrame({'close': streaks.fillna(0)}, index=ohlc_df.index) 
     rsi_streak = calculate_rsi(streak_df, period=rsi_streak_len)
 
     # 3. PercentRank(ROC(Close,1), rank_len)
-    roc1 = close.pct_change(periods=1) * 100 
-    roc1 = roc1.fillna(0) # Fill first NaN for rolling rank
+    roc1 = kernels.rate_of_change(close.to_numpy(dtype=np.float64)) # pct_change * 100, first NaN filled as 0 for the rolling rank
     
-    # Calculate percentile rank
-    # x.rank(pct=True).iloc[-1] gets the rank of the last element in the window
-    percent_rank_roc = roc1.rolling(window=rank_len, min_periods=rank_len).apply(
-        lambda x_window: pd.Series(x_window).rank(pct=True, method='average').iloc[-1] * 100 if pd.Series(x_window).notna().any() else np.nan,
-        raw=False 
-    )
+    # Percentile rank of each bar's ROC within the trailing rank_len bars (ties averaged), from a
+    # sorted sliding window instead of re-ranking every window with rolling().apply()
+    percent_rank_roc = pd.Series(kernels.rolling_percent_rank(roc1, rank_len), index=ohlc_df.index)
     
     crsi_series = (rsi1 + rsi_streak + percent_rank_roc) / 3.0
     return crsi_series
\ No newline at end of file
@@ -0,0 +1,85 @@
+# backend/indicators/context.py
+import logging
+import numpy as np
+import pandas as pd
+
+from . import rsi, kernels
+
+logger = logging.getLogger(__name__)
+
+_ROLLING_OPERATIONS = ('min', 'max', 'sum', 'mean')
+
+
+class IndicatorContext:
+    """
+    Per-frame memo of the intermediate series several indicators need. Each is computed the first
+    time an indicator asks for it and shared after that:
+    - the close diff feeds RSI's gains/losses (every RSI period), the ConnorsRSI streak and KAMA;
+    - RSI(p) is shared between RSI, StochRSI, ConnorsRSI and the AdaptiveRSI fallback;
+    - typical price and its diff feed MFI, the bar range (high - low) feeds RVI;
+    - rolling min/max/sum/mean of any named series (StochRSI, Williams %R).
+    Series are keyed by name: a column ('close', 'high', ...), 'typical_price', 'bar_range', or ('rsi', period).
+    The frame must already be numeric (calculate_indicators_from_ohlc_df coerces it first), and
+    returned series are shared, so callers must not modify them in place.
+    """
+    def __init__(self, ohlc_df: pd.DataFrame, label: str = ""):
+        self.ohlc_df = ohlc_df
+        self.label = label
+        self._memo = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key, compute):
+        if key in self._memo:
+            self.hits += 1
+            return self._memo[key]
+        self.misses += 1
+        value = self._memo[key] = compute()
+        return value
+
+    def check_frame(self, ohlc_df: pd.DataFrame):
+        """Indicators take both the frame and its context; they must be the same frame."""
+        if ohlc_df is not self.ohlc_df:
+            raise ValueError(f"IndicatorContext ({self.label}) was built for a different frame than the one passed in.")
+
+    def series(self, key) -> pd.Series:
+        """A named series: an OHLCV column, 'typical_price', 'bar_range', or ('rsi', period)."""
+        if key == 'typical_price':
+            return self.typical_price()
+        if key == 'bar_range':
+            return self.bar_range()
+        if isinstance(key, tuple) and key[0] == 'rsi':
+            return self.rsi(key[1])
+        return self.ohlc_df[key]
+
+    def rsi(self, period: int) -> pd.Series:
+        return self._cached(('rsi', period), lambda: rsi.calculate_from_gains_losses(
+            self.ohlc_df, period=period, gains_losses=lambda: self.gains_losses('close')))
+
+    def gains_losses(self, key='close'):
+        """kernels.gains_losses() arrays of a named series' first diff, shared by every RSI period."""
+        return self._cached(('gains_losses', key), lambda: kernels.gains_losses(self.diff(key).to_numpy(dtype=np.float64)))
+
+    def streaks(self, key='close') -> pd.Series:
+        """ConnorsRSI up/down streaks of a named series, from its shared first diff."""
+        return self._cached(('streak', key), lambda: pd.Series(
+            kernels.streak_values_from_diff(self.diff(key).to_numpy(dtype=np.float64)), index=self.ohlc_df.index))
+
+    def bar_range(self) -> pd.Series:
+        return self._cached('bar_range', lambda: self.ohlc_df['high'] - self.ohlc_df['low'])
+
+    def typical_price(self) -> pd.Series:
+        return self._cached('typical_price', lambda: (self.ohlc_df['high'] + self.ohlc_df['low'] + self.ohlc_df['close']) / 3.0)
+
+    def diff(self, key='close', periods: int = 1) -> pd.Series:
+        return self._cached(('diff', key, periods), lambda: self.series(key).diff(periods))
+
+    def rolling(self, key, window: int, operation: str) -> pd.Series:
+        """Full-window rolling min/max/sum/mean (min_periods=window) of a named series."""
+        if operation not in _ROLLING_OPERATIONS:
+            raise ValueError(f"Unsupported rolling operation '{operation}'")
+        return self._cached(('rolling', key, window, operation),
+                            lambda: getattr(self.series(key).rolling(window=window, min_periods=window), operation)())
+
+    def log_stats(self):
+        logger.debug(f"IndicatorContext ({self.label}): {self.misses} intermediate series computed, {self.hits} reused.")
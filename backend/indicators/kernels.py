@@ -0,0 +1,219 @@
+# backend/indicators/kernels.py
+# Array kernels shared by the indicator modules. They take and return plain float64 NumPy arrays
+# (no index), so the recursions run over Python floats instead of per-bar .iloc/.loc access.
+# The element-wise formula kernels (first_diff ... rate_of_change) work along the last axis of arrays
+# of any shape (scalars included), so the single-frame modules, the batched as-of engine (batch.py) and
+# the streaming states (streaming.py) share one definition.
+from bisect import bisect_left, bisect_right, insort
+import numpy as np
+
+
+def wilder_average(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing of values[1:], as used by RSI (values[0] is the undefined first diff).
+    The first average, at position `period`, is the NaN-skipping mean of values[1:period+1]; each later
+    one is (prev * (period - 1) + value) / period. Once an average is NaN (a NaN input, or no valid
+    seed) every later position stays NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    averages = np.full(len(values), np.nan)
+    if len(values) <= period:
+        return averages
+    seed_window = values[1:period + 1]
+    seed_valid = seed_window[~np.isnan(seed_window)]
+    if len(seed_valid) == 0:
+        return averages
+    previous = seed_valid.mean()
+    averages[period] = previous
+    position = period + 1
+    for value in values[period + 1:].tolist():
+        previous = (previous * (period - 1) + value) / period
+        if previous != previous: # NaN propagates to the end
+            break
+        averages[position] = previous
+        position += 1
+    return averages
+
+
+def shift_bars(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """values shifted right by `periods` along the last axis (Series.shift), NaN-filled."""
+    values = np.asarray(values, dtype=np.float64)
+    shifted = np.full(values.shape, np.nan)
+    if periods < values.shape[-1]:
+        shifted[..., periods:] = values[..., :values.shape[-1] - periods]
+    return shifted
+
+
+def first_diff(values: np.ndarray) -> np.ndarray:
+    """values[i] - values[i-1] along the last axis, with NaN at position 0 (pandas Series.diff())."""
+    values = np.asarray(values, dtype=np.float64)
+    delta = np.empty_like(values)
+    delta[..., :1] = np.nan
+    delta[..., 1:] = values[..., 1:] - values[..., :-1]
+    return delta
+
+
+def gains_losses(delta: np.ndarray):
+    """RSI's (gain, loss) arrays from a first diff: the positive / negated negative parts, NaN diffs stay NaN."""
+    delta = np.asarray(delta, dtype=np.float64)
+    gain = np.where(delta < 0, 0.0, delta)
+    loss = np.abs(np.where(delta > 0, 0.0, delta))
+    return gain, loss
+
+
+def rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    """100 - 100 / (1 + avg_gain / avg_loss); NaN where the average loss is 0."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / np.where(avg_loss == 0, np.nan, avg_loss)
+        return 100.0 - (100.0 / (1.0 + rs))
+
+
+def rsi_from_gains_losses(gain: np.ndarray, loss: np.ndarray, period: int) -> np.ndarray:
+    """RSI from precomputed gains_losses(): Wilder-smooths both and takes 100 - 100 / (1 + RS)."""
+    return rsi_from_averages(wilder_average(gain, period), wilder_average(loss, period))
+
+
+def stochastic_k(values: np.ndarray, lowest: np.ndarray, highest: np.ndarray) -> np.ndarray:
+    """StochRSI's raw %K: (value - lowest) / (highest - lowest) * 100, NaN where the range is 0."""
+    spread = highest - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (values - lowest) / np.where(spread == 0, np.nan, spread) * 100
+
+
+def money_flow_index(sum_positive: np.ndarray, sum_negative: np.ndarray) -> np.ndarray:
+    """
+    MFI from the rolling positive/negative money-flow sums: 100 - 100 / (1 + pos / neg), 100 when only
+    inflows, 50 when there was no flow at all, clipped to 0..100.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mfi_values = 100.0 - (100.0 / (1.0 + sum_positive / np.where(sum_negative == 0, np.nan, sum_negative)))
+    unset = np.isnan(mfi_values)
+    mfi_values = np.where(unset & (sum_positive > 0) & (sum_negative == 0), 100.0, mfi_values) # Only inflows
+    mfi_values = np.where(unset & (sum_positive == 0) & (sum_negative == 0), 50.0, mfi_values) # No flow at all
+    return np.clip(mfi_values, 0, 100)
+
+
+def williams_r_values(highest_high: np.ndarray, lowest_low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """(highest high - close) / (highest high - lowest low) * -100, NaN where the range is 0."""
+    spread = highest_high - lowest_low
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (highest_high - close) / np.where(spread == 0, np.nan, spread) * -100.0
+
+
+def rvi_values(open_: np.ndarray, close: np.ndarray, bar_range: np.ndarray) -> np.ndarray:
+    """Per-bar vigor (close - open) / (high - low), NaN where the bar range is 0 (RVI averages these)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (close - open_) / np.where(bar_range == 0, np.nan, bar_range)
+
+
+def kama_smoothing_constant(change: np.ndarray, volatility: np.ndarray, fast_ema_period: int, slow_ema_period: int) -> np.ndarray:
+    """KAMA's smoothing constant from |diff(n)| and the rolling sum of |diff|: efficiency ratio (0 where undefined) scaled between the fast and slow EMA constants, squared."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        efficiency_ratio = change / np.where(volatility == 0, np.nan, volatility)
+    efficiency_ratio = np.where(np.isnan(efficiency_ratio), 0.0, efficiency_ratio)
+    sc_fast = 2.0 / (fast_ema_period + 1.0)
+    sc_slow = 2.0 / (slow_ema_period + 1.0)
+    return (efficiency_ratio * (sc_fast - sc_slow) + sc_slow) ** 2
+
+
+def percent_change(previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """(current / previous - 1) * 100 with NaN filled as 0 (0/0 too); x/0 stays +-inf."""
+    previous = np.asarray(previous, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roc = (current / previous - 1) * 100
+    return np.where(np.isnan(roc), 0.0, roc)
+
+
+def rate_of_change(close: np.ndarray) -> np.ndarray:
+    """ConnorsRSI's one-bar ROC in percent (pct_change * 100), with NaN filled as 0; x/0 stays +-inf."""
+    return percent_change(shift_bars(close), close)
+
+
+def rsi_values(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    RSI with Wilder's smoothing over a close-price array. Positions before `period` are NaN, and so
+    are positions where the average loss is 0 (RS is undefined there) or the smoothing hit a NaN.
+    """
+    return rsi_from_gains_losses(*gains_losses(first_diff(close)), period)
+
+
+def rolling_percent_rank(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Percent rank (0-100) of each value within the trailing `window` values, ties ranked by their
+    average position (pandas rank(pct=True, method='average')). Keeps the window as a sorted list:
+    each step is one bisect insert, one bisect delete and two bisect counts, instead of re-ranking the
+    whole window. Positions before the first full window, and windows containing NaN or +-inf, are NaN
+    (like rolling(window, min_periods=window), which treats infinities as missing).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = np.where(np.isinf(values), np.nan, values)
+    ranks = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return ranks
+    sorted_window = []
+    nan_count = 0
+    value_list = values.tolist()
+    for position, value in enumerate(value_list):
+        if value != value:
+            nan_count += 1
+        else:
+            insort(sorted_window, value)
+        if position >= window:
+            leaving = value_list[position - window]
+            if leaving != leaving:
+                nan_count -= 1
+            else:
+                del sorted_window[bisect_left(sorted_window, leaving)]
+        if position >= window - 1 and nan_count == 0:
+            below = bisect_left(sorted_window, value)
+            ties = bisect_right(sorted_window, value) - below
+            ranks[position] = (below + (ties + 1) / 2.0) / window * 100
+    return ranks
+
+
+def streak_values(close: np.ndarray) -> np.ndarray:
+    """
+    ConnorsRSI up/down streaks: +1, +2, ... while the close keeps rising, -1, -2, ... while it keeps
+    falling, 0 when it is unchanged. The first bar, and any bar whose diff is NaN, is 0.
+    """
+    return streak_values_from_diff(first_diff(close))
+
+
+def streak_values_from_diff(delta: np.ndarray) -> np.ndarray:
+    """streak_values from a precomputed first diff (e.g. the one an IndicatorContext shares)."""
+    delta = np.asarray(delta, dtype=np.float64)
+    streaks = np.zeros(len(delta))
+    streak = 0.0
+    for position, diff in enumerate(delta.tolist()[1:], start=1):
+        if diff > 0:
+            streak = streak + 1 if streak > 0 else 1.0
+        elif diff < 0:
+            streak = streak - 1 if streak < 0 else -1.0
+        else: # Unchanged, or NaN diff
+            streak = 0.0
+        streaks[position] = streak
+    return streaks
+
+
+def kama_values(values: np.ndarray, smoothing_constant: np.ndarray) -> np.ndarray:
+    """
+    Kaufman adaptive moving average recurrence: starts at the first position with a valid smoothing
+    constant (KAMA = value there), then KAMA += sc * (value - KAMA). Where the previous KAMA, the
+    smoothing constant or the value is NaN, the previous KAMA is carried forward unchanged.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    smoothing_constant = np.asarray(smoothing_constant, dtype=np.float64)
+    kama = np.full(len(values), np.nan)
+    valid_sc_positions = np.flatnonzero(~np.isnan(smoothing_constant))
+    if len(valid_sc_positions) == 0:
+        return kama
+    start = int(valid_sc_positions[0])
+    previous = values[start]
+    kama[start] = previous
+    position = start + 1
+    for value, sc in zip(values[start + 1:].tolist(), smoothing_constant[start + 1:].tolist()):
+        if previous == previous and sc == sc and value == value:
+            previous = previous + sc * (value - previous)
+        kama[position] = previous
+        position += 1
+    return kama
@@ -1,12 +1,18 @@
 # backend/indicators/rvi.py
+# Twins: batch.rvi (as-of engine) and streaming.RVIState (live updates) compute this indicator too;
+# formulas are shared via kernels.py, but guard/NaN/recursion changes must be made in all three.
+# Parity: tests/modular/test_asof_indicators.py and tests/modular/test_live_indicators.py.
 import pandas as pd
 import numpy as np
 import logging
+from . import kernels
 
 logger = logging.getLogger(__name__)
 
-def calculate(ohlc_df: pd.DataFrame, period: int = 10) -> pd.Series:
-    """Calculates Relative Vigor Index (RVI) main line manually."""
+def calculate(ohlc_df: pd.DataFrame, period: int = 10, context=None) -> pd.Series:
+    """Calculates Relative Vigor Index (RVI) main line manually. An IndicatorContext supplies the (shared) bar range."""
+    if context is not None:
+        context.check_frame(ohlc_df)
     required_cols = {'open', 'high', 'low', 'close'}
     if not required_cols.issubset(ohlc_df.columns) or ohlc_df.isnull().all().all():
         logger.warning(f"RVI Calc: Missing required columns or all NaN data. Len: {len(ohlc_df)}")
@@ -15,10 +21,10 @@ def calculate(ohlc_df: pd.DataFrame, period: int = 10) -> pd.Series:
          logger.warning(f"RVI Calc: Not enough data ({len(ohlc_df)}) for period {period}.")
          return pd.Series(dtype=float, index=ohlc_df.index)
 
-    numerator = ohlc_df['close'] - ohlc_df['open']
-    denominator = (ohlc_df['high'] - ohlc_df['low']).replace(0, np.nan) # Avoid division by zero
-    
-    rvi_val = numerator / denominator # Individual RVI values for each bar
+    bar_range = context.bar_range() if context is not None else ohlc_df['high'] - ohlc_df['low']
+    # Individual RVI values for each bar: (close - open) / (high - low), NaN on a zero range
+    rvi_val = pd.Series(kernels.rvi_values(ohlc_df['open'].to_numpy(dtype=np.float64), ohlc_df['close'].to_numpy(dtype=np.float64),
+                                           bar_range.to_numpy(dtype=np.float64)), index=ohlc_df.index)
     
     # Standard RVI is often a symmetric Wilder's MA of these values, or SMA.
     # Let's use SMA for simplicity as specified in some common definitions for the main line.
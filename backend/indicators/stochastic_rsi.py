@@ -1,18 +1,24 @@
 # backend/indicators/stochastic_rsi.py
+# Twins: batch.stoch_rsi (as-of engine) and streaming.StochRSIState (live updates) compute this indicator too;
+# formulas are shared via kernels.py, but guard/NaN/recursion changes must be made in all three.
+# Parity: tests/modular/test_asof_indicators.py and tests/modular/test_live_indicators.py.
 import pandas as pd
 import numpy as np
 import logging
 from .rsi import calculate as calculate_rsi # Import from sibling rsi module
+from . import kernels
 
 logger = logging.getLogger(__name__)
 
-def calculate(ohlc_df: pd.DataFrame, rsi_period: int = 14, stoch_period: int = 14, k_smooth: int = 3) -> pd.Series:
+def calculate(ohlc_df: pd.DataFrame, rsi_period: int = 14, stoch_period: int = 14, k_smooth: int = 3, context=None) -> pd.Series:
     """Calculates Stochastic RSI (%K line) manually."""
+    if context is not None:
+        context.check_frame(ohlc_df)
     if 'close' not in ohlc_df.columns:
         logger.warning("StochRSI Calc: 'close' column missing.")
         return pd.Series(dtype=float, index=ohlc_df.index)
 
-    rsi_series = calculate_rsi(ohlc_df, period=rsi_period)
+    rsi_series = calculate_rsi(ohlc_df, period=rsi_period, context=context) # Shared with the RSI indicator when a context is given
     if rsi_series.isnull().all():
         logger.warning("StochRSI Calc: Underlying RSI calculation resulted in all NaNs.")
         return pd.Series(dtype=float, index=ohlc_df.index)
@@ -21,11 +27,16 @@ def calculate(ohlc_df: pd.DataFrame, rsi_period: int = 14, stoch_period: int = 1
         logger.warning(f"StochRSI Calc: Not enough valid RSI data points ({len(rsi_series.dropna())}) for stoch_period {stoch_period}.")
         return pd.Series(dtype=float, index=ohlc_df.index)
 
-    min_rsi = rsi_series.rolling(window=stoch_period, min_periods=stoch_period).min()
-    max_rsi = rsi_series.rolling(window=stoch_period, min_periods=stoch_period).max()
+    if context is not None:
+        min_rsi = context.rolling(('rsi', rsi_period), stoch_period, 'min')
+        max_rsi = context.rolling(('rsi', rsi_period), stoch_period, 'max')
+    else:
+        min_rsi = rsi_series.rolling(window=stoch_period, min_periods=stoch_period).min()
+        max_rsi = rsi_series.rolling(window=stoch_period, min_periods=stoch_period).max()
     
     # (Current RSI - Min RSI over stoch_period) / (Max RSI over stoch_period - Min RSI over stoch_period)
-    stoch_rsi_k_raw = ((rsi_series - min_rsi) / (max_rsi - min_rsi).replace(0, np.nan)) * 100
+    stoch_rsi_k_raw = pd.Series(kernels.stochastic_k(rsi_series.to_numpy(dtype=np.float64), min_rsi.to_numpy(dtype=np.float64),
+                                                     max_rsi.to_numpy(dtype=np.float64)), index=rsi_series.index)
     
     # Smooth %K
     stoch_rsi_k_smoothed = stoch_rsi_k_raw.rolling(window=k_smooth, min_periods=max(1, k_smooth)).mean() # min_periods=1 if k_smooth < stoch_period
@@ -0,0 +1,479 @@
+# backend/indicators/streaming.py
+# Streaming indicator states: each one is advanced one bar at a time in O(1) (Wilder averages, running
+# sums, monotonic deques, a sorted rank window), and can also report the value a hypothetical next bar
+# would give without committing it. That is what a live "today" update needs: the complete bars are
+# committed once, and the current (partial) weekly/monthly bar is only ever peeked, so a revised daily
+# candle costs one peek per indicator. The per-bar formulas are the element-wise kernels in kernels.py
+# (shared with the single-frame modules and batch.py), applied to one bar's scalars; the recursions,
+# rolling windows and guards are re-expressed incrementally here and follow the single-frame modules
+# named on each state, so update/peek values equal what calculate_indicators_from_ohlc_df returns for
+# the same frame (tests/modular/test_live_indicators.py checks that parity).
+# Bars are (open, high, low, close, volume) tuples of floats.
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+
+from backend.indicators import kernels
+
+NAN = float('nan')
+
+
+def _is_nan(value) -> bool:
+    return value != value
+
+
+def _advance(stream, commit: bool):
+    return stream.update if commit else stream.peek
+
+
+def _formula(kernel, *values) -> float:
+    """One bar of an element-wise kernels.py formula, as a plain float (so snapshots stay JSON-friendly)."""
+    return float(kernel(*values))
+
+
+class _Stream:
+    """Base for the states: JSON-friendly snapshots of their fields (deques as lists, nested states as dicts)."""
+    def to_dict(self) -> dict:
+        state = {}
+        for name, value in self.__dict__.items():
+            if isinstance(value, _Stream):
+                state[name] = {'stream': value.to_dict()}
+            elif isinstance(value, deque):
+                state[name] = {'deque': [list(item) if isinstance(item, tuple) else item for item in value]}
+            else:
+                state[name] = value
+        return state
+
+    def load_dict(self, state: dict):
+        """Restores a to_dict() snapshot into a state built with the same parameters."""
+        for name, value in state.items():
+            current = getattr(self, name)
+            if isinstance(current, _Stream):
+                current.load_dict(value['stream'])
+            elif isinstance(current, deque):
+                setattr(self, name, deque(tuple(item) if isinstance(item, list) else item for item in value['deque']))
+            else:
+                setattr(self, name, value)
+        return self
+
+
+# --- Series-level streams: scalar in, scalar out ---
+
+class WilderAverageStream(_Stream):
+    """kernels.wilder_average: NaN-skipping mean of positions 1..period as the seed, then (prev * (period - 1) + value) / period."""
+    def __init__(self, period: int):
+        self.period = period
+        self.position = 0
+        self.seed_sum = 0.0
+        self.seed_count = 0
+        self.average = NAN
+
+    def _next(self, value):
+        seed_sum, seed_count, average = self.seed_sum, self.seed_count, self.average
+        if 1 <= self.position <= self.period and not _is_nan(value):
+            seed_sum += value
+            seed_count += 1
+        if self.position == self.period:
+            average = seed_sum / seed_count if seed_count else NAN
+        elif self.position > self.period:
+            average = (average * (self.period - 1) + value) / self.period # NaN stays NaN
+        return seed_sum, seed_count, average
+
+    def update(self, value: float) -> float:
+        self.seed_sum, self.seed_count, self.average = self._next(value)
+        self.position += 1
+        return self.average
+
+    def peek(self, value: float) -> float:
+        return self._next(value)[2]
+
+
+class RSIStream(_Stream):
+    """rsi.calculate (Wilder's smoothing) over any input series (close, streaks, KAMA)."""
+    def __init__(self, period: int):
+        self.previous = NAN
+        self.avg_gain = WilderAverageStream(period)
+        self.avg_loss = WilderAverageStream(period)
+
+    def _gain_loss(self, value):
+        gain, loss = kernels.gains_losses(value - self.previous) # NaN for the first value
+        return float(gain), float(loss)
+
+    @staticmethod
+    def _rsi(avg_gain, avg_loss):
+        return _formula(kernels.rsi_from_averages, avg_gain, avg_loss)
+
+    def update(self, value: float) -> float:
+        gain, loss = self._gain_loss(value)
+        self.previous = value
+        return self._rsi(self.avg_gain.update(gain), self.avg_loss.update(loss))
+
+    def peek(self, value: float) -> float:
+        gain, loss = self._gain_loss(value)
+        return self._rsi(self.avg_gain.peek(gain), self.avg_loss.peek(loss))
+
+
+class RollingExtremeStream(_Stream):
+    """rolling(window, min_periods=window).min()/.max() with a monotonic deque; windows holding a NaN are NaN."""
+    def __init__(self, window: int, kind: str):
+        self.window = window
+        self.is_max = kind == 'max'
+        self.position = 0
+        self.last_nan_position = -window # Most recent NaN input
+        self.candidates = deque() # (position, value); values monotonic, the front is the extreme
+
+    def _dominates(self, value, other) -> bool:
+        return value >= other if self.is_max else value <= other
+
+    def _value(self, value):
+        position = self.position
+        if position < self.window - 1 or _is_nan(value) or self.last_nan_position > position - self.window:
+            return NAN
+        for candidate_position, candidate in self.candidates: # At most one expired entry precedes the extreme
+            if candidate_position > position - self.window:
+                return candidate if not self._dominates(value, candidate) else value
+        return value
+
+    def update(self, value: float) -> float:
+        result = self._value(value)
+        if _is_nan(value):
+            self.last_nan_position = self.position
+            self.candidates.clear()
+        else:
+            while self.candidates and self._dominates(value, self.candidates[-1][1]):
+                self.candidates.pop()
+            self.candidates.append((self.position, value))
+        while self.candidates and self.candidates[0][0] <= self.position - self.window:
+            self.candidates.popleft()
+        self.position += 1
+        return result
+
+    def peek(self, value: float) -> float:
+        return self._value(value)
+
+
+class RollingSumStream(_Stream):
+    """rolling(window, min_periods=window).sum() as a running sum; windows holding a NaN are NaN, all-zero windows exactly 0."""
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0 # Sum of the non-NaN values in the window
+        self.nan_count = 0
+        self.nonzero_count = 0
+
+    def _value(self, value):
+        if len(self.values) + 1 < self.window:
+            return NAN
+        leaving = self.values[0] if len(self.values) == self.window else 0.0
+        if _is_nan(value) or self.nan_count - _is_nan(leaving):
+            return NAN
+        leaving = 0.0 if _is_nan(leaving) else leaving # A NaN leaving the window was never in the total
+        if self.nonzero_count - (leaving != 0) + (value != 0) == 0:
+            return 0.0
+        return self.total - leaving + value
+
+    def update(self, value: float) -> float:
+        result = self._value(value)
+        if len(self.values) == self.window:
+            leaving = self.values.popleft()
+            if _is_nan(leaving):
+                self.nan_count -= 1
+            else:
+                self.total -= leaving
+                self.nonzero_count -= leaving != 0
+        self.values.append(value)
+        if _is_nan(value):
+            self.nan_count += 1
+        else:
+            self.total += value
+            self.nonzero_count += value != 0
+        return result
+
+    def peek(self, value: float) -> float:
+        return self._value(value)
+
+
+class RollingPercentRankStream(_Stream):
+    """kernels.rolling_percent_rank over a sorted window: bisect counts, one insert and one delete per bar."""
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque() # Last `window` inputs, +-inf stored as NaN
+        self.sorted_values = []
+        self.nan_count = 0
+
+    def _value(self, value):
+        if len(self.values) + 1 < self.window:
+            return NAN
+        leaving = self.values[0] if len(self.values) == self.window else None
+        leaving_is_nan = leaving is not None and _is_nan(leaving)
+        if _is_nan(value) or self.nan_count - leaving_is_nan:
+            return NAN
+        below = bisect_left(self.sorted_values, value)
+        ties = bisect_right(self.sorted_values, value) - below + 1 # + the value itself
+        if leaving is not None and not leaving_is_nan:
+            below -= leaving < value
+            ties -= leaving == value
+        return (below + (ties + 1) / 2.0) / self.window * 100
+
+    def update(self, value: float) -> float:
+        value = NAN if value in (float('inf'), float('-inf')) else value
+        result = self._value(value)
+        if len(self.values) == self.window:
+            leaving = self.values.popleft()
+            if _is_nan(leaving):
+                self.nan_count -= 1
+            else:
+                del self.sorted_values[bisect_left(self.sorted_values, leaving)]
+        self.values.append(value)
+        if _is_nan(value):
+            self.nan_count += 1
+        else:
+            insort(self.sorted_values, value)
+        return result
+
+    def peek(self, value: float) -> float:
+        return self._value(NAN if value in (float('inf'), float('-inf')) else value)
+
+
+class StreakStream(_Stream):
+    """kernels.streak_values: +n / -n for n rising / falling closes in a row, 0 when unchanged (or NaN)."""
+    def __init__(self):
+        self.previous = NAN
+        self.streak = 0.0
+
+    def _value(self, close):
+        diff = close - self.previous
+        if diff > 0:
+            return self.streak + 1 if self.streak > 0 else 1.0
+        if diff < 0:
+            return self.streak - 1 if self.streak < 0 else -1.0
+        return 0.0
+
+    def update(self, close: float) -> float:
+        self.streak = self._value(close)
+        self.previous = close
+        return self.streak
+
+    def peek(self, close: float) -> float:
+        return self._value(close)
+
+
+class KAMAStream(_Stream):
+    """adaptive_rsi.calculate_kama: efficiency ratio over kama_n bars, then the kernels.kama_values recurrence."""
+    def __init__(self, kama_n: int, fast_ema_period: int, slow_ema_period: int):
+        self.kama_n = kama_n
+        self.fast_ema_period = fast_ema_period
+        self.slow_ema_period = slow_ema_period
+        self.recent = deque() # Last kama_n inputs, for diff(kama_n)
+        self.previous = NAN
+        self.volatility = RollingSumStream(kama_n) # Of |diff|
+        self.kama = NAN
+        self.started = False
+
+    def _next(self, value, commit: bool):
+        past = self.recent[0] if len(self.recent) == self.kama_n else NAN
+        change = abs(value - past)
+        volatility = _advance(self.volatility, commit)(abs(value - self.previous))
+        smoothing_constant = _formula(kernels.kama_smoothing_constant, change, volatility, self.fast_ema_period, self.slow_ema_period)
+        if not self.started:
+            return (value, True) if not _is_nan(smoothing_constant) else (NAN, False)
+        if not _is_nan(self.kama) and not _is_nan(smoothing_constant) and not _is_nan(value):
+            return self.kama + smoothing_constant * (value - self.kama), True
+        return self.kama, True # Carry the previous KAMA over NaN inputs
+
+    def update(self, value: float) -> float:
+        self.kama, self.started = self._next(value, commit=True)
+        self.recent.append(value)
+        if len(self.recent) > self.kama_n:
+            self.recent.popleft()
+        self.previous = value
+        return self.kama
+
+    def peek(self, value: float) -> float:
+        return self._next(value, commit=False)[0]
+
+
+# --- Indicator states: bars in, the indicator's latest valid value out ---
+
+class _IndicatorState(_Stream):
+    """
+    update(bar) commits a complete bar; peek(bar) returns the indicator value for the committed bars plus
+    `bar` (like _get_last_value_from_series: the latest non-NaN value, NaN if the module's own guards
+    reject the frame); current() is the same for the committed bars alone.
+    """
+    def __init__(self):
+        self.bar_count = 0
+        self.last_valid = NAN
+
+    def _step(self, bar, commit: bool) -> float:
+        raise NotImplementedError
+
+    def _usable(self, bar_count: int, bar) -> bool:
+        return True
+
+    def update(self, bar):
+        value = self._step(bar, commit=True)
+        self.bar_count += 1
+        if not _is_nan(value):
+            self.last_valid = value
+
+    def peek(self, bar) -> float:
+        value = self._step(bar, commit=False)
+        if not self._usable(self.bar_count + 1, bar):
+            return NAN
+        return value if not _is_nan(value) else self.last_valid
+
+    def current(self) -> float:
+        return self.last_valid if self._usable(self.bar_count, None) else NAN
+
+
+class RSIState(_IndicatorState):
+    """rsi.calculate (batch twin: batch.rsi)."""
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.rsi = RSIStream(period)
+
+    def _step(self, bar, commit):
+        return _advance(self.rsi, commit)(bar[3])
+
+
+class StochRSIState(_IndicatorState):
+    """stochastic_rsi.calculate (batch twin: batch.stoch_rsi)."""
+    def __init__(self, rsi_period: int = 14, stoch_period: int = 14, k_smooth: int = 3):
+        super().__init__()
+        self.rsi = RSIStream(rsi_period)
+        self.min_rsi = RollingExtremeStream(stoch_period, 'min')
+        self.max_rsi = RollingExtremeStream(stoch_period, 'max')
+        self.k_window = max(1, k_smooth)
+        self.k_sum = RollingSumStream(self.k_window)
+
+    def _step(self, bar, commit):
+        rsi_value = _advance(self.rsi, commit)(bar[3])
+        min_rsi = _advance(self.min_rsi, commit)(rsi_value)
+        max_rsi = _advance(self.max_rsi, commit)(rsi_value)
+        k_raw = _formula(kernels.stochastic_k, rsi_value, min_rsi, max_rsi)
+        return _advance(self.k_sum, commit)(k_raw) / self.k_window
+
+
+class MFIState(_IndicatorState):
+    """mfi.calculate (batch twin: batch.mfi)."""
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self.previous_typical_price = NAN
+        self.positive_flow = RollingSumStream(period)
+        self.negative_flow = RollingSumStream(period)
+        self.columns_seen = [False, False, False, False] # high, low, close, volume have a valid value
+
+    def _step(self, bar, commit):
+        _, high, low, close, volume = bar
+        typical_price = (high + low + close) / 3.0
+        raw_money_flow = typical_price * volume
+        direction = typical_price - self.previous_typical_price
+        sum_positive = _advance(self.positive_flow, commit)(raw_money_flow if direction > 0 else 0.0)
+        sum_negative = _advance(self.negative_flow, commit)(raw_money_flow if direction < 0 else 0.0)
+        if commit:
+            self.previous_typical_price = typical_price
+            self.columns_seen = [seen or not _is_nan(value) for seen, value in zip(self.columns_seen, bar[1:])]
+        return _formula(kernels.money_flow_index, sum_positive, sum_negative)
+
+    def _usable(self, bar_count, bar):
+        columns_seen = self.columns_seen if bar is None else [seen or not _is_nan(value) for seen, value in zip(self.columns_seen, bar[1:])]
+        return bar_count >= self.period + 1 and all(columns_seen)
+
+
+class ConnorsRSIState(_IndicatorState):
+    """connors_rsi.calculate (batch twin: batch.crsi)."""
+    def __init__(self, rsi_short_len: int = 3, rsi_streak_len: int = 2, rank_len: int = 100):
+        super().__init__()
+        self.min_bars = rank_len + rsi_short_len + rsi_streak_len + 5
+        self.rsi_short = RSIStream(rsi_short_len)
+        self.streak = StreakStream()
+        self.rsi_streak = RSIStream(rsi_streak_len)
+        self.previous_close = NAN
+        self.percent_rank = RollingPercentRankStream(rank_len)
+        self.close_seen = False
+
+    def _step(self, bar, commit):
+        close = bar[3]
+        rsi_short = _advance(self.rsi_short, commit)(close)
+        rsi_streak = _advance(self.rsi_streak, commit)(_advance(self.streak, commit)(close))
+        roc = _formula(kernels.percent_change, self.previous_close, close) # x/0 is inf (ranked as NaN)
+        percent_rank = _advance(self.percent_rank, commit)(roc)
+        if commit:
+            self.previous_close = close
+            self.close_seen = self.close_seen or not _is_nan(close)
+        return (rsi_short + rsi_streak + percent_rank) / 3.0
+
+    def _usable(self, bar_count, bar):
+        return bar_count >= self.min_bars and (self.close_seen or (bar is not None and not _is_nan(bar[3])))
+
+
+class WilliamsRState(_IndicatorState):
+    """williams_r.calculate (batch twin: batch.williams_r)."""
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.highest_high = RollingExtremeStream(period, 'max')
+        self.lowest_low = RollingExtremeStream(period, 'min')
+
+    def _step(self, bar, commit):
+        highest_high = _advance(self.highest_high, commit)(bar[1])
+        lowest_low = _advance(self.lowest_low, commit)(bar[2])
+        return _formula(kernels.williams_r_values, highest_high, lowest_low, bar[3])
+
+
+class RVIState(_IndicatorState):
+    """rvi.calculate (batch twin: batch.rvi)."""
+    def __init__(self, period: int = 10):
+        super().__init__()
+        self.period = period
+        self.rvi_sum = RollingSumStream(period)
+
+    def _step(self, bar, commit):
+        open_, high, low, close, _ = bar
+        rvi_value = _formula(kernels.rvi_values, open_, close, high - low)
+        return _advance(self.rvi_sum, commit)(rvi_value) / self.period
+
+
+class AdaptiveRSIState(_IndicatorState):
+    """adaptive_rsi.calculate (batch twin: batch.adaptive_rsi): RSI of KAMA(close), falling back to RSI(close) when either is all NaN for the frame."""
+    def __init__(self, period: int = 14, kama_n: int = 10, kama_fast_ema: int = 2, kama_slow_ema: int = 30):
+        super().__init__()
+        self.min_valid_closes = (kama_n + 1) + (period + 1)
+        self.kama = KAMAStream(kama_n, kama_fast_ema, kama_slow_ema)
+        self.kama_rsi = RSIStream(period)
+        self.close_rsi = RSIStream(period)
+        self.valid_closes = 0
+        self.kama_seen = False
+        self.kama_rsi_seen = False
+        self.kama_rsi_last_valid = NAN
+        self.close_rsi_last_valid = NAN
+
+    def _result(self, valid_closes, kama_seen, kama_rsi_seen, kama_rsi_latest, close_rsi_latest):
+        if valid_closes < self.min_valid_closes:
+            return NAN
+        return kama_rsi_latest if kama_seen and kama_rsi_seen else close_rsi_latest
+
+    def update(self, bar):
+        close = bar[3]
+        kama = self.kama.update(close)
+        kama_rsi = self.kama_rsi.update(kama)
+        close_rsi = self.close_rsi.update(close)
+        self.bar_count += 1
+        self.valid_closes += not _is_nan(close)
+        self.kama_seen = self.kama_seen or not _is_nan(kama)
+        self.kama_rsi_seen = self.kama_rsi_seen or not _is_nan(kama_rsi)
+        self.kama_rsi_last_valid = kama_rsi if not _is_nan(kama_rsi) else self.kama_rsi_last_valid
+        self.close_rsi_last_valid = close_rsi if not _is_nan(close_rsi) else self.close_rsi_last_valid
+
+    def peek(self, bar) -> float:
+        close = bar[3]
+        kama = self.kama.peek(close)
+        kama_rsi = self.kama_rsi.peek(kama)
+        close_rsi = self.close_rsi.peek(close)
+        return self._result(self.valid_closes + (not _is_nan(close)),
+                            self.kama_seen or not _is_nan(kama), self.kama_rsi_seen or not _is_nan(kama_rsi),
+                            kama_rsi if not _is_nan(kama_rsi) else self.kama_rsi_last_valid,
+                            close_rsi if not _is_nan(close_rsi) else self.close_rsi_last_valid)
+
+    def current(self) -> float:
+        return self._result(self.valid_closes, self.kama_seen, self.kama_rsi_seen, self.kama_rsi_last_valid, self.close_rsi_last_valid)
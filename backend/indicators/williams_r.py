@@ -1,12 +1,18 @@
 # backend/indicators/williams_r.py
+# Twins: batch.williams_r (as-of engine) and streaming.WilliamsRState (live updates) compute this indicator too;
+# formulas are shared via kernels.py, but guard/NaN/recursion changes must be made in all three.
+# Parity: tests/modular/test_asof_indicators.py and tests/modular/test_live_indicators.py.
 import pandas as pd
 import numpy as np
 import logging
+from . import kernels
 
 logger = logging.getLogger(__name__)
 
-def calculate(ohlc_df: pd.DataFrame, period: int = 14) -> pd.Series:
+def calculate(ohlc_df: pd.DataFrame, period: int = 14, context=None) -> pd.Series:
     """Calculates Williams %R manually."""
+    if context is not None:
+        context.check_frame(ohlc_df)
     required_cols = {'high', 'low', 'close'}
     if not required_cols.issubset(ohlc_df.columns) or ohlc_df.isnull().all().all():
         logger.warning(f"Williams %R Calc: Missing required columns or all NaN data. Len: {len(ohlc_df)}")
@@ -15,13 +21,15 @@ def calculate(ohlc_df: pd.DataFrame, period: int = 14) -> pd.Series:
          logger.warning(f"Williams %R Calc: Not enough data ({len(ohlc_df)}) for period {period}.")
          return pd.Series(dtype=float, index=ohlc_df.index)
 
-    highest_high = ohlc_df['high'].rolling(window=period, min_periods=period).max()
-    lowest_low = ohlc_df['low'].rolling(window=period, min_periods=period).min()
+    if context is not None:
+        highest_high = context.rolling('high', period, 'max')
+        lowest_low = context.rolling('low', period, 'min')
+    else:
+        highest_high = ohlc_df['high'].rolling(window=period, min_periods=period).max()
+        lowest_low = ohlc_df['low'].rolling(window=period, min_periods=period).min()
     close = ohlc_df['close']
 
-    # (Highest High - Current Close) / (Highest High - Lowest Low)
-    numerator = highest_high - close
-    denominator = (highest_high - lowest_low).replace(0, np.nan) # Avoid division by zero
-
-    williams_r = (numerator / denominator) * -100.0
+    # (Highest High - Current Close) / (Highest High - Lowest Low) * -100, NaN on a zero range
+    williams_r = pd.Series(kernels.williams_r_values(highest_high.to_numpy(dtype=np.float64), lowest_low.to_numpy(dtype=np.float64),
+                                                     close.to_numpy(dtype=np.float64)), index=ohlc_df.index)
     return williams_r
\ No newline at end of file
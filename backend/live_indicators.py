@@ -0,0 +1,230 @@
+# backend/live_indicators.py
+import json
+import zlib
+import hashlib
+import logging
+import threading
+import numpy as np
+import pandas as pd
+
+from backend import config, db_utils
+from backend.indicator_calculator import resample_ohlc_data, resample_bin_end_days, crsi_rank_len
+from backend.indicators import streaming
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+LIVE_STATE_VERSION = 2 # Bump when the streaming states change shape; older snapshots are rebuilt
+LIVE_TIMEFRAMES = (('monthly', 'ME'), ('weekly', 'W-MON'))
+
+
+def _indicator_states(timeframe_label: str, rank_len: int) -> dict:
+    """Fresh streaming states for every indicator, with the same parameters the indicator_calculator wrappers use."""
+    params = {key: config.get_indicator_params(key, timeframe_label) for key in config.DEFAULT_INDICATOR_PARAMS}
+    stoch, crsi, adaptive = params['stochRsi'], params['crsi'], params['adaptiveRsi']
+    return {
+        'rsi': streaming.RSIState(params['rsi'].get('period', 14)),
+        'stochRsi': streaming.StochRSIState(stoch.get('rsi_period', 14), stoch.get('stoch_period', 14), stoch.get('k_smooth', 3)),
+        'mfi': streaming.MFIState(params['mfi'].get('period', 14)),
+        'crsi': streaming.ConnorsRSIState(crsi.get('rsi_short_len', 3), crsi.get('rsi_streak_len', 2), rank_len),
+        'williamsR': streaming.WilliamsRState(params['williamsR'].get('period', 14)),
+        'rvi': streaming.RVIState(params['rvi'].get('period', 10)),
+        'adaptiveRsi': streaming.AdaptiveRSIState(adaptive.get('period', 14), adaptive.get('kama_n', 10),
+                                                  adaptive.get('kama_fast_ema', 2), adaptive.get('kama_slow_ema', 30)),
+    }
+
+
+def _params_key(timeframe_label: str) -> str:
+    relevant = {key: config.get_indicator_params(key, timeframe_label) for key in config.DEFAULT_INDICATOR_PARAMS}
+    return hashlib.sha1(json.dumps(relevant, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def _rows_checksum(day_numbers: np.ndarray, values: np.ndarray) -> int:
+    """CRC of the daily rows a committed state was built from (any backfilled or corrected day changes it)."""
+    return zlib.crc32(np.ascontiguousarray(values).tobytes(), zlib.crc32(np.ascontiguousarray(day_numbers).tobytes()))
+
+
+def _aggregate_bar(values: np.ndarray):
+    """One resample_ohlc_data bar from a bin's daily rows, or None if its open/high/low/close are all NaN."""
+    valid = ~np.isnan(values)
+    if not valid[:, :4].any():
+        return None
+    def first(column): return values[valid[:, column], column][0] if valid[:, column].any() else np.nan
+    def last(column): return values[valid[:, column], column][-1] if valid[:, column].any() else np.nan
+    high = np.nanmax(values[:, 1]) if valid[:, 1].any() else np.nan
+    low = np.nanmin(values[:, 2]) if valid[:, 2].any() else np.nan
+    return (float(first(0)), float(high), float(low), float(last(3)), float(np.nansum(values[:, 4])))
+
+
+class LiveTimeframeState:
+    """
+    Streaming indicator states for one timeframe of "today"'s window. Every complete bar (all bins before
+    the current week/month) is committed into the states once; the current bin is re-aggregated from its
+    few daily rows and only peeked, so a revised daily candle is O(1) in the length of the history.
+
+    The window get_indicator_data uses starts two years before the target day, so its first (truncated)
+    bar changes with every new day. The committed part is therefore keyed by a checksum of the daily rows
+    it was built from: same rows -> reuse, more rows after the same prefix -> commit just the new bars,
+    anything else (new day moving the window start, a backfilled gap) -> rebuild from the window.
+    """
+    def __init__(self, timeframe_label: str, rule: str):
+        self.timeframe_label = timeframe_label
+        self.rule = rule
+        self.params_key = None
+        self.committed_rows = 0
+        self.committed_checksum = None
+        self.committed_bars = 0
+        self.close_seen = False
+        self.rank_len = None
+        self.states = {}
+        self.counters = {'reused': 0, 'extended': 0, 'rebuilt': 0}
+
+    # --- persistence ---
+    def to_json(self) -> str:
+        return json.dumps({
+            'version': LIVE_STATE_VERSION, 'params_key': self.params_key,
+            'committed_rows': self.committed_rows, 'committed_checksum': self.committed_checksum,
+            'committed_bars': self.committed_bars, 'close_seen': self.close_seen, 'rank_len': self.rank_len,
+            'states': {key: state.to_dict() for key, state in self.states.items()},
+        })
+
+    def load_json(self, state_json: str) -> bool:
+        try:
+            snapshot = json.loads(state_json)
+            if snapshot.get('version') != LIVE_STATE_VERSION or snapshot.get('params_key') != _params_key(self.timeframe_label):
+                return False
+            states = _indicator_states(self.timeframe_label, snapshot['rank_len'])
+            for key, state in states.items():
+                state.load_dict(snapshot['states'][key])
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"LiveIndicators ({self.timeframe_label}): Ignoring unreadable saved state: {e}")
+            return False
+        self.params_key = snapshot['params_key']
+        self.committed_rows, self.committed_checksum = snapshot['committed_rows'], snapshot['committed_checksum']
+        self.committed_bars, self.close_seen, self.rank_len = snapshot['committed_bars'], snapshot['close_seen'], snapshot['rank_len']
+        self.states = states
+        return True
+
+    # --- committing complete bars ---
+    def _commit_bars(self, day_numbers: np.ndarray, values: np.ndarray):
+        if len(day_numbers) == 0:
+            return
+        rows_df = pd.DataFrame(values, columns=OHLCV_COLUMNS,
+                               index=pd.to_datetime(day_numbers * SECONDS_PER_DAY, unit='s', utc=True))
+        bars_df = resample_ohlc_data(rows_df, self.rule)
+        if bars_df.empty:
+            return
+        for bar in bars_df[OHLCV_COLUMNS].to_numpy(dtype=np.float64).tolist():
+            for state in self.states.values():
+                state.update(bar)
+            self.committed_bars += 1
+            self.close_seen = self.close_seen or bar[3] == bar[3]
+
+    def _rebuild(self, day_numbers: np.ndarray, values: np.ndarray, rank_len: int):
+        self.params_key = _params_key(self.timeframe_label)
+        self.states = _indicator_states(self.timeframe_label, rank_len)
+        self.rank_len = rank_len
+        self.committed_bars, self.close_seen = 0, False
+        self._commit_bars(day_numbers, values)
+
+    def _sync_committed(self, day_numbers: np.ndarray, values: np.ndarray, rank_len: int) -> bool:
+        """Brings the committed states up to the given complete-bin rows. Returns True if they changed (and should be saved)."""
+        committed_rows = len(day_numbers)
+        params_match = self.params_key == _params_key(self.timeframe_label)
+        if params_match and committed_rows == self.committed_rows and self.committed_checksum == _rows_checksum(day_numbers, values):
+            self.counters['reused'] += 1
+            return False
+
+        prefix_rows = self.committed_rows
+        if (params_match and 0 < prefix_rows < committed_rows
+                and self.committed_checksum == _rows_checksum(day_numbers[:prefix_rows], values[:prefix_rows])):
+            # Same window start, whole new bins completed since: commit only those
+            self._commit_bars(day_numbers[prefix_rows:], values[prefix_rows:])
+            self.counters['extended'] += 1
+        else:
+            self._rebuild(day_numbers, values, rank_len)
+            self.counters['rebuilt'] += 1
+        self.committed_rows = committed_rows
+        self.committed_checksum = _rows_checksum(day_numbers, values)
+        return True
+
+    def indicators(self, day_numbers: np.ndarray, values: np.ndarray):
+        """
+        Indicator values for the window's bars (complete bins committed, current bin peeked), like
+        calculate_indicators_from_ohlc_df on the resampled window. Returns (indicators dict, state changed).
+        """
+        bin_ids = resample_bin_end_days(day_numbers, self.rule)
+        committed_rows = int(np.searchsorted(bin_ids, bin_ids[-1], side='left'))
+        partial_bar = _aggregate_bar(values[committed_rows:])
+
+        # CRSI's rank_len depends on the frame length; one bar per bin unless a bin is all NaN (then fixed up below)
+        crsi_params = config.get_indicator_params('crsi', self.timeframe_label)
+        bin_count = int(np.count_nonzero(bin_ids[1:] != bin_ids[:-1])) + 1
+        changed = self._sync_committed(day_numbers[:committed_rows], values[:committed_rows],
+                                       crsi_rank_len(crsi_params, self.timeframe_label, bin_count))
+        frame_bars = self.committed_bars + (partial_bar is not None)
+        rank_len = crsi_rank_len(crsi_params, self.timeframe_label, frame_bars)
+        if rank_len != self.rank_len:
+            # The frame length moved CRSI's rank_len (short histories, dropped bins); rebuild with the right one
+            self._rebuild(day_numbers[:committed_rows], values[:committed_rows], rank_len)
+            changed = True
+
+        if frame_bars < config.MIN_CANDLES_FOR_CALCULATION or not (self.close_seen or (partial_bar is not None and partial_bar[3] == partial_bar[3])):
+            return {key: None for key in config.DEFAULT_INDICATOR_PARAMS}, changed
+        results = {}
+        for key, state in self.states.items():
+            value = state.peek(partial_bar) if partial_bar is not None else state.current()
+            results[key] = value if value == value else None
+        return results, changed
+
+
+class LiveIndicatorState:
+    """Monthly and weekly LiveTimeframeState for "today", saved to SQLite whenever committed bars change."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timeframes = None
+
+    def _load(self):
+        self._timeframes = {}
+        for timeframe_label, rule in LIVE_TIMEFRAMES:
+            timeframe_state = LiveTimeframeState(timeframe_label, rule)
+            saved_json = db_utils.get_live_indicator_state_json(timeframe_label)
+            if saved_json and timeframe_state.load_json(saved_json):
+                logger.info(f"LiveIndicators ({timeframe_label}): Restored saved state ({timeframe_state.committed_bars} committed bars).")
+            self._timeframes[timeframe_label] = timeframe_state
+
+    def indicators(self, daily_df: pd.DataFrame):
+        """(monthly, weekly) indicator dicts for the window daily_df (the target day's 2-year window, ending at the target day)."""
+        if daily_df.empty:
+            empty = {key: None for key in config.DEFAULT_INDICATOR_PARAMS}
+            return dict(empty), dict(empty)
+        day_numbers = np.asarray(pd.DatetimeIndex(daily_df.index).as_unit('s').asi8 // SECONDS_PER_DAY, dtype=np.int64)
+        values = daily_df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+        with self._lock:
+            if self._timeframes is None:
+                self._load()
+            results = {}
+            for timeframe_label, timeframe_state in self._timeframes.items():
+                results[timeframe_label], changed = timeframe_state.indicators(day_numbers, values)
+                if changed:
+                    db_utils.store_live_indicator_state_json(timeframe_label, timeframe_state.to_json())
+            logger.info(f"LiveIndicators: {daily_df.index[-1].strftime('%Y-%m-%d')} from streaming state "
+                        f"(monthly {self._timeframes['monthly'].committed_bars} / weekly {self._timeframes['weekly'].committed_bars} committed bars).")
+        return results['monthly'], results['weekly']
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {label: dict(state.counters) for label, state in (self._timeframes or {}).items()}
+
+
+_live_states = {}
+_live_states_lock = threading.Lock()
+
+def get_live_indicator_state() -> LiveIndicatorState:
+    """Returns the process-wide live state for the current db_utils.DB_PATH (restored from SQLite on first use)."""
+    with _live_states_lock:
+        state = _live_states.get(db_utils.DB_PATH)
+        if state is None:
+            state = _live_states[db_utils.DB_PATH] = LiveIndicatorState()
+        return state
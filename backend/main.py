@@ -1,4 +1,6 @@
 # backend/main.py
+import time
+_main_import_started = time.perf_counter() # Start of the startup timing report's 'imports' phase
 import sys
 import os
 import logging
@@ -20,9 +22,16 @@ from backend.db_utils import (
 )
 from backend.services.indicator_service import get_indicator_data
 from backend.services.composite_metrics_service import calculate_composite_metrics
+from backend.ohlcv_store import get_daily_ohlcv_store
+from backend.data_sources import reload_csv_data
+from backend.startup_timing import record_startup_phase, timed_phase, log_startup_report, startup_report
+from backend.circuit_breaker import get_circuit_breaker_states
+from backend.http_transport import get_transport_metrics
+from backend.live_indicators import get_live_indicator_state
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
+record_startup_phase('imports', time.perf_counter() - _main_import_started)
 
 app = Flask(__name__)
 CORS(app)
@@ -97,11 +106,25 @@ def get_historical_time_points_api():
 @app.route('/api/refresh', methods=['POST'])
 def refresh_data_api():
     logger.info("API: Manual refresh endpoint called. Data for 'today' will be re-evaluated on next GET /api/indicators if cache is stale.")
+    get_daily_ohlcv_store().reload() # Pick up rows written by import/filler scripts since the store was loaded
+    reload_csv_data() # Merge new/changed files in csv/ (only those are parsed)
     return jsonify({'status': 'success', 'message': 'Refresh signal received. Data is fetched on demand by /api/indicators.'})
 
+@app.route('/api/status', methods=['GET'])
+def get_status_api():
+    # Provider health for operators: breaker state per provider plus per-host HTTP counters
+    return jsonify({
+        'circuit_breakers': get_circuit_breaker_states(),
+        'http_transports': get_transport_metrics(),
+        'startup_ms': startup_report(),
+        'live_indicators': get_live_indicator_state().stats(), # reused / extended / rebuilt committed bars
+    })
+
 if __name__ == '__main__':
     logger.info(f"MAIN_APP: Attempting to initialize DB. Using DB_PATH defined in db_utils: {os.path.abspath(DB_PATH)}")
-    init_db() 
+    with timed_phase('db_init'):
+        init_db() 
+    log_startup_report("MAIN_APP") # CSVs are parsed on first use; their csv_parse time is logged then
     
     logger.info(f"MAIN_APP: Starting Flask app. Script: {__file__}, CWD: {os.getcwd()}")
     app.run(debug=False, host='0.0.0.0', port=5001, threaded=True)
\ No newline at end of file
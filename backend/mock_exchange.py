@@ -0,0 +1,251 @@
+# backend/mock_exchange.py
+import json
+import time
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import numpy as np
+import pandas as pd
+
+from backend import config
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+COINGECKO_PATH_PREFIX = '/api/v3'
+KRAKEN_OHLC_PATH = '/0/public/OHLC'
+
+
+class MockMarketData:
+    """Daily OHLCV served by the mock exchange, as sorted day numbers plus an (n, 5) float64 array."""
+    def __init__(self, daily_df: pd.DataFrame):
+        daily_df = daily_df.sort_index()
+        self.day_numbers = daily_df.index.as_unit('s').asi8 // SECONDS_PER_DAY
+        self.values = daily_df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+
+    @classmethod
+    def synthetic(cls, start_date: str = '2013-01-01', end_date: str = None, seed: int = 7, start_price: float = 100.0):
+        """Deterministic random-walk candles from start_date through end_date (default: today, still forming)."""
+        end_date = end_date or datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        index = pd.date_range(start=start_date, end=end_date, freq='D', tz='UTC')
+        rng = np.random.default_rng(seed)
+        closes = start_price * np.exp(np.cumsum(rng.normal(0.001, 0.035, len(index))))
+        opens = np.r_[start_price, closes[:-1]]
+        highs = np.maximum(opens, closes) * (1 + rng.uniform(0, 0.03, len(index)))
+        lows = np.minimum(opens, closes) * (1 - rng.uniform(0, 0.03, len(index)))
+        volumes = rng.uniform(1_000, 50_000, len(index))
+        return cls(pd.DataFrame({'open': opens, 'high': highs, 'low': lows, 'close': closes, 'volume': volumes}, index=index))
+
+    @classmethod
+    def from_csv(cls, csv_path: str):
+        """Recorded data: a Kraken OHLCVT CSV of any interval, folded into daily bars."""
+        from backend.ohlcv_ingest import aggregate_csv_to_daily
+        return cls(aggregate_csv_to_daily(csv_path))
+
+    def day_slice(self, first_day: int, last_day: int) -> slice:
+        """Positions of the days in [first_day, last_day] (day numbers)."""
+        return slice(int(np.searchsorted(self.day_numbers, first_day, side='left')),
+                     int(np.searchsorted(self.day_numbers, last_day, side='right')))
+
+
+class MockProviderBehavior:
+    """
+    How one mocked provider misbehaves. Handlers read these attributes on every request, so tests and
+    benchmarks can change them while the server runs (e.g. set outage=True mid-run).
+    """
+    def __init__(self, latency_seconds: float = 0.0, latency_jitter_seconds: float = 0.0,
+                 rate_limit_per_second: float = None, rate_limit_burst: int = 1,
+                 failure_rate: float = 0.0, failure_status: int = 503, outage: bool = False):
+        self.latency_seconds = latency_seconds
+        self.latency_jitter_seconds = latency_jitter_seconds
+        self.rate_limit_per_second = rate_limit_per_second # None: never rate limited
+        self.rate_limit_burst = rate_limit_burst
+        self.failure_rate = failure_rate # Share of requests answered with failure_status
+        self.failure_status = failure_status
+        self.outage = outage # Every request fails with failure_status
+        self._lock = threading.Lock()
+        self._tokens = float(rate_limit_burst)
+        self._last_refill = time.monotonic()
+        self.counters = {'requests': 0, 'ok': 0, 'rate_limited': 0, 'failed': 0}
+
+    def take_token(self) -> bool:
+        """Server-side token bucket; False means this request is over the provider's rate limit."""
+        if self.rate_limit_per_second is None:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(float(self.rate_limit_burst), self._tokens + (now - self._last_refill) * self.rate_limit_per_second)
+            self._last_refill = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    def count(self, outcome: str):
+        with self._lock:
+            self.counters['requests'] += 1
+            self.counters[outcome] += 1
+
+    def counters_snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.counters)
+
+
+def _make_handler(provider: str, market_data: MockMarketData, behavior: MockProviderBehavior, kraken_max_candles: int):
+    class MockProviderHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1' # Keep-alive, like the real APIs
+
+        def _send_json(self, status: int, payload, headers: dict = None):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+            if behavior.latency_seconds or behavior.latency_jitter_seconds:
+                time.sleep(behavior.latency_seconds + random.uniform(0, behavior.latency_jitter_seconds))
+
+            if behavior.outage or (behavior.failure_rate and random.random() < behavior.failure_rate):
+                behavior.count('failed')
+                self._send_json(behavior.failure_status, {'error': 'injected failure'})
+                return
+            if not behavior.take_token():
+                behavior.count('rate_limited')
+                if provider == 'kraken': # Kraken reports rate limits inside a 200 response
+                    self._send_json(200, {'error': ['EAPI:Rate limit exceeded'], 'result': {}})
+                else:
+                    retry_after = max(1, int(round(1 / behavior.rate_limit_per_second)))
+                    self._send_json(429, {'status': {'error_code': 429, 'error_message': 'Throttled'}},
+                                    headers={'Retry-After': str(retry_after)})
+                return
+
+            try:
+                status, payload = self._route(parts.path, query)
+            except (KeyError, ValueError) as e:
+                status, payload = 400, {'error': f"bad request: {e}"}
+            behavior.count('ok' if status == 200 else 'failed')
+            self._send_json(status, payload)
+
+        def _route(self, path: str, query: dict):
+            if provider == 'coingecko' and path == f"{COINGECKO_PATH_PREFIX}/coins/bitcoin/history":
+                return 200, self._coingecko_history(query)
+            if provider == 'coingecko' and path == f"{COINGECKO_PATH_PREFIX}/coins/bitcoin/market_chart/range":
+                return 200, self._coingecko_range(query)
+            if provider == 'kraken' and path == KRAKEN_OHLC_PATH:
+                return 200, self._kraken_ohlc(query)
+            return 404, {'error': f"unknown path {path}"}
+
+        def _coingecko_history(self, query: dict) -> dict:
+            day = int(datetime.strptime(query['date'], '%d-%m-%Y').replace(tzinfo=timezone.utc).timestamp()) // SECONDS_PER_DAY
+            payload = {'id': 'bitcoin', 'symbol': 'btc', 'name': 'Bitcoin'} # No market_data for unknown days, like CoinGecko
+            positions = market_data.day_slice(day, day)
+            if positions.start < positions.stop:
+                open_, _, _, _, volume = market_data.values[positions.start]
+                payload['market_data'] = {'current_price': {'usd': open_}, 'total_volume': {'usd': volume}}
+            return payload
+
+        def _coingecko_range(self, query: dict) -> dict:
+            first_day = -(-int(query['from']) // SECONDS_PER_DAY) # Day starts at or after 'from'
+            last_day = int(query['to']) // SECONDS_PER_DAY
+            positions = market_data.day_slice(first_day, last_day)
+            ts_ms = (market_data.day_numbers[positions] * SECONDS_PER_DAY * 1000).tolist()
+            return {'prices': [[t, p] for t, p in zip(ts_ms, market_data.values[positions, 0].tolist())],
+                    'total_volumes': [[t, v] for t, v in zip(ts_ms, market_data.values[positions, 4].tolist())]}
+
+        def _kraken_ohlc(self, query: dict) -> dict:
+            if int(query.get('interval', 1)) != 1440:
+                return {'error': ['EGeneral:Invalid arguments'], 'result': {}}
+            pair = query.get('pair', 'XXBTZUSD')
+            since_day = int(query.get('since', 0)) // SECONDS_PER_DAY + 1 # 'since' is exclusive, as on Kraken: candles newer than it
+            # Kraken only keeps the most recent kraken_max_candles candles, whatever 'since' asks for
+            oldest_position = max(0, len(market_data.day_numbers) - kraken_max_candles)
+            start = max(oldest_position, market_data.day_slice(since_day, since_day).start)
+            candles = []
+            for day, (open_, high, low, close, volume) in zip(market_data.day_numbers[start:].tolist(), market_data.values[start:].tolist()):
+                vwap = (high + low + close) / 3
+                candles.append([day * SECONDS_PER_DAY, f"{open_:.1f}", f"{high:.1f}", f"{low:.1f}", f"{close:.1f}",
+                                f"{vwap:.1f}", f"{volume:.8f}", 1000])
+            last = candles[-2][0] if len(candles) > 1 else (candles[-1][0] if candles else int(query.get('since', 0)))
+            return {'error': [], 'result': {pair: candles, 'last': last}} # 'last': newest committed candle
+
+        def log_message(self, *args):
+            pass
+
+    return MockProviderHandler
+
+
+class MockExchange:
+    """
+    Local stand-in for the CoinGecko and Kraken endpoints api_clients uses, one HTTP server per
+    provider (so each keeps its own transport, rate limiter and circuit breaker, as with the real hosts).
+    Candles come from MockMarketData (synthetic or recorded); latency, rate limits and failures come
+    from each provider's MockProviderBehavior.
+    """
+    def __init__(self, market_data: MockMarketData = None, host: str = '127.0.0.1',
+                 coingecko_port: int = 0, kraken_port: int = 0,
+                 coingecko: MockProviderBehavior = None, kraken: MockProviderBehavior = None,
+                 kraken_max_candles: int = 720):
+        self.market_data = market_data or MockMarketData.synthetic()
+        self.behaviors = {'coingecko': coingecko or MockProviderBehavior(), 'kraken': kraken or MockProviderBehavior()}
+        self._servers = {
+            provider: ThreadingHTTPServer((host, port), _make_handler(provider, self.market_data, self.behaviors[provider], kraken_max_candles))
+            for provider, port in (('coingecko', coingecko_port), ('kraken', kraken_port))
+        }
+        self._threads = []
+        self._previous_base_urls = None
+
+    def _base_address(self, provider: str) -> str:
+        host, port = self._servers[provider].server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def coingecko_base_url(self) -> str:
+        return self._base_address('coingecko') + COINGECKO_PATH_PREFIX
+
+    @property
+    def kraken_base_url(self) -> str:
+        return self._base_address('kraken') + KRAKEN_OHLC_PATH
+
+    def start(self):
+        for provider, server in self._servers.items():
+            thread = threading.Thread(target=server.serve_forever, name=f"mock-{provider}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"MockExchange: CoinGecko at {self.coingecko_base_url}, Kraken at {self.kraken_base_url}.")
+        return self
+
+    def point_clients_here(self):
+        """Sets config.COINGECKO_API_BASE_URL / KRAKEN_API_BASE_URL to this server (undone by stop())."""
+        if self._previous_base_urls is None:
+            self._previous_base_urls = (config.COINGECKO_API_BASE_URL, config.KRAKEN_API_BASE_URL)
+        config.COINGECKO_API_BASE_URL = self.coingecko_base_url
+        config.KRAKEN_API_BASE_URL = self.kraken_base_url
+
+    def stop(self):
+        if self._previous_base_urls is not None:
+            config.COINGECKO_API_BASE_URL, config.KRAKEN_API_BASE_URL = self._previous_base_urls
+            self._previous_base_urls = None
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self) -> dict:
+        """Per-provider request counters (ok / rate_limited / failed)."""
+        return {provider: behavior.counters_snapshot() for provider, behavior in self.behaviors.items()}
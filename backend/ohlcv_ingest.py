@@ -0,0 +1,120 @@
+# backend/ohlcv_ingest.py
+import os
+import fnmatch
+import logging
+import zipfile
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+from backend import config
+from backend.db_utils import store_daily_ohlcv_bulk
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+# Kraken OHLCVT export layout (no header): interval start (Unix s), O, H, L, C, volume, trades
+CSV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+OHLCV_COLUMNS = CSV_COLUMNS[1:]
+
+
+class DailyOHLCVAggregator:
+    """
+    Folds OHLCV rows of any interval (1m, 5m, 60m, 1440m...) into UTC daily bars, one chunk at a time.
+    Per day it keeps only (first_ts, open, high, low, last_ts, close, volume), so memory grows with the
+    number of days covered, never with the number of rows read. Chunks may split a day anywhere and
+    may arrive out of order: open comes from the earliest timestamp, close from the latest, and rows
+    with equal timestamps keep file order.
+    """
+    def __init__(self):
+        self._days = {} # day number -> [first_ts, open, high, low, last_ts, close, volume]
+        self.rows_seen = 0
+        self.rows_used = 0
+
+    def add_chunk(self, chunk: pd.DataFrame):
+        """Adds one chunk with CSV_COLUMNS; values may be strings (unparseable rows are dropped, as in CSVDataLoader)."""
+        self.rows_seen += len(chunk)
+        numeric = chunk[CSV_COLUMNS].apply(pd.to_numeric, errors='coerce').dropna()
+        if numeric.empty:
+            return
+        self.rows_used += len(numeric)
+        ts = numeric['timestamp'].to_numpy(dtype=np.int64)
+        day = ts // SECONDS_PER_DAY
+        order = np.lexsort((ts, day)) # By day, then time; stable so ties keep file order
+        day, ts = day[order], ts[order]
+        o, h, l, c, v = (numeric[col].to_numpy(dtype=np.float64)[order] for col in OHLCV_COLUMNS)
+
+        starts = np.flatnonzero(np.r_[True, day[1:] != day[:-1]])
+        ends = np.r_[starts[1:], len(day)] - 1
+        chunk_bars = zip(day[starts].tolist(), ts[starts].tolist(), o[starts].tolist(),
+                         np.maximum.reduceat(h, starts).tolist(), np.minimum.reduceat(l, starts).tolist(),
+                         ts[ends].tolist(), c[ends].tolist(), np.add.reduceat(v, starts).tolist())
+        for day_number, first_ts, open_, high, low, last_ts, close, volume in chunk_bars:
+            bar = self._days.get(day_number)
+            if bar is None:
+                self._days[day_number] = [first_ts, open_, high, low, last_ts, close, volume]
+                continue
+            # Day continues from an earlier chunk
+            if first_ts < bar[0]:
+                bar[0], bar[1] = first_ts, open_
+            bar[2] = max(bar[2], high)
+            bar[3] = min(bar[3], low)
+            if last_ts >= bar[4]:
+                bar[4], bar[5] = last_ts, close
+            bar[6] += volume
+
+    def __len__(self):
+        return len(self._days)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Daily bars as a float64 OHLCV DataFrame indexed by UTC day-start timestamps, in date order."""
+        day_numbers = np.array(sorted(self._days), dtype=np.int64)
+        values = np.array([[self._days[d][i] for i in (1, 2, 3, 5, 6)] for d in day_numbers.tolist()],
+                          dtype=np.float64).reshape(len(day_numbers), len(OHLCV_COLUMNS))
+        index = pd.to_datetime(day_numbers * SECONDS_PER_DAY, unit='s', utc=True)
+        return pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS)
+
+
+def list_zip_csv_members(zip_path: str, pattern: str = '*.csv') -> list:
+    """Names of the CSV members in a zip archive matching a glob pattern (e.g. 'XBTUSD_1.csv', 'XBTUSD_*.csv')."""
+    with zipfile.ZipFile(zip_path) as archive:
+        return sorted(name for name in archive.namelist()
+                      if fnmatch.fnmatch(os.path.basename(name), pattern) and name.lower().endswith('.csv'))
+
+@contextmanager
+def _open_csv_stream(path: str, member: str = None):
+    """Opens a plain CSV, or one member of a zip archive without extracting it to disk."""
+    if member is None:
+        with open(path, 'rb') as csv_file:
+            yield csv_file
+    else:
+        with zipfile.ZipFile(path) as archive, archive.open(member) as member_file:
+            yield member_file
+
+def iter_ohlcv_csv_chunks(path: str, member: str = None, chunk_rows: int = None):
+    """Yields raw string chunks (CSV_COLUMNS) of a headerless OHLCV(T) CSV, or of a zip member."""
+    chunk_rows = chunk_rows or config.CSV_STREAM_CHUNK_ROWS
+    with _open_csv_stream(path, member) as stream:
+        reader = pd.read_csv(stream, header=None, names=CSV_COLUMNS, usecols=range(len(CSV_COLUMNS)),
+                             dtype=str, keep_default_na=False, na_values=[''], chunksize=chunk_rows)
+        for chunk in reader:
+            yield chunk
+
+def aggregate_csv_to_daily(path: str, member: str = None, chunk_rows: int = None) -> pd.DataFrame:
+    """Streams a CSV (or zip member) of any interval into UTC daily bars. Returns the float64 OHLCV frame."""
+    aggregator = DailyOHLCVAggregator()
+    label = f"{path}:{member}" if member else path
+    try:
+        for chunk in iter_ohlcv_csv_chunks(path, member, chunk_rows):
+            aggregator.add_chunk(chunk)
+    except pd.errors.EmptyDataError:
+        logger.warning(f"OHLCVIngest: {label} is empty.")
+    logger.info(f"OHLCVIngest: {label}: {aggregator.rows_used} of {aggregator.rows_seen} rows usable, {len(aggregator)} daily bars.")
+    return aggregator.to_frame()
+
+def ingest_csv_to_db(path: str, member: str = None, source: str = 'csv_import', chunk_rows: int = None):
+    """Aggregates a CSV (or zip member) to daily bars and bulk-writes them to daily_ohlcv. Returns (written, skipped)."""
+    daily_df = aggregate_csv_to_daily(path, member, chunk_rows)
+    if daily_df.empty:
+        return 0, 0
+    return store_daily_ohlcv_bulk(daily_df, source=source)
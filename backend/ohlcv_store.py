@@ -0,0 +1,144 @@
+# backend/ohlcv_store.py
+import logging
+import threading
+import numpy as np
+import pandas as pd
+
+from backend import db_utils
+from backend.db_utils import OHLCV_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+_NS_PER_DAY = SECONDS_PER_DAY * 1_000_000_000
+
+def _to_day_number(date_like) -> int:
+    """Days since 1970-01-01 for a UTC datetime / Timestamp (time of day is dropped)."""
+    return int(pd.Timestamp(date_like).value // _NS_PER_DAY)
+
+def _index_to_day_numbers(index) -> np.ndarray:
+    """Day numbers for a DatetimeIndex of UTC day starts (independent of the index's time resolution)."""
+    return np.asarray(pd.DatetimeIndex(index).as_unit('s').asi8 // SECONDS_PER_DAY, dtype=np.int64)
+
+
+class DailyOHLCVStore:
+    """
+    Process-wide, sorted daily OHLCV history held in contiguous NumPy arrays:
+    an int64 day-number array and one float64 row per OHLCV column (shape 5 x capacity).
+    Loaded once from SQLite; candles fetched later are merged in with upsert().
+    window() returns DataFrames that are views on these arrays, so adjacent Time Machine
+    dates reuse the same memory instead of rebuilding a 2-year frame per request.
+
+    Rows that existing views can see are never modified in place: appending a new latest
+    day writes into spare capacity, anything else (corrections, gaps in the middle)
+    builds fresh arrays and swaps them in. Views handed out earlier stay valid and unchanged.
+    """
+    def __init__(self, initial_capacity: int = 4096):
+        self._lock = threading.RLock()
+        self._days = np.empty(initial_capacity, dtype=np.int64)
+        self._values = np.empty((len(OHLCV_COLUMNS), initial_capacity), dtype=np.float64)
+        self._size = 0
+        self._loaded = False
+
+    def __len__(self):
+        return self._size
+
+    def ensure_loaded(self):
+        """Loads the whole daily_ohlcv table on first use."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            all_df = db_utils.get_all_daily_ohlcv()
+            self._replace_arrays(_index_to_day_numbers(all_df.index), all_df[OHLCV_COLUMNS].to_numpy(dtype=np.float64).T)
+            self._loaded = True
+            logger.info(f"OHLCVStore: Loaded {self._size} daily rows from {db_utils.DB_PATH}.")
+
+    def reload(self):
+        """Drops the in-memory copy; the next call reloads from SQLite (e.g. after scripts wrote to the DB)."""
+        with self._lock:
+            self._loaded = False
+            self._size = 0
+
+    def _replace_arrays(self, days: np.ndarray, values: np.ndarray):
+        capacity = max(len(days) * 2, 1024)
+        new_days = np.empty(capacity, dtype=np.int64)
+        new_values = np.empty((len(OHLCV_COLUMNS), capacity), dtype=np.float64)
+        new_days[:len(days)] = days
+        new_values[:, :len(days)] = values
+        self._days, self._values, self._size = new_days, new_values, len(days)
+
+    def upsert(self, ohlcv_df: pd.DataFrame):
+        """Merges a float64 OHLCV frame indexed by UTC day-start timestamps (already written to SQLite) into the store."""
+        if ohlcv_df is None or ohlcv_df.empty:
+            return
+        new_days = _index_to_day_numbers(ohlcv_df.index)
+        new_values = ohlcv_df[OHLCV_COLUMNS].to_numpy(dtype=np.float64).T
+        order = np.argsort(new_days, kind='stable')
+        new_days, new_values = new_days[order], new_values[:, order]
+
+        with self._lock:
+            if not self._loaded:
+                return # Nothing to merge into yet: the first load reads these rows from SQLite anyway
+            size = self._size
+            if size == 0 or new_days[0] > self._days[size - 1]:
+                # Common case: today's / newly fetched days after the last one we hold. Append in place.
+                if size + len(new_days) > len(self._days): # Out of spare capacity: grow (amortized doubling)
+                    self._replace_arrays(np.concatenate([self._days[:size], new_days]),
+                                         np.concatenate([self._values[:, :size], new_values], axis=1))
+                    return
+                self._days[size:size + len(new_days)] = new_days
+                self._values[:, size:size + len(new_days)] = new_values
+                self._size = size + len(new_days)
+                return
+
+            # Days inside the held range: merge into new arrays (new values win for duplicate days)
+            merged_days = np.concatenate([self._days[:size], new_days])
+            merged_values = np.concatenate([self._values[:, :size], new_values], axis=1)
+            unique_days, first_pos = np.unique(merged_days[::-1], return_index=True)
+            keep = len(merged_days) - 1 - first_pos # Position of the LAST occurrence of each day
+            self._replace_arrays(unique_days, merged_values[:, keep])
+
+    def upsert_day(self, date_obj_utc, values: dict):
+        """Merges one day's {'open',...,'volume'} dict (extra keys such as 'source' are ignored)."""
+        row = [[pd.to_numeric(values.get(col), errors='coerce') for col in OHLCV_COLUMNS]]
+        self.upsert(pd.DataFrame(row, index=pd.DatetimeIndex([pd.Timestamp(date_obj_utc).normalize()]),
+                                 columns=OHLCV_COLUMNS, dtype=np.float64))
+
+    def window(self, start_date_utc, end_date_utc):
+        """
+        Returns (ohlcv_df, missing_dates) for start..end inclusive, like db_utils.get_daily_ohlcv_range.
+        ohlcv_df is a read-only view on the store's arrays (no copy of the price data).
+        """
+        self.ensure_loaded()
+        start_day, end_day = _to_day_number(start_date_utc), _to_day_number(end_date_utc)
+        with self._lock:
+            days, values, size = self._days, self._values, self._size
+        lo = int(np.searchsorted(days[:size], start_day, side='left'))
+        hi = int(np.searchsorted(days[:size], end_day, side='right'))
+
+        day_slice = days[lo:hi]
+        value_slice = values[:, lo:hi].T # (rows, 5) view whose columns are contiguous
+        value_slice.flags.writeable = False
+        index = pd.DatetimeIndex(pd.to_datetime(day_slice * SECONDS_PER_DAY, unit='s', utc=True))
+        ohlcv_df = pd.DataFrame(value_slice, index=index, columns=OHLCV_COLUMNS, copy=False)
+
+        expected_count = end_day - start_day + 1
+        if len(day_slice) == expected_count:
+            return ohlcv_df, []
+        missing_days = np.setdiff1d(np.arange(start_day, end_day + 1, dtype=np.int64), day_slice, assume_unique=True)
+        missing_dates = [ts.to_pydatetime() for ts in pd.to_datetime(missing_days * SECONDS_PER_DAY, unit='s', utc=True)]
+        return ohlcv_df, missing_dates
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_daily_ohlcv_store() -> DailyOHLCVStore:
+    """Returns the process-wide store for the current db_utils.DB_PATH (loaded lazily on first use)."""
+    with _stores_lock:
+        store = _stores.get(db_utils.DB_PATH)
+        if store is None:
+            store = _stores[db_utils.DB_PATH] = DailyOHLCVStore()
+        return store
@@ -0,0 +1,93 @@
+# backend/rate_limiter.py
+import time
+import logging
+import threading
+from backend import config
+
+logger = logging.getLogger(__name__)
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket. Tokens refill continuously at rate_per_second up to burst.
+    acquire() only sleeps when the bucket is empty; callers that arrive while it is empty
+    reserve future tokens, so concurrent threads queue up in order instead of all waking at once.
+    penalize() is the 429 / "EAPI:Rate limit exceeded" signal: it empties the bucket, stops the
+    refill until the provider's cooldown has passed and queues every caller behind it, one token
+    interval apart, so the queue does not hit the provider in one burst when the cooldown ends.
+
+    The budget is per process: the server and a script running beside it (api-loader,
+    generate_historical_json) each have their own bucket.
+    """
+    def __init__(self, name: str, rate_per_second: float, burst: int = 1):
+        self.name = name
+        self.rate_per_second = float(rate_per_second)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._last_refill # Negative while a penalize() cooldown is running: no refill
+        if elapsed > 0:
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate_per_second)
+            self._last_refill = now
+
+    def acquire(self) -> float:
+        """Takes one token, sleeping only if none is available. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1.0 # May go negative: that is this caller's reservation
+            # The reservation counts from the end of any cooldown, not from now
+            offset_seconds = max(0.0, -self._tokens) / self.rate_per_second
+            seen_blocked_until = self._blocked_until
+            ready_at = max(now, seen_blocked_until) + offset_seconds
+
+        waited_seconds = 0.0
+        while True:
+            wait_seconds = ready_at - time.monotonic()
+            if wait_seconds > 0:
+                logger.debug(f"RateLimiter[{self.name}]: Budget used up, waiting {wait_seconds:.2f}s.")
+                time.sleep(wait_seconds)
+                waited_seconds += wait_seconds
+            with self._lock:
+                if self._blocked_until <= seen_blocked_until:
+                    return waited_seconds
+                # penalize() was called while we waited: keep our place in the queue, behind the new cooldown
+                seen_blocked_until = self._blocked_until
+                ready_at = max(ready_at, seen_blocked_until + offset_seconds)
+
+    def penalize(self, cooldown_seconds: float):
+        """Provider said we are over its limit: drop all tokens and block callers for cooldown_seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0) # Reservations already handed out stay queued
+            self._blocked_until = max(self._blocked_until, now + cooldown_seconds)
+            self._last_refill = max(self._last_refill, self._blocked_until) # Refill resumes after the cooldown
+        logger.warning(f"RateLimiter[{self.name}]: Provider rate limit signalled. Holding calls for {cooldown_seconds:.1f}s.")
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(provider: str) -> TokenBucketRateLimiter:
+    """Returns this process's limiter for a provider ('coingecko', 'kraken'), configured from config.PROVIDER_RATE_LIMITS."""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limits = config.PROVIDER_RATE_LIMITS.get(provider, config.PROVIDER_RATE_LIMITS['default'])
+            limiter = _limiters[provider] = TokenBucketRateLimiter(provider, limits['rate_per_second'], limits['burst'])
+        return limiter
+
+
+_concurrency_slots = {}
+
+def get_concurrency_slot(provider: str) -> threading.BoundedSemaphore:
+    """Returns the process-wide semaphore capping in-flight requests to a provider (PROVIDER_RATE_LIMITS 'max_concurrency')."""
+    with _limiters_lock:
+        slot = _concurrency_slots.get(provider)
+        if slot is None:
+            limits = config.PROVIDER_RATE_LIMITS.get(provider, config.PROVIDER_RATE_LIMITS['default'])
+            slot = _concurrency_slots[provider] = threading.BoundedSemaphore(max(1, int(limits.get('max_concurrency', 1))))
+        return slot
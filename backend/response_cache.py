@@ -0,0 +1,157 @@
+# backend/response_cache.py
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from backend import config
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESPONSE_CACHE_DIR = os.path.join(PROJECT_ROOT, '.response_cache/')
+RESPONSE_CACHE_MODES = ('off', 'record', 'replay')
+RESPONSE_CACHE_FORMAT_VERSION = 1
+
+
+class ResponseCacheMiss(requests.exceptions.RequestException):
+    """Replay mode found no cached response. API clients handle it like any other request error."""
+
+
+def normalize_request_url(url: str, params: dict = None) -> str:
+    """
+    One canonical form per request: lower-case scheme/host, query parameters from the URL and from
+    params merged and sorted. '...?date=01-02-2024&localization=false' and the same call with
+    params={'localization': 'false', 'date': '01-02-2024'} share a cache entry.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    query += [(str(key), str(value)) for key, value in (params or {}).items()]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(sorted(query)), ''))
+
+
+class ResponseCache:
+    """
+    On-disk store of raw provider responses (200s only), one JSON file per normalized request URL under
+    <cache_dir>/<host>/. Entries either expire after their endpoint's TTL or, for responses that only
+    cover finished days, never expire. Writes go to a temp file and are renamed into place, so
+    concurrent fetch threads and processes never see half-written entries.
+    """
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._lock = threading.Lock()
+
+    def _entry_path(self, normalized_url: str) -> str:
+        host = urlsplit(normalized_url).netloc.replace(':', '_') or 'unknown_host'
+        key = hashlib.sha1(normalized_url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, host, f"{key}.json")
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def lookup(self, url: str, params: dict = None, allow_expired: bool = False):
+        """Cached requests.Response for the request, or None (missing, unreadable, or expired unless allow_expired)."""
+        normalized_url = normalize_request_url(url, params)
+        try:
+            with open(self._entry_path(normalized_url), 'r', encoding='utf-8') as entry_file:
+                entry = json.load(entry_file)
+        except FileNotFoundError:
+            self._count('misses')
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"ResponseCache: Unreadable entry for {normalized_url}: {e}")
+            self._count('misses')
+            return None
+
+        if entry.get('version') != RESPONSE_CACHE_FORMAT_VERSION or entry.get('url') != normalized_url:
+            self._count('misses')
+            return None
+        expires_at = entry.get('expires_at')
+        if expires_at is not None and expires_at <= time.time() and not allow_expired:
+            self._count('misses')
+            return None
+
+        response = requests.models.Response()
+        response.status_code = entry['status_code']
+        response._content = entry['body'].encode('utf-8')
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict(entry.get('headers') or {})
+        response.url = normalized_url
+        response.cache_stored_at = entry['stored_at'] # Lets callers tell what was still in progress when recorded
+        self._count('hits')
+        return response
+
+    def store(self, url: str, params: dict, response: requests.Response, ttl_seconds: float = None):
+        """Writes a response; ttl_seconds=None keeps it forever. Bodies that are not UTF-8 text are skipped."""
+        normalized_url = normalize_request_url(url, params)
+        try:
+            body = response.content.decode('utf-8')
+        except UnicodeDecodeError:
+            logger.warning(f"ResponseCache: Not caching non-text body for {normalized_url}.")
+            return
+        stored_at = time.time()
+        entry = {
+            'version': RESPONSE_CACHE_FORMAT_VERSION, 'url': normalized_url,
+            'status_code': response.status_code,
+            'headers': {'Content-Type': response.headers.get('Content-Type', 'application/json')},
+            'stored_at': stored_at,
+            'expires_at': None if ttl_seconds is None else stored_at + ttl_seconds,
+            'body': body,
+        }
+        entry_path = self._entry_path(normalized_url)
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(entry_path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+                json.dump(entry, tmp_file)
+            os.replace(tmp_path, entry_path)
+        except OSError as e:
+            logger.warning(f"ResponseCache: Could not write entry for {normalized_url}: {e}")
+            return
+        self._count('stores')
+        logger.debug(f"ResponseCache: Stored {normalized_url} ({'permanent' if ttl_seconds is None else f'ttl {ttl_seconds}s'}).")
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {'cache_dir': self.cache_dir, 'hits': self.hits, 'misses': self.misses, 'stores': self.stores}
+
+
+def response_cache_ttl_seconds(endpoint: str) -> float:
+    """TTL for responses of an endpoint that still cover an unfinished day."""
+    ttls = config.HTTP_RESPONSE_CACHE_TTL_SECONDS
+    return ttls.get(endpoint, ttls['default'])
+
+def get_response_cache_mode() -> str:
+    mode = config.HTTP_RESPONSE_CACHE_MODE
+    if mode not in RESPONSE_CACHE_MODES:
+        raise ValueError(f"HTTP_RESPONSE_CACHE_MODE must be one of {RESPONSE_CACHE_MODES}, got {mode!r}")
+    return mode
+
+def set_response_cache_mode(mode: str):
+    """Switches the process to 'off', 'record' or 'replay' (scripts call this from their --response_cache flag)."""
+    if mode not in RESPONSE_CACHE_MODES:
+        raise ValueError(f"Response cache mode must be one of {RESPONSE_CACHE_MODES}, got {mode!r}")
+    config.HTTP_RESPONSE_CACHE_MODE = mode
+    logger.info(f"ResponseCache: Mode set to '{mode}' (dir: {config.HTTP_RESPONSE_CACHE_DIR or RESPONSE_CACHE_DIR}).")
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """The process-wide cache for the configured directory."""
+    cache_dir = config.HTTP_RESPONSE_CACHE_DIR or RESPONSE_CACHE_DIR
+    with _caches_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = _caches[cache_dir] = ResponseCache(cache_dir)
+        return cache
@@ -1,9 +1,13 @@
 # backend/services/indicator_service.py
 import time
+import json
+import hashlib
 import logging
 from datetime import datetime, timezone
 import pandas as pd
 
+from backend import config
+
 from backend.db_utils import (
     get_full_indicator_set_from_db, store_full_indicator_set, DB_PATH
 )
@@ -12,13 +16,33 @@ from backend.indicator_calculator import ( # This now only contains individual i
     resample_ohlc_data,
     calculate_indicators_from_ohlc_df,
 )
+from backend.live_indicators import get_live_indicator_state
 # Import new service functions
 from backend.services.composite_metrics_service import calculate_composite_metrics
 from backend.services.outcome_service import calculate_price_outcomes
+from backend.single_flight import SingleFlight, SingleFlightTimeout
 
 
 logger = logging.getLogger(__name__)
 
+# Concurrent requests for the same stale/missing date share one pipeline run (no hourly stampede)
+_indicator_flight = SingleFlight('indicator_data')
+
+def _config_fingerprint() -> str:
+    """Short hash of the settings that shape a calculation, so requests under different configs never share a result."""
+    relevant = {
+        'years': config.HISTORICAL_DATA_YEARS,
+        'default_params': config.DEFAULT_INDICATOR_PARAMS,
+        'timeframe_params': config.TIMEFRAME_SPECIFIC_PARAMS,
+        'weights': config.COMPOSITE_METRICS_WEIGHTS,
+        'thresholds': config.COMPOSITE_METRICS_THRESHOLDS,
+        'neutral_points': config.COMPOSITE_METRICS_NEUTRAL_POINTS,
+    }
+    return hashlib.sha1(json.dumps(relevant, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+def _is_cache_fresh(cached_data: dict, is_today: bool) -> bool:
+    return bool(cached_data) and (not is_today or (cached_data.get('calculated_at') and (time.time() - cached_data['calculated_at'] < 3600)))
+
 def _format_db_data_for_api(cached_data: dict, target_date_obj_utc: datetime, is_today: bool) -> dict:
     # ... (this helper function remains the same)
     indicators_response = {
@@ -63,14 +87,34 @@ def get_indicator_data(target_date_obj_utc: datetime):
 
     cached_data = get_full_indicator_set_from_db(target_date_obj_utc)
 
-    if cached_data and (not is_today or (cached_data.get('calculated_at') and (time.time() - cached_data['calculated_at'] < 3600))):
+    if _is_cache_fresh(cached_data, is_today):
         logger.info(f"INDICATOR_SERVICE: Cache hit for {date_str_log}. Returning cached data.")
         return _format_db_data_for_api(cached_data, target_date_obj_utc, is_today)
 
+    flight_key = (date_str_log, _config_fingerprint())
+    try:
+        result = _indicator_flight.do(flight_key, lambda: _calculate_indicator_data(target_date_obj_utc, is_today),
+                                      timeout=config.SINGLE_FLIGHT_INDICATOR_TIMEOUT_SECONDS)
+    except SingleFlightTimeout:
+        logger.error(f"INDICATOR_SERVICE: Timed out waiting for the in-flight calculation for {date_str_log}.")
+        return {'error': f'Indicator calculation for {date_str_log} is still in progress. Please retry shortly.', 'price': None, 'http_status_code': 503}
+    return dict(result) # Callers pop keys from the response; each waiting thread gets its own copy
+
+
+def _calculate_indicator_data(target_date_obj_utc: datetime, is_today: bool) -> dict:
+    """Runs the full pipeline for one date (only ever by the single-flight leader for that date)."""
+    date_str_log = target_date_obj_utc.strftime('%Y-%m-%d')
+
+    # Another leader may have finished between our cache check and becoming leader
+    cached_data = get_full_indicator_set_from_db(target_date_obj_utc)
+    if _is_cache_fresh(cached_data, is_today):
+        logger.info(f"INDICATOR_SERVICE: Cache refreshed by another request for {date_str_log}. Returning cached data.")
+        return _format_db_data_for_api(cached_data, target_date_obj_utc, is_today)
+
     logger.info(f"INDICATOR_SERVICE: Cache miss or stale for {date_str_log}. Proceeding with calculation.")
     daily_df = get_historical_data_for_indicators(target_date_obj_utc, years=2)
 
-    if daily_df.empty or len(daily_df) < 60: 
+    if daily_df.empty or len(daily_df) < config.MIN_DAILY_ROWS_FOR_INDICATORS: 
         logger.warning(f"INDICATOR_SERVICE: Not enough historical daily data (found {len(daily_df)}) for {date_str_log}.")
         price_at_event_values, err_msg = fetch_and_store_daily_ohlcv(target_date_obj_utc)
         price_val = price_at_event_values.get('close') if price_at_event_values else None
@@ -105,11 +149,15 @@ def get_indicator_data(target_date_obj_utc: datetime):
             logger.error(f"INDICATOR_SERVICE: Could not determine price for {date_str_log} for indicators.")
             return {'error': f'Could not determine price for {date_str_log} for indicators.', 'price': None, 'http_status_code': 500}
 
-    weekly_ohlc_df = resample_ohlc_data(daily_df, 'W-MON')
-    monthly_ohlc_df = resample_ohlc_data(daily_df, 'ME')
+    if is_today and config.LIVE_INDICATOR_STATE_ENABLED:
+        # Complete weekly/monthly bars are already in the streaming states; only the current bars are re-evaluated
+        indicators_m, indicators_w = get_live_indicator_state().indicators(daily_df)
+    else:
+        weekly_ohlc_df = resample_ohlc_data(daily_df, 'W-MON')
+        monthly_ohlc_df = resample_ohlc_data(daily_df, 'ME')
 
-    indicators_m = calculate_indicators_from_ohlc_df(monthly_ohlc_df, 'monthly')
-    indicators_w = calculate_indicators_from_ohlc_df(weekly_ohlc_df, 'weekly')
+        indicators_m = calculate_indicators_from_ohlc_df(monthly_ohlc_df, 'monthly')
+        indicators_w = calculate_indicators_from_ohlc_df(weekly_ohlc_df, 'weekly')
     
     api_indicators_format = {key: {'monthly': indicators_m.get(key), 'weekly': indicators_w.get(key)} for key in indicators_m.keys()} # Use .keys() from one dict
     
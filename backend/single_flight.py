@@ -0,0 +1,67 @@
+# backend/single_flight.py
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class SingleFlightTimeout(TimeoutError):
+    """Raised to a waiting caller when the in-flight computation it joined did not finish in time."""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.owner_thread_id = threading.get_ident()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Request coalescing: concurrent do() calls with the same key share one execution of fn.
+    The first caller (the leader) runs fn; every caller that arrives while it is running waits
+    for the leader's result (or exception) instead of repeating the work. Nothing is cached once
+    the call finishes - the next caller after that starts a fresh computation.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, timeout: float = None):
+        """Runs fn() once per key at a time. Followers wait up to timeout seconds, then get SingleFlightTimeout."""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+            elif call.owner_thread_id == threading.get_ident():
+                is_leader = None # Re-entrant call from the leader itself: waiting would deadlock, just run it
+            else:
+                call.waiters += 1
+
+        if is_leader is None:
+            return fn()
+
+        if not is_leader:
+            logger.debug(f"SingleFlight[{self.name}]: Joining in-flight call for {key}.")
+            if not call.done.wait(timeout):
+                raise SingleFlightTimeout(f"SingleFlight[{self.name}]: Timed out after {timeout}s waiting for {key}.")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                waiters = call.waiters
+            call.done.set()
+            if waiters:
+                logger.info(f"SingleFlight[{self.name}]: Shared result for {key} with {waiters} waiting caller(s).")
@@ -0,0 +1,38 @@
+# backend/startup_timing.py
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Process start reference: the first backend module import that pulls this in
+_process_started = time.perf_counter()
+_phases = {} # phase name -> seconds (accumulated if a phase runs more than once)
+_phases_lock = threading.Lock()
+
+def record_startup_phase(name: str, seconds: float):
+    """Adds the duration of a startup phase (e.g. 'imports', 'csv_parse', 'db_init') to the report."""
+    with _phases_lock:
+        _phases[name] = _phases.get(name, 0.0) + seconds
+    logger.info(f"StartupTiming: {name} took {seconds * 1000:.1f} ms.")
+
+@contextmanager
+def timed_phase(name: str):
+    """Times the wrapped block and records it as a startup phase."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_startup_phase(name, time.perf_counter() - started)
+
+def startup_report() -> dict:
+    """Phase durations in ms, plus the time since the backend was first imported."""
+    with _phases_lock:
+        report = {name: round(seconds * 1000, 1) for name, seconds in _phases.items()}
+    report['since_first_backend_import'] = round((time.perf_counter() - _process_started) * 1000, 1)
+    return report
+
+def log_startup_report(label: str = "Startup"):
+    report = startup_report()
+    logger.info(f"StartupTiming: {label} report (ms): " + ", ".join(f"{name}={ms}" for name, ms in report.items()))
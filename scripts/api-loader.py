@@ -2,10 +2,10 @@
 import argparse
 import datetime as dt # Alias to avoid conflict with datetime class from datetime module
 from datetime import timezone # Explicitly import timezone
-import time
 import logging
 import os
 import sys
+import time
 
 # Adjust Python path to include the project root so backend modules can be imported
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -13,8 +13,12 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 # Imports from shared backend modules
+from backend.startup_timing import record_startup_phase, timed_phase, log_startup_report
+_backend_import_started = time.perf_counter()
 from backend.db_utils import init_db as init_db_main, get_daily_ohlcv_from_db
 from backend.data_sources import fetch_and_store_daily_ohlcv
+from backend.response_cache import RESPONSE_CACHE_MODES, set_response_cache_mode
+record_startup_phase('imports', time.perf_counter() - _backend_import_started)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -24,10 +28,16 @@ def main():
     parser = argparse.ArgumentParser(description="Populate bitcoin_daily_data.db from external APIs via backend modules.")
     parser.add_argument("--start_date", required=True, help="Start date in YYYY-MM-DD format.")
     parser.add_argument("--days", required=True, type=int, help="Number of days to fetch data for.")
+    parser.add_argument("--response_cache", choices=RESPONSE_CACHE_MODES, default=None,
+                        help="Provider response cache: 'record' reuses/stores raw API responses on disk, 'replay' runs offline from them.")
     args = parser.parse_args()
+    if args.response_cache:
+        set_response_cache_mode(args.response_cache)
 
     # Ensure the database and tables are initialized using the shared utility
-    init_db_main() 
+    with timed_phase('db_init'):
+        init_db_main() 
+    log_startup_report("API Loader")
 
     try:
         start_dt_naive = dt.datetime.strptime(args.start_date, "%Y-%m-%d")
@@ -45,15 +55,12 @@ def main():
         
         logger.info(f"API Loader: Processing date: {current_date_utc.strftime('%Y-%m-%d')}")
         
-        api_call_attempted_for_this_date = False
-
         # Check DB using the datetime object; db_utils will handle string conversion for query
         db_data = get_daily_ohlcv_from_db(current_date_utc) 
         if db_data:
             logger.info(f"API Loader: Data for {current_date_utc.strftime('%Y-%m-%d')} already in DB. Source: {db_data.get('source')}. Skipping API fetch.")
         else:
             logger.info(f"API Loader: Data for {current_date_utc.strftime('%Y-%m-%d')} not in DB. Attempting fetch via backend.data_sources.")
-            api_call_attempted_for_this_date = True
             
             # fetch_and_store_daily_ohlcv expects a datetime object
             fetched_data_values, error_message = fetch_and_store_daily_ohlcv(current_date_utc)
@@ -63,14 +70,7 @@ def main():
             else:
                 logger.error(f"API Loader: Failed to get data for {current_date_utc.strftime('%Y-%m-%d')}. Error: {error_message}")
         
-        if api_call_attempted_for_this_date and (i < args.days - 1):
-            logger.info(f"API Loader: Waiting for 3 seconds before processing next date (API call was attempted for {current_date_utc.strftime('%Y-%m-%d')})...")
-            time.sleep(3)
-        elif not api_call_attempted_for_this_date and (i < args.days - 1) :
-            # Optional: a very short delay or no delay if data was found in DB
-            # time.sleep(0.1) 
-            pass
-
+        # No fixed pause between dates: backend API clients wait on the shared provider rate limiters as needed.
 
     logger.info("API Loader: Data loading process finished.")
 
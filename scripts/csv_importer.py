@@ -1,77 +1,67 @@
 # scripts/csv_importer.py
 
 import argparse
-import datetime as dt 
-from datetime import timezone
 import logging
 import os
 import sys
-import pandas as pd
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from backend.db_utils import init_db as init_db_main, store_daily_ohlcv_data
+from backend.db_utils import init_db as init_db_main
 from backend.csv_data_loader import CSV_DIR
+from backend.ohlcv_ingest import ingest_csv_to_db, list_zip_csv_members
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def import_csv_to_db(csv_filepath):
-    count_imported = 0
-    count_skipped = 0
+def import_csv_to_db(csv_filepath, zip_member=None, chunk_rows=None):
+    label = f"{csv_filepath}:{zip_member}" if zip_member else csv_filepath
     try:
-        df = pd.read_csv(csv_filepath, header=None, names=['timestamp', 'open', 'high', 'low', 'close', 'volume', 'trades'])
-        if df.empty:
-            logger.info(f"CSV file {csv_filepath} is empty. Skipping.")
-            return 0, 0
+        logger.info(f"Streaming {label} into daily bars...")
 
-        logger.info(f"Processing {len(df)} rows from {csv_filepath}...")
-
-        for index, row in df.iterrows():
-            try:
-                ts_sec = int(row['timestamp'])
-                # Convert Unix timestamp to datetime object, ensure it's UTC
-                dt_obj_utc = dt.datetime.fromtimestamp(ts_sec, tz=timezone.utc)
-                # Normalize to start of day for consistent keying, db_utils will handle string conversion
-                dt_obj_utc_start_of_day = dt_obj_utc.replace(hour=0, minute=0, second=0, microsecond=0)
-
-                data_values = { # This is the dict format expected by store_daily_ohlcv_data's second arg
-                    'open': float(row['open']),
-                    'high': float(row['high']),
-                    'low': float(row['low']),
-                    'close': float(row['close']),
-                    'volume': float(row['volume']),
-                    'source': 'csv_import',
-                }
-                # store_daily_ohlcv_data expects a datetime object for the date key
-                store_daily_ohlcv_data(dt_obj_utc_start_of_day, data_values)
-                count_imported += 1
-            except ValueError as ve:
-                logger.error(f"Skipping row due to ValueError in {csv_filepath} at row {index+1}: {row.values.tolist()}. Error: {ve}")
-                count_skipped +=1
-            except Exception as e:
-                logger.error(f"Error processing row in {csv_filepath} at row {index+1}: {row.values.tolist()}. Error: {e}")
-                count_skipped +=1
+        # Rows of any interval (1m ... 1440m) are read chunk by chunk and folded into UTC daily bars,
+        # which are then written in one transaction
+        count_imported, count_skipped = ingest_csv_to_db(csv_filepath, member=zip_member, source='csv_import', chunk_rows=chunk_rows)
                 
-        logger.info(f"Finished processing {csv_filepath}. Imported/Replaced: {count_imported}, Skipped: {count_skipped}")
+        logger.info(f"Finished processing {label}. Imported/Replaced: {count_imported}, Skipped: {count_skipped}")
         return count_imported, count_skipped
         
-    except pd.errors.EmptyDataError:
-        logger.warning(f"CSV file {csv_filepath} is empty or unreadable. Skipping.")
-        return 0, 0
     except Exception as e:
-        logger.error(f"Failed to read or process CSV file {csv_filepath}: {e}")
+        logger.error(f"Failed to read or process CSV file {label}: {e}")
+        return 0, 0
+
+def import_zip_to_db(zip_filepath, member_pattern, chunk_rows=None):
+    """Imports matching CSV members straight from a zip archive (nothing is extracted to disk)."""
+    members = list_zip_csv_members(zip_filepath, member_pattern)
+    if not members:
+        logger.error(f"No CSV members matching '{member_pattern}' in {zip_filepath}.")
         return 0, 0
+    if len(members) > 1:
+        logger.warning(f"{len(members)} members match '{member_pattern}': {members}. Each is imported in turn, so later ones overwrite earlier days; pick a single interval to avoid mixing them.")
+    total_imported, total_skipped = 0, 0
+    for member in members:
+        imported, skipped = import_csv_to_db(zip_filepath, zip_member=member, chunk_rows=chunk_rows)
+        total_imported += imported
+        total_skipped += skipped
+    return total_imported, total_skipped
 
 def main():
     parser = argparse.ArgumentParser(description="Import historical Bitcoin data from CSV files into the database.")
     parser.add_argument("--csv_directory", default=CSV_DIR, help=f"Directory containing CSV files (default: {CSV_DIR})")
+    parser.add_argument("--zip", dest="zip_path", help="Import from a Kraken OHLCVT zip archive instead of --csv_directory.")
+    parser.add_argument("--member", default="XBTUSD_1440.csv", help="Glob for the zip member(s) to import, e.g. XBTUSD_1.csv (default: XBTUSD_1440.csv).")
+    parser.add_argument("--chunk_rows", type=int, default=None, help="Rows read per chunk while streaming (default: config.CSV_STREAM_CHUNK_ROWS).")
     args = parser.parse_args()
 
     init_db_main() 
 
+    if args.zip_path:
+        imported, skipped = import_zip_to_db(args.zip_path, args.member, args.chunk_rows)
+        logger.info(f"Zip import finished. Total records imported/replaced: {imported}, Total records skipped: {skipped}")
+        return
+
     if not os.path.isdir(args.csv_directory):
         logger.error(f"CSV directory not found: {args.csv_directory}")
         return
@@ -84,19 +74,12 @@ def main():
         if filename.lower().endswith(".csv"):
             filepath = os.path.join(args.csv_directory, filename)
             logger.info(f"Importing data from: {filepath}")
-            imported, skipped = import_csv_to_db(filepath)
+            imported, skipped = import_csv_to_db(filepath, chunk_rows=args.chunk_rows)
             total_imported_all_files += imported
             total_skipped_all_files += skipped
-            if imported == 0 and skipped == 0:
-                 # Check if file was truly empty or just had processing issues
-                try:
-                    if not pd.read_csv(filepath).empty:
-                         logger.warning(f"No records processed from non-empty file: {filepath}. Check format or content for parsing errors.")
-                except pd.errors.EmptyDataError:
-                    pass # Already logged as empty by import_csv_to_db
-                except Exception as e_read:
-                    logger.warning(f"Could not re-check if file {filepath} was empty due to read error: {e_read}")
-
+            if imported == 0 and skipped == 0 and os.path.getsize(filepath) > 0:
+                 # Size check only: re-reading a multi-GB file just to see if it is empty would defeat streaming
+                 logger.warning(f"No records processed from non-empty file: {filepath}. Check format or content for parsing errors.")
 
     logger.info(f"CSV import process finished. Total records imported/replaced: {total_imported_all_files}, Total records skipped: {total_skipped_all_files}")
 
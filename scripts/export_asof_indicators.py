@@ -0,0 +1,38 @@
+# scripts/export_asof_indicators.py
+import argparse
+import logging
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.db_utils import init_db as init_db_main, get_all_daily_ohlcv, DB_PATH
+from backend.asof_indicators import compute_asof_indicators
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export, for every day in daily_ohlcv, the monthly/weekly indicators get_indicator_data would return on that day.")
+    parser.add_argument("--out", default="asof_indicators.csv", help="CSV file to write (one row per day).")
+    parser.add_argument("--start_date", default=None, help="First day to export (YYYY-MM-DD). Earlier days still feed the windows.")
+    parser.add_argument("--end_date", default=None, help="Last day to export (YYYY-MM-DD).")
+    parser.add_argument("--years", type=int, default=2, help="History window per day (get_indicator_data uses 2).")
+    args = parser.parse_args()
+
+    init_db_main()
+    daily_df = get_all_daily_ohlcv()
+    if daily_df.empty:
+        logger.error(f"AsOf Export: No daily OHLCV rows in {DB_PATH}. Import data first (e.g. scripts/csv_importer.py).")
+        return
+
+    asof_df = compute_asof_indicators(daily_df, start_date=args.start_date, end_date=args.end_date, years=args.years)
+    asof_df.index = asof_df.index.strftime('%Y-%m-%d')
+    asof_df.to_csv(args.out, index_label='date_str')
+    logger.info(f"AsOf Export: Wrote {len(asof_df)} days to {args.out}.")
+
+if __name__ == "__main__":
+    main()
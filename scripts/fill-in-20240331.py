@@ -11,7 +11,7 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from backend.db_utils import init_db as init_db_main, store_daily_ohlcv_data, DB_PATH
+from backend.db_utils import init_db as init_db_main, store_daily_ohlcv_bulk, DB_PATH
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -53,9 +53,9 @@ def main():
         logger.info("No data specified in the 'data_to_fill' list. Exiting.")
         return
 
-    entries_processed = 0
     entries_failed = 0
 
+    records_to_store = []
     for entry in data_to_fill:
         try:
             # Parse the date string (e.g., "Mar 31, 2024")
@@ -72,10 +72,8 @@ def main():
                 'source': entry["source"],
             }
             
-            logger.info(f"Attempting to store data for {entry['date_str']} (Normalized UTC date: {date_obj_utc_start_of_day.strftime('%Y-%m-%d')})")
-            # store_daily_ohlcv_data expects a datetime object for the date key, and a dict of values
-            store_daily_ohlcv_data(date_obj_utc_start_of_day, ohlcv_values)
-            entries_processed +=1
+            logger.debug(f"Prepared data for {entry['date_str']} (Normalized UTC date: {date_obj_utc_start_of_day.strftime('%Y-%m-%d')})")
+            records_to_store.append({'timestamp': date_obj_utc_start_of_day, **ohlcv_values})
 
         except ValueError as ve:
             logger.error(f"Skipping entry due to ValueError parsing data for '{entry['date_str']}': {ve}")
@@ -84,6 +82,10 @@ def main():
             logger.error(f"An unexpected error occurred processing entry for '{entry['date_str']}': {e}", exc_info=True)
             entries_failed +=1
 
+    # All parsed entries are written in a single transaction
+    entries_processed, entries_rejected = store_daily_ohlcv_bulk(records_to_store)
+    entries_failed += entries_rejected
+
     logger.info(f"Manual data fill script finished. Processed: {entries_processed}, Failed: {entries_failed}")
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 # scripts/generate_historical_json.py
+import argparse
 import datetime as dt
 from datetime import timezone
 import json
@@ -6,7 +7,6 @@ import logging
 import os
 import sys
 import pandas as pd 
-import time 
 
 # Adjust Python path to include the project root
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -17,6 +17,7 @@ if project_root not in sys.path:
 # Backend imports
 from backend.db_utils import init_db as init_db_main, DB_PATH
 from backend.data_sources import get_historical_data_for_indicators, fetch_and_store_daily_ohlcv
+from backend.response_cache import RESPONSE_CACHE_MODES, set_response_cache_mode
 
 # Corrected imports for indicator calculations and services
 from backend.indicator_calculator import (
@@ -139,11 +140,17 @@ def generate_historical_point_data(event_def: dict) -> dict:
     return historical_point
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate historical_data.json for the significant events.")
+    parser.add_argument("--response_cache", choices=RESPONSE_CACHE_MODES, default=None,
+                        help="Provider response cache: 'record' makes reruns reuse raw API responses, 'replay' runs offline from them.")
+    args = parser.parse_args()
+    if args.response_cache:
+        set_response_cache_mode(args.response_cache)
+
     logger.info(f"HISTORICAL_JSON_GENERATOR: Script starting. Using DB_PATH: {os.path.abspath(DB_PATH)}")
     init_db_main() 
 
     all_time_points = []
-    INTER_EVENT_DELAY_SECONDS = 3 
 
     for event_def in SIGNIFICANT_EVENTS_DEFINITIONS:
         logger.info(f"--- Processing: {event_def['name']} ({event_def['date_str']}) ---")
@@ -151,12 +158,8 @@ def main():
         if point_data:
             all_time_points.append(point_data)
         
-        logger.info(f"--- Finished processing: {event_def['name']} ---")
-        if event_def != SIGNIFICANT_EVENTS_DEFINITIONS[-1]: 
-            logger.info(f"Sleeping for {INTER_EVENT_DELAY_SECONDS} seconds before next event...\n")
-            time.sleep(INTER_EVENT_DELAY_SECONDS)
-        else:
-            logger.info("\n")
+        logger.info(f"--- Finished processing: {event_def['name']} ---\n")
+        # No inter-event sleep: provider calls are paced by the shared rate limiters in backend.api_clients
 
     final_json_structure = {"timePoints": all_time_points}
 
@@ -0,0 +1,97 @@
+# scripts/mock_exchange_server.py
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.mock_exchange import MockExchange, MockMarketData, MockProviderBehavior
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def run_benchmark(exchange: MockExchange, years: int):
+    """
+    Cold get_historical_data_for_indicators(today) against the mock exchange: fresh temp DB, no local
+    CSVs, no response cache, so every missing day goes through the real fetch pipeline.
+    """
+    from backend import config, db_utils, csv_data_loader
+    from backend.data_sources import get_historical_data_for_indicators
+    from backend.http_transport import get_transport_metrics
+    from backend.circuit_breaker import get_circuit_breaker_states
+
+    work_dir = tempfile.mkdtemp(prefix='rsiers_bench_')
+    db_utils.DB_PATH = os.path.join(work_dir, 'bench_daily_data.db')
+    db_utils.init_db()
+    # Empty CSV dir: the shared loader must not answer days from ./csv/
+    empty_csv_dir = os.path.join(work_dir, 'csv/')
+    os.makedirs(empty_csv_dir)
+    csv_data_loader._shared_loader = csv_data_loader.CSVDataLoader(empty_csv_dir, os.path.join(work_dir, 'csv_cache/'))
+    config.HTTP_RESPONSE_CACHE_MODE = 'off'
+    exchange.point_clients_here()
+
+    end_date_utc = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    started = time.perf_counter()
+    daily_df = get_historical_data_for_indicators(end_date_utc, years=years)
+    elapsed = time.perf_counter() - started
+
+    logger.info(f"Benchmark: {len(daily_df)} days for a {years}-year window in {elapsed:.2f}s (temp DB {db_utils.DB_PATH}).")
+    logger.info(f"Benchmark: Mock exchange counters: {exchange.stats()}")
+    logger.info(f"Benchmark: Transport metrics: {get_transport_metrics()}")
+    logger.info(f"Benchmark: Circuit breakers: {get_circuit_breaker_states()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the CoinGecko and Kraken endpoints used by backend.api_clients.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--coingecko_port", type=int, default=8781)
+    parser.add_argument("--kraken_port", type=int, default=8782)
+    parser.add_argument("--csv", default=None, help="Serve recorded candles from a Kraken OHLCVT CSV instead of synthetic ones.")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for the synthetic random walk.")
+    parser.add_argument("--latency_ms", type=float, default=0.0, help="Added to every response.")
+    parser.add_argument("--jitter_ms", type=float, default=0.0, help="Random extra latency, uniform in [0, jitter].")
+    parser.add_argument("--rate_limit", type=float, default=None, help="Calls/second per provider before 429 / EAPI:Rate limit exceeded.")
+    parser.add_argument("--rate_limit_burst", type=int, default=3)
+    parser.add_argument("--failure_rate", type=float, default=0.0, help="Share of requests answered with --failure_status.")
+    parser.add_argument("--failure_status", type=int, default=503)
+    parser.add_argument("--outage", choices=['coingecko', 'kraken'], action='append', default=[], help="Provider that fails every request (repeatable).")
+    parser.add_argument("--kraken_max_candles", type=int, default=720, help="Kraken only serves this many most recent daily candles.")
+    parser.add_argument("--benchmark", action='store_true', help="Run a cold get_historical_data_for_indicators against the mock, then exit.")
+    parser.add_argument("--years", type=int, default=2, help="Window size for --benchmark.")
+    args = parser.parse_args()
+
+    market_data = MockMarketData.from_csv(args.csv) if args.csv else MockMarketData.synthetic(seed=args.seed)
+    behaviors = {provider: MockProviderBehavior(latency_seconds=args.latency_ms / 1000, latency_jitter_seconds=args.jitter_ms / 1000,
+                                                rate_limit_per_second=args.rate_limit, rate_limit_burst=args.rate_limit_burst,
+                                                failure_rate=args.failure_rate, failure_status=args.failure_status,
+                                                outage=provider in args.outage)
+                 for provider in ('coingecko', 'kraken')}
+    exchange = MockExchange(market_data, host=args.host,
+                            coingecko_port=0 if args.benchmark else args.coingecko_port,
+                            kraken_port=0 if args.benchmark else args.kraken_port,
+                            kraken_max_candles=args.kraken_max_candles, **behaviors)
+
+    with exchange:
+        if args.benchmark:
+            run_benchmark(exchange, args.years)
+            return
+        print("Point the backend at the mock exchange with these backend/config.py values:")
+        print(f'    COINGECKO_API_BASE_URL = "{exchange.coingecko_base_url}"')
+        print(f'    KRAKEN_API_BASE_URL = "{exchange.kraken_base_url}"')
+        print("Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(60)
+                logger.info(f"Mock exchange counters: {exchange.stats()}")
+        except KeyboardInterrupt:
+            logger.info(f"Stopping. Final counters: {exchange.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# tests/modular/test_asof_indicators.py
+# The as-of engine must give, for each day, what resampling that day's 2-year window and running
+# calculate_indicators_from_ohlc_df gives (the path get_indicator_data takes).
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend import config
+from backend.asof_indicators import compute_asof_indicators, ASOF_COLUMN_NAMES, ASOF_TIMEFRAMES
+from backend.indicator_calculator import resample_ohlc_data, calculate_indicators_from_ohlc_df
+from backend.mock_exchange import MockMarketData
+
+
+@pytest.fixture(scope='module')
+def daily_df():
+    market_data = MockMarketData.synthetic(start_date='2018-01-01', end_date='2021-03-31', seed=11)
+    index = pd.to_datetime(market_data.day_numbers * 86400, unit='s', utc=True)
+    df = pd.DataFrame(market_data.values, columns=['open', 'high', 'low', 'close', 'volume'], index=index)
+    df = df.drop(df.index[300:318]) # Missing days, including a whole week
+    df.iloc[700, df.columns.get_loc('close')] = np.nan
+    return df
+
+
+def _per_day_indicators(daily_df: pd.DataFrame, date) -> dict:
+    window_df = daily_df[(daily_df.index >= date - pd.Timedelta(days=2 * 365)) & (daily_df.index <= date)]
+    results = {}
+    for timeframe_label, rule in ASOF_TIMEFRAMES:
+        if len(window_df) < config.MIN_DAILY_ROWS_FOR_INDICATORS:
+            results[timeframe_label] = {key: None for key in ASOF_COLUMN_NAMES}
+        else:
+            results[timeframe_label] = calculate_indicators_from_ohlc_df(resample_ohlc_data(window_df, rule), timeframe_label)
+    return results
+
+
+def test_asof_values_match_per_day_calculation(daily_df):
+    asof_df = compute_asof_indicators(daily_df)
+    assert len(asof_df) == len(daily_df)
+
+    rng = np.random.default_rng(5)
+    positions = sorted(set(rng.choice(len(daily_df), 40, replace=False).tolist()) | {58, 59, 60, 699, 700, 701, len(daily_df) - 1})
+    for position in positions:
+        date = daily_df.index[position]
+        expected = _per_day_indicators(daily_df, date)
+        for timeframe_label, _ in ASOF_TIMEFRAMES:
+            for key, column_name in ASOF_COLUMN_NAMES.items():
+                value, expected_value = asof_df.loc[date, f"{column_name}_{timeframe_label}"], expected[timeframe_label][key]
+                if expected_value is None:
+                    assert np.isnan(value), (date, timeframe_label, key)
+                else:
+                    assert value == pytest.approx(expected_value, rel=1e-9, abs=1e-9), (date, timeframe_label, key)
+        assert asof_df.loc[date, 'price_at_event'] == pytest.approx(daily_df['close'].iloc[position], nan_ok=True)
+
+
+def test_asof_date_range_and_short_history(daily_df):
+    full_df = compute_asof_indicators(daily_df)
+    ranged_df = compute_asof_indicators(daily_df, start_date='2020-02-10', end_date='2020-03-05')
+    assert ranged_df.index.min().strftime('%Y-%m-%d') == '2020-02-10'
+    assert ranged_df.index.max().strftime('%Y-%m-%d') == '2020-03-05'
+    pd.testing.assert_frame_equal(ranged_df, full_df.loc[ranged_df.index])
+
+    # Too few daily rows in the window: price only, like get_indicator_data
+    early = full_df.iloc[:config.MIN_DAILY_ROWS_FOR_INDICATORS - 1].drop(columns='price_at_event')
+    assert early.isna().all().all()
+    assert full_df['rsi_weekly'].iloc[config.MIN_DAILY_ROWS_FOR_INDICATORS:].notna().any()
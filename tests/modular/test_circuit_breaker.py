@@ -0,0 +1,65 @@
+# tests/modular/test_circuit_breaker.py
+
+import sys
+import os
+
+import pytest
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend import circuit_breaker
+from backend.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+SETTINGS = {'window_size': 10, 'window_seconds': 60, 'min_calls': 4, 'failure_rate_threshold': 0.5,
+            'slow_call_seconds': 1.0, 'cooldown_seconds': 30}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_opens_on_error_rate_and_recovers_through_one_trial(clock):
+    breaker = CircuitBreaker('test', SETTINGS)
+    for ok in (True, False, True):
+        breaker.record(ok, 0.1)
+    assert breaker.state == CLOSED  # Below min_calls, whatever the rate
+
+    breaker.record(False, 0.1)  # 2 of 4 bad
+    assert breaker.state == OPEN and not breaker.allow_request()
+
+    clock[0] += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request() and not breaker.allow_request()  # Only one trial in flight
+    breaker.record(True, 0.1)
+    assert breaker.state == CLOSED and breaker.snapshot()['calls_in_window'] == 1
+
+
+def test_slow_calls_count_against_the_provider_and_failed_trial_reopens(clock):
+    breaker = CircuitBreaker('test', SETTINGS)
+    for latency in (0.1, 0.2, 2.5, 3.0):
+        breaker.record(True, latency)
+    snapshot = breaker.snapshot()
+    assert (snapshot['state'], snapshot['slow_calls'], snapshot['failure_rate']) == (OPEN, 2, 0.5)
+
+    clock[0] += 30
+    assert breaker.allow_request()
+    breaker.record(False, 0.1)
+    assert breaker.state == OPEN and breaker.times_opened == 2
+
+
+def test_old_outcomes_leave_the_window(clock):
+    breaker = CircuitBreaker('test', SETTINGS)
+    breaker.record(False, 0.1)
+    breaker.record(False, 0.1)
+    clock[0] += 61
+    for _ in range(3):
+        breaker.record(True, 0.1)
+    assert breaker.state == CLOSED and breaker.is_healthy()
@@ -0,0 +1,104 @@
+# tests/modular/test_csv_data_loader.py
+
+import sys
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.csv_data_loader import CSVDataLoader
+
+
+@pytest.fixture
+def csv_dirs(tmp_path):
+    csv_dir = tmp_path / 'csv'
+    csv_dir.mkdir()
+    (csv_dir / 'XBTUSD_1440.csv').write_text(
+        "1704067200,42000.0,42500.0,41800.0,42300.0,12.5,100\n"
+        "1704153600,42300.0,45000.0,42200.0,44900.0,20.0,150\n"
+        "bad,1,2,3,4,5,6\n"
+    )
+    return str(csv_dir) + '/', str(tmp_path / 'cache') + '/'
+
+
+def _utc_day(year, month, day):
+    return datetime(year, month, day, tzinfo=timezone.utc)
+
+
+def test_second_load_comes_from_cache(csv_dirs, monkeypatch):
+    csv_dir, cache_dir = csv_dirs
+    first = CSVDataLoader(csv_dir, cache_dir)
+
+    monkeypatch.setattr(CSVDataLoader, '_parse_csv_columns', lambda self, path: pytest.fail('re-parsed an unchanged CSV'))
+    second = CSVDataLoader(csv_dir, cache_dir)
+
+    assert second.df.equals(first.df)
+    assert second.get_ohlcv_for_date(_utc_day(2024, 1, 2))['close'] == 44900.0
+
+
+def test_changed_file_is_reparsed(csv_dirs):
+    csv_dir, cache_dir = csv_dirs
+    CSVDataLoader(csv_dir, cache_dir)
+
+    with open(os.path.join(csv_dir, 'XBTUSD_1440.csv'), 'a') as csv_file:
+        csv_file.write("1704240000,44900.0,45500.0,44000.0,45100.0,9.0,80\n")
+    reloaded = CSVDataLoader(csv_dir, cache_dir)
+
+    assert len(reloaded.df) == 3
+    assert reloaded.get_ohlcv_for_date(_utc_day(2024, 1, 3))['close'] == 45100.0
+
+
+def test_day_index_serves_single_days_and_ranges(csv_dirs):
+    csv_dir, cache_dir = csv_dirs
+    loader = CSVDataLoader(csv_dir, cache_dir)
+
+    assert 'trades' not in loader.df.columns
+    assert loader.get_ohlcv_for_date(datetime(2024, 1, 1, 15, 30, tzinfo=timezone.utc))['open'] == 42000.0
+    assert loader.get_ohlcv_for_date(_utc_day(2023, 12, 31)) is None
+    range_df = loader.get_ohlcv_range(_utc_day(2023, 12, 1), _utc_day(2024, 1, 2))
+    assert range_df['close'].tolist() == [42300.0, 44900.0]
+    assert loader.get_ohlcv_range(_utc_day(2024, 1, 2), _utc_day(2024, 1, 2)).index[0] == _utc_day(2024, 1, 2)
+
+
+def test_reload_merges_only_new_and_changed_files(csv_dirs, monkeypatch):
+    csv_dir, cache_dir = csv_dirs
+    loader = CSVDataLoader(csv_dir, cache_dir)
+    assert loader.reload_changed().empty  # Nothing changed yet
+
+    with open(os.path.join(csv_dir, 'XBTUSD_export_2.csv'), 'w') as csv_file:
+        csv_file.write("1704153600,1,1,1,44950.0,1,1\n"  # Overlaps 2024-01-02: the new file wins
+                       "1704326400,2,2,2,46000.0,1,1\n")
+    parsed = []
+    original_parse = CSVDataLoader._parse_csv_columns
+    monkeypatch.setattr(CSVDataLoader, '_parse_csv_columns', lambda self, path: parsed.append(path) or original_parse(self, path))
+
+    changed_df = loader.reload_changed()
+
+    assert [os.path.basename(path) for path in parsed] == ['XBTUSD_export_2.csv']
+    assert changed_df['close'].tolist() == [44950.0, 46000.0]
+    assert loader.df['close'].tolist() == [42300.0, 44950.0, 46000.0]
+    assert loader.get_ohlcv_for_date(_utc_day(2024, 1, 4))['close'] == 46000.0
+
+    os.remove(os.path.join(csv_dir, 'XBTUSD_export_2.csv'))
+    loader.reload_changed()
+    assert loader.df['close'].tolist() == [42300.0, 44900.0]
+
+
+def test_days_dropped_from_a_changed_file_disappear(csv_dirs):
+    csv_dir, cache_dir = csv_dirs
+    loader = CSVDataLoader(csv_dir, cache_dir)
+
+    with open(os.path.join(csv_dir, 'XBTUSD_1440.csv'), 'w') as csv_file:
+        csv_file.write("1704067200,42000.0,42500.0,41800.0,42350.0,12.5,100\n")  # 2024-01-02 no longer exported
+    changed_df = loader.reload_changed()
+
+    assert changed_df['close'].tolist() == [42350.0]
+    assert loader.df['close'].tolist() == [42350.0]
+    assert loader.get_ohlcv_for_date(_utc_day(2024, 1, 2)) is None
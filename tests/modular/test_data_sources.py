@@ -0,0 +1,169 @@
+# tests/modular/test_data_sources.py
+
+import sys
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend import db_utils, data_sources
+from backend.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Points db_utils at a fresh SQLite file for the duration of one test."""
+    monkeypatch.setattr(db_utils, 'DB_PATH', str(tmp_path / 'test_daily_data.db'))
+    db_utils.init_db()
+    return db_utils.DB_PATH
+
+
+def _utc_day(year, month, day):
+    return datetime(year, month, day, tzinfo=timezone.utc)
+
+
+def _values(price, source):
+    return {'open': price, 'high': price + 1, 'low': price - 1, 'close': price, 'volume': 10.0, 'source': source}
+
+
+def test_concurrent_fetch_keeps_priority_order_and_counts(temp_db, monkeypatch):
+    csv_day, kraken_day, missing_day = _utc_day(2015, 1, 1), _utc_day(2015, 1, 2), _utc_day(2015, 1, 3)
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fake_kraken(date_obj_utc):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return _values(200.0, 'kraken') if date_obj_utc == kraken_day else None
+
+    monkeypatch.setattr(data_sources.get_csv_data_loader(), 'get_ohlcv_for_date',
+                        lambda d: _values(100.0, 'csv') if d == csv_day else None)
+    monkeypatch.setattr(data_sources.kraken_api_client, 'get_ohlcv_for_date', fake_kraken)
+
+    fetched_df, stats = data_sources.fetch_missing_days_concurrently([missing_day, kraken_day, csv_day])
+
+    assert fetched_df['close'].tolist() == [100.0, 200.0]  # Date order, ready for one bulk write
+    assert stats.as_dict()['csv'] == {'ok': 1, 'failed': 2}
+    assert stats.as_dict()['kraken'] == {'ok': 1, 'failed': 1}
+    assert stats.as_dict()['coingecko'] == {'ok': 0, 'failed': 0}  # All three days are too old for CoinGecko
+    assert peak[0] == 2  # Both Kraken lookups overlapped
+    assert db_utils.get_daily_ohlcv_from_db(kraken_day)['source'] == 'kraken'
+    assert db_utils.get_blocked_ohlcv_dates(csv_day, missing_day) == {'2015-01-03'}
+
+
+def test_open_breaker_reorders_and_skips_without_negative_cache(temp_db, monkeypatch):
+    recent_day = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=3)
+    breakers = {name: CircuitBreaker(name, {'min_calls': 1, 'cooldown_seconds': 600}) for name in ('coingecko', 'kraken')}
+    calls = []
+
+    monkeypatch.setattr(data_sources, 'get_circuit_breaker', lambda provider: breakers[provider])
+    monkeypatch.setattr(data_sources.get_csv_data_loader(), 'get_ohlcv_for_date', lambda d: None)
+    monkeypatch.setattr(data_sources.coingecko_api_client, 'get_ohlcv_for_date', lambda d: calls.append('coingecko'))
+    monkeypatch.setattr(data_sources.kraken_api_client, 'get_ohlcv_for_date',
+                        lambda d: calls.append('kraken') or _values(300.0, 'kraken'))
+
+    breakers['coingecko'].record(False, 0.1)  # CoinGecko trips; Kraken alone serves the recent day
+    values, _ = data_sources.fetch_daily_ohlcv(recent_day)
+    assert values['source'] == 'kraken' and calls == ['kraken']
+
+    breakers['kraken'].record(False, 0.1)
+    values, error = data_sources.fetch_daily_ohlcv(recent_day)
+    assert values is None and 'circuit breaker open' in error
+    assert calls == ['kraken']
+    assert db_utils.get_blocked_ohlcv_dates(recent_day, recent_day) == set()
+
+
+def test_days_written_by_another_process_are_picked_up_from_the_db(temp_db, monkeypatch):
+    import pandas as pd
+    from backend.ohlcv_store import get_daily_ohlcv_store
+
+    get_daily_ohlcv_store().ensure_loaded()  # Server's store is built before the loader script runs
+    days = pd.date_range('2014-01-01', '2015-01-01', freq='D', tz='UTC')
+    written_df = pd.DataFrame({'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 10.0}, index=days.delete(100))
+    db_utils.store_daily_ohlcv_bulk(written_df, source='api-loader')
+
+    backfilled = []
+    monkeypatch.setattr(data_sources, 'backfill_missing_daily_ohlcv', lambda dates: backfilled.extend(dates) or pd.DataFrame())
+    daily_df = data_sources.get_historical_data_for_indicators(_utc_day(2015, 1, 1), years=1)
+
+    assert len(daily_df) == len(days) - 1
+    assert backfilled == [days[100].to_pydatetime()]  # Only the day no process has stored goes to the providers
+
+
+def test_unreachable_provider_is_not_negative_cached(temp_db, monkeypatch):
+    import requests
+    from backend import api_clients
+
+    old_day = _utc_day(2015, 2, 1)  # Kraken only
+    class FailingTransport:
+        def get(self, url, **kwargs):
+            raise requests.exceptions.ConnectionError("connection reset")
+    monkeypatch.setattr(api_clients.KrakenAPI, 'transport', property(lambda self: FailingTransport()))
+    monkeypatch.setattr(data_sources.get_csv_data_loader(), 'get_ohlcv_for_date', lambda d: None)
+
+    stats = data_sources.SourceFetchStats()
+    values, error = data_sources.fetch_daily_ohlcv(old_day, stats)
+    assert values is None and 'kraken unavailable' in error
+    assert stats.as_dict()['kraken'] == {'ok': 0, 'failed': 1}
+    assert db_utils.get_blocked_ohlcv_dates(old_day, old_day) == set()
+
+    # Kraken answering without the day's candle is a real miss
+    monkeypatch.setattr(data_sources.kraken_api_client, 'get_ohlcv_for_date', lambda d: None)
+    values, error = data_sources.fetch_daily_ohlcv(old_day)
+    assert values is None and 'in any source' in error
+    assert db_utils.get_blocked_ohlcv_dates(old_day, old_day) == {'2015-02-01'}
+
+
+def test_csv_reload_clears_negative_cache_and_waits_for_the_loader(temp_db, tmp_path, monkeypatch):
+    from backend import csv_data_loader
+
+    monkeypatch.setattr(csv_data_loader, '_shared_loader', None)
+    monkeypatch.setattr(data_sources, '_last_csv_reload_check', 0.0)
+    data_sources.maybe_reload_csv_data()
+    assert csv_data_loader._shared_loader is None  # No request needed CSV data yet: nothing is parsed
+
+    csv_dir = tmp_path / 'csv'
+    csv_dir.mkdir()
+    loader = csv_data_loader.CSVDataLoader(str(csv_dir) + '/', None)
+    monkeypatch.setattr(csv_data_loader, '_shared_loader', loader)
+    day = _utc_day(2015, 3, 1)
+    db_utils.record_ohlcv_fetch_failure(day, 'not found', 3600)
+
+    (csv_dir / 'XBTUSD_1440.csv').write_text(f"{int(day.timestamp())},250.0,260.0,240.0,255.0,5.0,10\n")
+    assert data_sources.reload_csv_data(upsert_to_db=False) == 1
+    assert db_utils.get_blocked_ohlcv_dates(day, day) == set()
+
+
+def test_days_before_krakens_window_skip_the_per_day_kraken_fetch(temp_db, monkeypatch):
+    import pandas as pd
+
+    gap = [_utc_day(2015, 1, 1) + timedelta(days=offset) for offset in range(10)]
+    # Kraken's range response only reaches back to the 7th day and lacks the 9th
+    range_df = pd.DataFrame({'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1.0, 'source': 'kraken'},
+                            index=pd.DatetimeIndex([pd.Timestamp(d) for d in gap[6:]]).drop(pd.Timestamp(gap[8])))
+    range_df.attrs['oldest_served_utc'] = gap[6]
+    per_day_calls = []
+    monkeypatch.setattr(data_sources.get_csv_data_loader(), 'get_ohlcv_range',
+                        lambda start, end: pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'], dtype=float))
+    monkeypatch.setattr(data_sources.get_csv_data_loader(), 'get_ohlcv_for_date', lambda d: None)
+    monkeypatch.setattr(data_sources.kraken_api_client, 'get_ohlcv_range', lambda start, end: range_df)
+    monkeypatch.setattr(data_sources.kraken_api_client, 'get_ohlcv_for_date', lambda d: per_day_calls.append(d))
+
+    backfilled_df = data_sources.backfill_missing_daily_ohlcv(gap)
+
+    assert len(backfilled_df) == 3
+    assert per_day_calls == [gap[8]]  # Only the hole inside Kraken's window is asked for again
+    assert db_utils.get_blocked_ohlcv_dates(gap[0], gap[-1]) == {d.strftime('%Y-%m-%d') for d in gap[:6] + [gap[8]]}
@@ -0,0 +1,106 @@
+# tests/modular/test_db_utils.py
+
+import sys
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend import db_utils
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Points db_utils at a fresh SQLite file for the duration of one test."""
+    monkeypatch.setattr(db_utils, 'DB_PATH', str(tmp_path / 'test_daily_data.db'))
+    db_utils.init_db()
+    return db_utils.DB_PATH
+
+
+def _utc_day(year, month, day):
+    return datetime(year, month, day, tzinfo=timezone.utc)
+
+
+def _values(price, source='test'):
+    return {'open': price, 'high': price + 1, 'low': price - 1, 'close': price, 'volume': 10.0, 'source': source}
+
+
+def test_range_read_returns_rows_and_missing_dates(temp_db):
+    db_utils.store_daily_ohlcv_data(_utc_day(2024, 1, 1), _values(100.0))
+    db_utils.store_daily_ohlcv_data(_utc_day(2024, 1, 2), _values(101.0))
+    db_utils.store_daily_ohlcv_data(_utc_day(2024, 1, 4), _values(103.0))
+
+    ohlcv_df, missing_dates = db_utils.get_daily_ohlcv_range(_utc_day(2024, 1, 1), _utc_day(2024, 1, 5))
+
+    assert list(ohlcv_df.columns) == db_utils.OHLCV_COLUMNS
+    assert all(dtype == np.float64 for dtype in ohlcv_df.dtypes)
+    assert [ts.strftime('%Y-%m-%d') for ts in ohlcv_df.index] == ['2024-01-01', '2024-01-02', '2024-01-04']
+    assert str(ohlcv_df.index.tz) == 'UTC'
+    assert ohlcv_df['close'].tolist() == [100.0, 101.0, 103.0]
+    assert missing_dates == [_utc_day(2024, 1, 3), _utc_day(2024, 1, 5)]
+
+
+def test_range_read_on_empty_table(temp_db):
+    ohlcv_df, missing_dates = db_utils.get_daily_ohlcv_range(_utc_day(2024, 1, 1), _utc_day(2024, 1, 3))
+
+    assert ohlcv_df.empty
+    assert list(ohlcv_df.columns) == db_utils.OHLCV_COLUMNS
+    assert len(missing_dates) == 3
+
+
+def test_bulk_store_normalizes_unix_timestamps_and_skips_bad_rows(temp_db):
+    frame = pd.DataFrame({
+        'timestamp': [1704067200, 1704153600 + 3600, 'not-a-time', 1704240000],  # 2024-01-01, 2024-01-02 01:00, bad, 2024-01-03
+        'open': [1.0, 2.0, 3.0, 'x'],
+        'high': [1.5, 2.5, 3.5, 4.5],
+        'low': [0.5, 1.5, 2.5, 3.5],
+        'close': [1.2, 2.2, 3.2, 4.2],
+        'volume': [10, 20, 30, 40],
+    })
+
+    written, skipped = db_utils.store_daily_ohlcv_bulk(frame, source='csv_import')
+
+    assert (written, skipped) == (2, 2)
+    ohlcv_df, missing_dates = db_utils.get_daily_ohlcv_range(_utc_day(2024, 1, 1), _utc_day(2024, 1, 3))
+    assert ohlcv_df['close'].tolist() == [1.2, 2.2]
+    assert missing_dates == [_utc_day(2024, 1, 3)]
+    assert db_utils.get_daily_ohlcv_from_db(_utc_day(2024, 1, 2))['source'] == 'csv_import'
+
+
+def test_bulk_store_accepts_records_with_per_row_source(temp_db):
+    records = [
+        {'timestamp': _utc_day(2024, 3, 31), **_values(70000.0, source='manual_fill')},
+        {'timestamp': _utc_day(2024, 4, 1), **_values(71000.0, source='manual_fill_other')},
+    ]
+
+    assert db_utils.store_daily_ohlcv_bulk(records) == (2, 0)
+    assert db_utils.get_daily_ohlcv_from_db(_utc_day(2024, 3, 31))['source'] == 'manual_fill'
+    assert db_utils.get_daily_ohlcv_from_db(_utc_day(2024, 4, 1))['close'] == 71000.0
+
+
+def test_fetch_failures_block_until_retry_after_and_clear_on_store(temp_db):
+    day = _utc_day(2024, 2, 29)
+
+    first_retry_after = db_utils.record_ohlcv_fetch_failure(day, 'not found', base_retry_seconds=60)
+    second_retry_after = db_utils.record_ohlcv_fetch_failure(day, 'not found', base_retry_seconds=60)
+    assert second_retry_after - first_retry_after >= 60  # Delay doubles on the second consecutive failure
+    assert db_utils.get_blocked_ohlcv_dates(_utc_day(2024, 2, 1), _utc_day(2024, 3, 1)) == {'2024-02-29'}
+    assert db_utils.get_blocked_ohlcv_dates(_utc_day(2024, 3, 1), _utc_day(2024, 3, 31)) == set()
+
+    db_utils.store_daily_ohlcv_data(day, _values(60000.0))
+    assert db_utils.get_blocked_ohlcv_dates(_utc_day(2024, 2, 1), _utc_day(2024, 3, 1)) == set()
+
+
+def test_fetch_failure_with_elapsed_retry_after_is_not_blocked(temp_db):
+    db_utils.record_ohlcv_fetch_failure(_utc_day(2024, 2, 28), 'not found', base_retry_seconds=-1)
+
+    assert db_utils.get_blocked_ohlcv_dates(_utc_day(2024, 2, 1), _utc_day(2024, 3, 1)) == set()
@@ -0,0 +1,71 @@
+# tests/modular/test_http_transport.py
+
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend import config
+from backend.http_transport import HostTransport
+
+
+@pytest.fixture
+def flaky_server():
+    """Local HTTP/1.1 server that answers 503 for the first request, then 200; records client ports."""
+    state = {'requests': 0, 'client_ports': set()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive
+
+        def do_GET(self):
+            state['requests'] += 1
+            state['client_ports'].add(self.client_address[1])
+            status, body = (503, b'busy') if state['requests'] == 1 else (200, b'{"ok": true}')
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", state
+    server.shutdown()
+
+
+def test_retries_5xx_reuses_connection_and_counts(flaky_server, monkeypatch):
+    base_url, state = flaky_server
+    monkeypatch.setitem(config.PROVIDER_RATE_LIMITS, 'transport_test', {'rate_per_second': 1000.0, 'burst': 10, 'max_concurrency': 1})
+    transport = HostTransport('127.0.0.1', 'transport_test')
+
+    first = transport.get(f"{base_url}/a", retries=2, backoff_base_seconds=0.01)
+    second = transport.get(f"{base_url}/b", retries=2, backoff_base_seconds=0.01)
+
+    assert (first.status_code, second.json()) == (200, {'ok': True})
+    assert state['requests'] == 3
+    assert len(state['client_ports']) == 1  # One kept-alive connection for all three requests
+    metrics = transport.metrics.as_dict()
+    assert metrics['requests'] == 3 and metrics['retries'] == 1
+    assert metrics['status_counts'] == {'200': 2, '503': 1}
+    assert metrics['bytes_received'] == len(b'busy') + 2 * len(b'{"ok": true}')
+
+
+def test_gives_back_last_response_when_retries_run_out(flaky_server, monkeypatch):
+    base_url, state = flaky_server
+    monkeypatch.setitem(config.PROVIDER_RATE_LIMITS, 'transport_test', {'rate_per_second': 1000.0, 'burst': 10, 'max_concurrency': 1})
+    transport = HostTransport('127.0.0.1', 'transport_test')
+
+    response = transport.get(f"{base_url}/a", retries=0)
+
+    assert response.status_code == 503
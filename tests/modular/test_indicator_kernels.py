@@ -0,0 +1,240 @@
+# tests/modular/test_indicator_kernels.py
+# Parity checks: the array kernels must reproduce the former per-bar pandas loops, NaNs included.
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.indicators import rsi, connors_rsi, adaptive_rsi, kernels
+
+
+def _reference_rsi(ohlc_df: pd.DataFrame, period: int) -> pd.Series:
+    """The per-bar .iloc loop rsi.calculate used before the kernel."""
+    close_prices = ohlc_df['close'].copy()
+    delta = close_prices.diff()
+    gain = delta.copy()
+    loss = delta.copy()
+    gain[gain < 0] = 0.0
+    loss[loss > 0] = 0.0
+    loss = loss.abs()
+    avg_gain = pd.Series(np.nan, index=close_prices.index)
+    avg_loss = pd.Series(np.nan, index=close_prices.index)
+    avg_gain.iloc[period] = gain.iloc[1:period+1].mean()
+    avg_loss.iloc[period] = loss.iloc[1:period+1].mean()
+    for i in range(period + 1, len(close_prices)):
+        if pd.isna(avg_gain.iloc[i-1]) or pd.isna(avg_loss.iloc[i-1]):
+            avg_gain.iloc[i] = np.nan
+            avg_loss.iloc[i] = np.nan
+            continue
+        avg_gain.iloc[i] = (avg_gain.iloc[i-1] * (period - 1) + gain.iloc[i]) / period
+        avg_loss.iloc[i] = (avg_loss.iloc[i-1] * (period - 1) + loss.iloc[i]) / period
+    rs = avg_gain / avg_loss.replace(0, np.nan)
+    return 100.0 - (100.0 / (1.0 + rs))
+
+
+def _reference_percent_rank(values: pd.Series, rank_len: int) -> pd.Series:
+    """The rolling().apply() PercentRank connors_rsi.calculate used before the sliding-window kernel."""
+    return values.rolling(window=rank_len, min_periods=rank_len).apply(
+        lambda x_window: pd.Series(x_window).rank(pct=True, method='average').iloc[-1] * 100 if pd.Series(x_window).notna().any() else np.nan,
+        raw=False)
+
+
+def _reference_streaks(ohlc_df: pd.DataFrame) -> pd.Series:
+    """The per-bar .loc streak loop connors_rsi.calculate used before the kernel."""
+    close = ohlc_df['close']
+    close_diff = close.diff()
+    streaks = pd.Series(0.0, index=ohlc_df.index)
+    for i in range(1, len(close)):
+        current_idx = ohlc_df.index[i]
+        prev_idx = ohlc_df.index[i-1]
+        if pd.isna(close_diff.loc[current_idx]):
+            streaks.loc[current_idx] = 0.0
+            continue
+        if close_diff.loc[current_idx] > 0:
+            streaks.loc[current_idx] = streaks.loc[prev_idx] + 1 if streaks.loc[prev_idx] > 0 else 1.0
+        elif close_diff.loc[current_idx] < 0:
+            streaks.loc[current_idx] = streaks.loc[prev_idx] - 1 if streaks.loc[prev_idx] < 0 else -1.0
+        else:
+            streaks.loc[current_idx] = 0.0
+    return streaks
+
+
+def _reference_kama(series: pd.Series, n_period: int, fast_ema_period: int, slow_ema_period: int) -> pd.Series:
+    """adaptive_rsi.calculate_kama's per-bar .loc recurrence before the kernel (debug logging left out)."""
+    change = series.diff(n_period).abs()
+    volatility_sum_abs_diff = series.diff().abs().rolling(window=n_period, min_periods=n_period).sum()
+    er = (change / volatility_sum_abs_diff.replace(0, np.nan)).fillna(0)
+    sc_fast = 2.0 / (fast_ema_period + 1.0)
+    sc_slow = 2.0 / (slow_ema_period + 1.0)
+    smoothing_constant = (er * (sc_fast - sc_slow) + sc_slow)**2
+    kama = pd.Series(np.nan, index=series.index)
+    kama_start_index_pos = series.index.get_loc(smoothing_constant.first_valid_index())
+    kama.iloc[kama_start_index_pos] = series.iloc[kama_start_index_pos]
+    for i in range(kama_start_index_pos + 1, len(series)):
+        idx_current = series.index[i]
+        idx_prev = series.index[i-1]
+        if pd.notna(kama.loc[idx_prev]) and pd.notna(smoothing_constant.loc[idx_current]) and pd.notna(series.loc[idx_current]):
+            kama.loc[idx_current] = kama.loc[idx_prev] + smoothing_constant.loc[idx_current] * (series.loc[idx_current] - kama.loc[idx_prev])
+        else:
+            kama.loc[idx_current] = kama.loc[idx_prev]
+    return kama
+
+
+def _reference_crsi(ohlc_df: pd.DataFrame, rsi_short_len: int, rsi_streak_len: int, rank_len: int) -> pd.Series:
+    """connors_rsi.calculate as it was before the kernels (after its length checks)."""
+    close = ohlc_df['close']
+    rsi1 = _reference_rsi(ohlc_df, rsi_short_len)
+    streaks = _reference_streaks(ohlc_df)
+    rsi_streak = _reference_rsi(pd.DataFrame({'close': streaks.fillna(0)}, index=ohlc_df.index), rsi_streak_len)
+    roc1 = (close.pct_change(periods=1) * 100).fillna(0)
+    return (rsi1 + rsi_streak + _reference_percent_rank(roc1, rank_len)) / 3.0
+
+
+def _close_frame(values) -> pd.DataFrame:
+    index = pd.date_range('2020-01-06', periods=len(values), freq='W-MON', tz='UTC')
+    return pd.DataFrame({'close': np.asarray(values, dtype=np.float64)}, index=index)
+
+
+def _random_walk(n, seed=11):
+    return 1000 + np.cumsum(np.random.default_rng(seed).normal(0, 25, n))
+
+
+def _with_nans(values, positions):
+    values = np.array(values, dtype=np.float64)
+    values[list(positions)] = np.nan
+    return values
+
+
+CLOSE_CASES = {
+    'random_walk': _random_walk(300),
+    'nan_after_seed': _with_nans(_random_walk(120), [60]),
+    'nan_inside_seed_window': _with_nans(_random_walk(80), [3, 7]),
+    'flat_then_rising': np.r_[np.full(20, 5.0), np.arange(20, dtype=np.float64)],  # avg loss 0 -> NaN RSI
+    'streak_like_integers': np.array([0, 1, 2, -1, -2, -3, 0, 1, 0, -1, 1, 2, 3, 4, -1, 0, 0, 1] * 5, dtype=np.float64),
+}
+
+
+def test_formula_kernels_work_row_wise_on_batched_frames():
+    # batch.py feeds (frames, bars) arrays through the same kernels the single-frame modules use
+    rows = np.vstack([_with_nans(_random_walk(60, seed=seed), [5 * seed]) for seed in range(1, 4)])
+    rows[1, 20:30] = rows[1, 19] # Flat stretch: zero diffs, ranges and flows
+    lowest, highest = rows - 1.0, rows + np.where(np.arange(60) % 7 == 0, 0.0, 2.0)
+    formulas = [
+        lambda values, low, high: kernels.first_diff(values),
+        lambda values, low, high: kernels.shift_bars(values, 3),
+        lambda values, low, high: kernels.rate_of_change(values),
+        lambda values, low, high: kernels.stochastic_k(values, low, high),
+        lambda values, low, high: kernels.williams_r_values(high, low, values),
+        lambda values, low, high: kernels.rvi_values(low, values, high - low),
+        lambda values, low, high: kernels.money_flow_index(np.abs(kernels.first_diff(values)), np.abs(kernels.first_diff(high)) * (high > low)),
+        lambda values, low, high: kernels.kama_smoothing_constant(np.abs(kernels.first_diff(values)), high - low, 2, 30),
+    ]
+    for formula in formulas:
+        batched = formula(rows, lowest, highest)
+        for row in range(rows.shape[0]):
+            np.testing.assert_array_equal(batched[row], formula(rows[row], lowest[row], highest[row]))
+
+
+@pytest.mark.parametrize('case', sorted(CLOSE_CASES))
+@pytest.mark.parametrize('period', [2, 3, 14])
+def test_rsi_kernel_matches_reference_loop(case, period):
+    ohlc_df = _close_frame(CLOSE_CASES[case])
+    expected = _reference_rsi(ohlc_df, period)
+    actual = rsi.calculate(ohlc_df, period=period)
+    pd.testing.assert_series_equal(actual, expected, check_exact=False, rtol=1e-12, atol=1e-12, check_names=False)
+
+
+@pytest.mark.parametrize('rank_len', [5, 12, 50])
+def test_percent_rank_kernel_matches_rolling_rank_with_ties_and_nans(rank_len):
+    rng = np.random.default_rng(5)
+    values = pd.Series(np.round(rng.normal(0, 2, 400)))  # Heavy ties
+    values.iloc[[30, 31, 200]] = np.nan
+    expected = _reference_percent_rank(values, rank_len)
+    actual = pd.Series(kernels.rolling_percent_rank(values.to_numpy(), rank_len))
+    pd.testing.assert_series_equal(actual, expected, check_exact=False, rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize('case', ['random_walk', 'streak_like_integers', 'nan_after_seed'])
+def test_connors_rsi_matches_reference(case):
+    ohlc_df = _close_frame(CLOSE_CASES[case])
+    expected = _reference_crsi(ohlc_df, 3, 2, 20)
+    actual = connors_rsi.calculate(ohlc_df, rsi_short_len=3, rsi_streak_len=2, rank_len=20)
+    pd.testing.assert_series_equal(actual, expected, check_exact=False, rtol=1e-12, atol=1e-12, check_names=False)
+
+
+@pytest.mark.parametrize('case', sorted(CLOSE_CASES))
+def test_streak_kernel_matches_reference_loop(case):
+    ohlc_df = _close_frame(CLOSE_CASES[case])
+    actual = pd.Series(kernels.streak_values(ohlc_df['close'].to_numpy()), index=ohlc_df.index)
+    pd.testing.assert_series_equal(actual, _reference_streaks(ohlc_df))
+
+
+KAMA_CASES = dict(CLOSE_CASES, nan_first_bar=_with_nans(_random_walk(60), [0]), nan_late=_with_nans(_random_walk(60), [40, 41, 55]))
+
+
+@pytest.mark.parametrize('case', sorted(KAMA_CASES))
+@pytest.mark.parametrize('kama_n', [3, 10])
+def test_kama_kernel_matches_reference_loop(case, kama_n):
+    series = _close_frame(KAMA_CASES[case])['close']
+    expected = _reference_kama(series, kama_n, 2, 30)
+    actual = adaptive_rsi.calculate_kama(series, n_period=kama_n, fast_ema_period=2, slow_ema_period=30)
+    pd.testing.assert_series_equal(actual, expected, check_exact=False, rtol=1e-12, atol=1e-12, check_names=False)
+
+
+@pytest.mark.parametrize('case', ['random_walk', 'nan_after_seed', 'nan_late'])
+def test_adaptive_rsi_matches_reference(case):
+    ohlc_df = _close_frame(KAMA_CASES[case])
+    expected = _reference_rsi(pd.DataFrame({'close': _reference_kama(ohlc_df['close'], 10, 2, 30)}, index=ohlc_df.index), 14)
+    actual = adaptive_rsi.calculate(ohlc_df, period=14, kama_n=10, kama_fast_ema=2, kama_slow_ema=30)
+    pd.testing.assert_series_equal(actual, expected, check_exact=False, rtol=1e-12, atol=1e-12, check_names=False)
+
+
+def _ohlcv_frame(n, seed=9):
+    close = _random_walk(n, seed)
+    rng = np.random.default_rng(seed + 1)
+    index = pd.date_range('2020-01-06', periods=n, freq='W-MON', tz='UTC')
+    return pd.DataFrame({'open': np.r_[close[0], close[:-1]], 'high': close + rng.uniform(0, 30, n),
+                         'low': close - rng.uniform(0, 30, n), 'close': close, 'volume': rng.uniform(100, 1000, n)}, index=index)
+
+
+def test_shared_context_gives_the_same_indicators_and_reuses_rsi():
+    from backend import indicator_calculator
+    from backend.indicators.context import IndicatorContext
+
+    ohlc_df = _ohlcv_frame(104)
+    context = IndicatorContext(ohlc_df)
+    wrappers = [indicator_calculator.calculate_rsi_series, indicator_calculator.calculate_stoch_rsi_series,
+                indicator_calculator.calculate_mfi_series, indicator_calculator.calculate_crsi_series,
+                indicator_calculator.calculate_williams_r_series, indicator_calculator.calculate_rvi_series,
+                indicator_calculator.calculate_adaptive_rsi_series]
+
+    diff_calls = []
+    original_diff = context.diff
+    context.diff = lambda key='close', periods=1: diff_calls.append(key) or original_diff(key, periods)
+    for wrapper in wrappers:
+        pd.testing.assert_series_equal(wrapper(ohlc_df, 'weekly', context), wrapper(ohlc_df, 'weekly'), check_names=False)
+    assert context.hits > 0  # e.g. StochRSI reused the RSI(14) the RSI indicator computed
+    assert {('rsi', 14), ('rsi', 3), ('gains_losses', 'close'), ('streak', 'close'), 'typical_price', 'bar_range',
+            ('diff', 'close', 1)} <= set(context._memo)
+    assert context.misses == len(context._memo)
+    # One close diff for the whole frame: RSI(14) and RSI(3) gains/losses, the CRSI streak and KAMA all ask for it
+    assert diff_calls.count('close') >= 3
+
+
+def test_context_rejects_a_different_frame():
+    from backend.indicators import rsi
+    from backend.indicators.context import IndicatorContext
+
+    ohlc_df = _ohlcv_frame(40)
+    with pytest.raises(ValueError):
+        rsi.calculate(ohlc_df.copy(), period=14, context=IndicatorContext(ohlc_df))
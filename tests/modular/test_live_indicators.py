@@ -0,0 +1,138 @@
+# tests/modular/test_live_indicators.py
+# Streaming indicator states must give what the full resample + calculate_indicators_from_ohlc_df gives
+# for "today"'s window, for revised candles, new days and after a restart, and what the batched as-of
+# engine gives on the gap/NaN/short-history cases of test_asof_indicators.py.
+
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend import config, db_utils
+from backend.asof_indicators import compute_asof_indicators, ASOF_COLUMN_NAMES, ASOF_TIMEFRAMES
+from backend.indicators import streaming
+from backend.indicator_calculator import resample_ohlc_data, calculate_indicators_from_ohlc_df
+from backend.live_indicators import LiveIndicatorState
+from backend.mock_exchange import MockMarketData
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Points db_utils at a fresh SQLite file for the duration of one test."""
+    monkeypatch.setattr(db_utils, 'DB_PATH', str(tmp_path / 'test_daily_data.db'))
+    db_utils.init_db()
+    return db_utils.DB_PATH
+
+
+@pytest.fixture(scope='module')
+def daily_df():
+    market_data = MockMarketData.synthetic(start_date='2018-01-01', end_date='2020-12-31', seed=13)
+    index = pd.to_datetime(market_data.day_numbers * 86400, unit='s', utc=True)
+    df = pd.DataFrame(market_data.values, columns=['open', 'high', 'low', 'close', 'volume'], index=index)
+    df = df.drop(df.index[850:856]) # A gap inside the windows below
+    df.iloc[880, df.columns.get_loc('close')] = np.nan
+    return df
+
+
+@pytest.fixture(scope='module')
+def asof_daily_df():
+    """The test_asof_indicators.py history: a whole missing week and a NaN close."""
+    market_data = MockMarketData.synthetic(start_date='2018-01-01', end_date='2021-03-31', seed=11)
+    index = pd.to_datetime(market_data.day_numbers * 86400, unit='s', utc=True)
+    df = pd.DataFrame(market_data.values, columns=['open', 'high', 'low', 'close', 'volume'], index=index)
+    df = df.drop(df.index[300:318]) # Missing days, including a whole week
+    df.iloc[700, df.columns.get_loc('close')] = np.nan
+    return df
+
+
+def _window(daily_df: pd.DataFrame, position: int) -> pd.DataFrame:
+    date = daily_df.index[position]
+    return daily_df[(daily_df.index >= date - pd.Timedelta(days=2 * 365)) & (daily_df.index <= date)].copy()
+
+
+def _assert_matches_full_calculation(live_state: LiveIndicatorState, window_df: pd.DataFrame):
+    monthly, weekly = live_state.indicators(window_df)
+    for timeframe_label, rule, results in (('monthly', 'ME', monthly), ('weekly', 'W-MON', weekly)):
+        expected = calculate_indicators_from_ohlc_df(resample_ohlc_data(window_df, rule), timeframe_label)
+        for key, expected_value in expected.items():
+            if expected_value is None:
+                assert results[key] is None, (window_df.index[-1], timeframe_label, key)
+            else:
+                assert results[key] == pytest.approx(expected_value, rel=1e-9, abs=1e-9), (window_df.index[-1], timeframe_label, key)
+
+
+def test_revised_candles_and_new_days_match_full_calculation(temp_db, daily_df):
+    live_state = LiveIndicatorState()
+    rng = np.random.default_rng(2)
+    for position in range(870, 900): # Crosses week and month boundaries and the NaN close
+        window_df = _window(daily_df, position)
+        _assert_matches_full_calculation(live_state, window_df)
+        for _ in range(2): # The day's candle is revised while it is still forming
+            window_df.iloc[-1] = window_df.iloc[-1].to_numpy() * rng.uniform(0.95, 1.05, 5)
+            _assert_matches_full_calculation(live_state, window_df)
+    # Each new day moves the 2-year window's start, so committed bars are rebuilt once per day
+    # and every revision within the day reuses them
+    assert live_state.stats()['weekly']['reused'] >= 2 * 30
+
+
+def test_streaming_matches_asof_engine_on_gaps_nans_and_short_history(temp_db, asof_daily_df):
+    asof_df = compute_asof_indicators(asof_daily_df)
+    first_eligible = config.MIN_DAILY_ROWS_FOR_INDICATORS - 1 # Shortest window get_indicator_data calculates
+    positions = (list(range(first_eligible, first_eligible + 5)) # Short history: few weekly, 2-3 monthly bars
+                 + list(range(295, 305)) # Days around the missing week
+                 + list(range(697, 704)) # The NaN close, committed and as today's candle
+                 + [len(asof_daily_df) - 1])
+    live_state = LiveIndicatorState()
+    for position in positions:
+        window_df = _window(asof_daily_df, position)
+        date = window_df.index[-1]
+        monthly, weekly = live_state.indicators(window_df)
+        for (timeframe_label, _), results in zip(ASOF_TIMEFRAMES, (monthly, weekly)):
+            for key, column_name in ASOF_COLUMN_NAMES.items():
+                expected_value = asof_df.loc[date, f"{column_name}_{timeframe_label}"]
+                if np.isnan(expected_value):
+                    assert results[key] is None, (date, timeframe_label, key)
+                else:
+                    assert results[key] == pytest.approx(expected_value, rel=1e-9, abs=1e-9), (date, timeframe_label, key)
+
+
+def test_saved_state_is_restored_after_restart(temp_db, daily_df):
+    window_df = _window(daily_df, 900)
+    LiveIndicatorState().indicators(window_df)
+
+    restarted = LiveIndicatorState()
+    window_df.iloc[-1, window_df.columns.get_loc('close')] *= 1.02
+    _assert_matches_full_calculation(restarted, window_df)
+    assert restarted.stats() == {'monthly': {'reused': 1, 'extended': 0, 'rebuilt': 0},
+                                 'weekly': {'reused': 1, 'extended': 0, 'rebuilt': 0}}
+
+
+def test_streams_match_pandas_rolling_with_nans():
+    values = pd.Series(np.random.default_rng(4).normal(size=60)).round(1)
+    values[[7, 30, 31]] = np.nan
+    values[40:46] = 0.0
+    expected = {
+        'min': values.rolling(5, min_periods=5).min(),
+        'max': values.rolling(5, min_periods=5).max(),
+        'sum': values.rolling(5, min_periods=5).sum(),
+    }
+    streams = {'min': streaming.RollingExtremeStream(5, 'min'), 'max': streaming.RollingExtremeStream(5, 'max'),
+               'sum': streaming.RollingSumStream(5)}
+    for position, value in enumerate(values.tolist()):
+        for name, stream in streams.items():
+            peeked = stream.peek(value)
+            committed = stream.update(value)
+            assert peeked == pytest.approx(committed, nan_ok=True)
+            assert committed == pytest.approx(expected[name].iloc[position], rel=1e-12, abs=1e-12, nan_ok=True), (name, position)
+        # A snapshot restores to the same state
+        restored = streaming.RollingSumStream(5).load_dict(streams['sum'].to_dict())
+        assert restored.peek(1.5) == pytest.approx(streams['sum'].peek(1.5), nan_ok=True)
@@ -0,0 +1,117 @@
+# tests/modular/test_mock_exchange.py
+
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend import config, db_utils, data_sources
+from backend.api_clients import coingecko_api_client, kraken_api_client, _kraken_rate_limited
+from backend.http_transport import HostTransport
+from backend.mock_exchange import MockExchange, MockMarketData, MockProviderBehavior
+
+
+@pytest.fixture
+def exchange():
+    with MockExchange(MockMarketData.synthetic(start_date='2020-01-01', seed=3)) as mock_exchange:
+        mock_exchange.point_clients_here()
+        yield mock_exchange
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Points db_utils at a fresh SQLite file for the duration of one test."""
+    monkeypatch.setattr(db_utils, 'DB_PATH', str(tmp_path / 'test_daily_data.db'))
+    db_utils.init_db()
+    return db_utils.DB_PATH
+
+
+def _day_values(exchange, day_utc):
+    positions = exchange.market_data.day_slice(int(day_utc.timestamp()) // 86400, int(day_utc.timestamp()) // 86400)
+    return exchange.market_data.values[positions.start]
+
+
+def test_api_clients_read_candles_from_the_mock(exchange):
+    day_utc = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=10)
+    open_, high, low, close, volume = _day_values(exchange, day_utc)
+
+    coingecko_values = coingecko_api_client.get_ohlcv_for_date(day_utc)
+    kraken_values = kraken_api_client.get_ohlcv_for_date(day_utc)
+    kraken_range = kraken_api_client.get_ohlcv_range(day_utc - timedelta(days=4), day_utc)
+
+    assert coingecko_values['close'] == pytest.approx(open_)  # /history reports the price at 00:00
+    assert kraken_values['source'] == 'kraken' and kraken_values['close'] == pytest.approx(close, abs=0.05)
+    assert len(kraken_range) == 5 and kraken_range.index[-1] == day_utc
+    assert kraken_range.attrs['oldest_served_utc'] == day_utc - timedelta(days=4) # No extra leading candle served
+    assert exchange.stats()['kraken']['requests'] == 2
+    assert config.KRAKEN_API_BASE_URL == exchange.kraken_base_url
+
+
+def test_kraken_since_is_exclusive(exchange):
+    day_utc = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=10)
+    day_ts = int(day_utc.timestamp())
+    transport = kraken_api_client.transport
+    for since, first_candle_ts in ((day_ts, day_ts + 86400), (day_ts - 1, day_ts), (day_ts - 86400, day_ts)):
+        candles = transport.get(exchange.kraken_base_url, params={'pair': 'XXBTZUSD', 'interval': 1440, 'since': since}).json()['result']['XXBTZUSD']
+        assert candles[0][0] == first_candle_ts, since
+
+
+def test_rate_limits_and_injected_failures(monkeypatch):
+    monkeypatch.setitem(config.PROVIDER_RATE_LIMITS, 'mock_test', {'rate_per_second': 1000.0, 'burst': 10, 'max_concurrency': 2})
+    kraken_behavior = MockProviderBehavior(rate_limit_per_second=0.001, rate_limit_burst=1)
+    coingecko_behavior = MockProviderBehavior(outage=True)
+    with MockExchange(MockMarketData.synthetic(start_date='2024-01-01'), coingecko=coingecko_behavior, kraken=kraken_behavior) as mock_exchange:
+        transport = HostTransport('mock', 'mock_test')
+        kraken_params = {'pair': 'XXBTZUSD', 'interval': 1440, 'since': 0}
+        first = transport.get(mock_exchange.kraken_base_url, params=kraken_params, retries=0)
+        second = transport.get(mock_exchange.kraken_base_url, params=kraken_params, retries=0)
+        down = transport.get(f"{mock_exchange.coingecko_base_url}/coins/bitcoin/history", params={'date': '01-02-2024'}, retries=0)
+
+        coingecko_behavior.outage = False
+        up = transport.get(f"{mock_exchange.coingecko_base_url}/coins/bitcoin/history", params={'date': '01-02-2024'}, retries=0)
+
+    assert first.json()['error'] == [] and len(first.json()['result']['XXBTZUSD']) > 0
+    assert second.status_code == 200 and second.json()['error'] == ['EAPI:Rate limit exceeded']
+    assert down.status_code == 503
+    assert 'market_data' in up.json()
+    assert mock_exchange.stats()['kraken'] == {'requests': 2, 'ok': 1, 'rate_limited': 1, 'failed': 0}
+
+
+def test_krakens_in_body_rate_limit_counts_against_the_circuit_breaker(monkeypatch):
+    monkeypatch.setitem(config.PROVIDER_RATE_LIMITS, 'mock_throttle_test', {'rate_per_second': 1000.0, 'burst': 10, 'max_concurrency': 1})
+    kraken_behavior = MockProviderBehavior(rate_limit_per_second=0.001, rate_limit_burst=1)
+    with MockExchange(MockMarketData.synthetic(start_date='2024-01-01'), kraken=kraken_behavior) as mock_exchange:
+        transport = HostTransport('mock-throttle', 'mock_throttle_test')
+        kraken_params = {'pair': 'XXBTZUSD', 'interval': 1440, 'since': 0}
+        responses = [transport.get(mock_exchange.kraken_base_url, params=kraken_params, retries=0, rate_limited=_kraken_rate_limited)
+                     for _ in range(4)]
+
+    assert [response.status_code for response in responses] == [200] * 4
+    assert mock_exchange.stats()['kraken']['rate_limited'] == 3
+    # Like a 429: the three throttled 200s are failures, not successes that reset the breaker's window
+    breaker_state = transport.circuit_breaker.snapshot()
+    assert (breaker_state['calls_in_window'], breaker_state['failures']) == (4, 3)
+
+
+def test_gap_wholly_before_krakens_window_costs_one_request(exchange, temp_db, monkeypatch):
+    today_utc = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    gap = [today_utc - timedelta(days=1000 - offset) for offset in range(30)]  # Older than Kraken's 720 candles
+    monkeypatch.setattr(data_sources.get_csv_data_loader(), 'get_ohlcv_range',
+                        lambda start, end: pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'], dtype=float))
+    monkeypatch.setattr(data_sources.get_csv_data_loader(), 'get_ohlcv_for_date', lambda d: None)
+
+    requests_before = exchange.stats()['kraken']['requests']
+    backfilled_df = data_sources.backfill_missing_daily_ohlcv(gap)
+
+    assert backfilled_df.empty
+    assert exchange.stats()['kraken']['requests'] - requests_before == 1  # The range call; no per-day retries
+    assert len(db_utils.get_blocked_ohlcv_dates(gap[0], gap[-1])) == 30
@@ -0,0 +1,76 @@
+# tests/modular/test_ohlcv_ingest.py
+
+import sys
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.ohlcv_ingest import DailyOHLCVAggregator, aggregate_csv_to_daily, list_zip_csv_members, CSV_COLUMNS
+
+
+def _hourly_csv_text(rows):
+    return "".join(f"{ts},{o},{h},{l},{c},{v},3\n" for ts, o, h, l, c, v in rows)
+
+
+def _random_hourly_rows(days=5, seed=7):
+    rng = np.random.default_rng(seed)
+    start = 1704067200  # 2024-01-01 00:00 UTC
+    rows = []
+    for hour in range(days * 24):
+        price = 40000 + rng.normal(0, 500)
+        rows.append((start + hour * 3600, price, price + rng.uniform(0, 100), price - rng.uniform(0, 100), price + rng.normal(0, 50), rng.uniform(0, 5)))
+    return rows
+
+
+def _expected_daily(rows):
+    frame = pd.DataFrame(rows, columns=CSV_COLUMNS)
+    frame.index = pd.to_datetime(frame['timestamp'], unit='s', utc=True)
+    return pd.DataFrame({
+        'open': frame['open'].resample('D').first(), 'high': frame['high'].resample('D').max(),
+        'low': frame['low'].resample('D').min(), 'close': frame['close'].resample('D').last(),
+        'volume': frame['volume'].resample('D').sum(),
+    })
+
+
+def test_chunked_aggregation_matches_whole_file_resample(tmp_path):
+    rows = _random_hourly_rows()
+    csv_path = tmp_path / 'XBTUSD_60.csv'
+    csv_path.write_text(_hourly_csv_text(rows) + "garbage,row,,,,,\n")
+
+    daily_df = aggregate_csv_to_daily(str(csv_path), chunk_rows=7)  # Chunk edges fall mid-day
+
+    expected = _expected_daily(rows)
+    np.testing.assert_allclose(daily_df.to_numpy(), expected.to_numpy())
+    assert list(daily_df.index) == list(expected.index)
+
+
+def test_out_of_order_chunks_keep_first_open_and_last_close():
+    aggregator = DailyOHLCVAggregator()
+    late = pd.DataFrame([['1704110400', '2', '5', '1', '4', '1']], columns=CSV_COLUMNS)  # 12:00
+    early = pd.DataFrame([['1704067200', '3', '3', '0.5', '2.5', '2']], columns=CSV_COLUMNS)  # 00:00
+
+    aggregator.add_chunk(late)
+    aggregator.add_chunk(early)
+
+    assert aggregator.to_frame().iloc[0].tolist() == [3.0, 5.0, 0.5, 4.0, 3.0]
+
+
+def test_reads_member_straight_from_zip(tmp_path):
+    rows = _random_hourly_rows(days=2)
+    zip_path = tmp_path / 'Kraken_OHLCVT.zip'
+    with zipfile.ZipFile(zip_path, 'w') as archive:
+        archive.writestr('XBTUSD_60.csv', _hourly_csv_text(rows))
+        archive.writestr('ETHUSD_60.csv', _hourly_csv_text(rows[:3]))
+
+    assert list_zip_csv_members(str(zip_path), 'XBTUSD_*.csv') == ['XBTUSD_60.csv']
+    daily_df = aggregate_csv_to_daily(str(zip_path), member='XBTUSD_60.csv', chunk_rows=10)
+    np.testing.assert_allclose(daily_df.to_numpy(), _expected_daily(rows).to_numpy())
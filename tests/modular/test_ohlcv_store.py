@@ -0,0 +1,63 @@
+# tests/modular/test_ohlcv_store.py
+
+import sys
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend import db_utils
+from backend.ohlcv_store import get_daily_ohlcv_store
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Points db_utils at a fresh SQLite file for the duration of one test."""
+    monkeypatch.setattr(db_utils, 'DB_PATH', str(tmp_path / 'test_daily_data.db'))
+    db_utils.init_db()
+    return db_utils.DB_PATH
+
+
+def _utc_day(year, month, day):
+    return datetime(year, month, day, tzinfo=timezone.utc)
+
+
+def _frame(start, prices):
+    index = pd.date_range(start=start, periods=len(prices), freq='D', tz='UTC')
+    return pd.DataFrame({'open': prices, 'high': prices, 'low': prices, 'close': prices, 'volume': 1.0},
+                        index=index, dtype=np.float64)
+
+
+def test_window_matches_db_range_read_and_is_a_view(temp_db):
+    db_utils.store_daily_ohlcv_bulk(_frame('2024-01-01', [1.0, 2.0, 3.0]).drop(pd.Timestamp('2024-01-02', tz='UTC')), source='test')
+    store = get_daily_ohlcv_store()
+
+    window_df, missing_dates = store.window(_utc_day(2024, 1, 1), _utc_day(2024, 1, 4))
+    db_df, db_missing_dates = db_utils.get_daily_ohlcv_range(_utc_day(2024, 1, 1), _utc_day(2024, 1, 4))
+
+    pd.testing.assert_frame_equal(window_df, db_df, check_index_type=False)
+    assert missing_dates == db_missing_dates == [_utc_day(2024, 1, 2), _utc_day(2024, 1, 4)]
+    assert np.shares_memory(window_df['close'].to_numpy(), store._values)
+
+
+def test_upsert_appends_and_merges_without_touching_old_views(temp_db):
+    db_utils.store_daily_ohlcv_bulk(_frame('2024-01-01', [1.0, 2.0]), source='test')
+    store = get_daily_ohlcv_store()
+    old_view, _ = store.window(_utc_day(2024, 1, 1), _utc_day(2024, 1, 3))
+
+    store.upsert(_frame('2024-01-03', [3.0]))  # Appended after the last day
+    store.upsert(_frame('2024-01-02', [20.0]))  # Correction inside the held range
+
+    new_view, missing_dates = store.window(_utc_day(2024, 1, 1), _utc_day(2024, 1, 3))
+    assert new_view['close'].tolist() == [1.0, 20.0, 3.0]
+    assert missing_dates == []
+    assert old_view['close'].tolist() == [1.0, 2.0]
@@ -0,0 +1,75 @@
+# tests/modular/test_rate_limiter.py
+
+import sys
+import os
+import time
+import threading
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.rate_limiter import TokenBucketRateLimiter, get_rate_limiter
+
+
+def test_burst_is_served_without_waiting():
+    limiter = TokenBucketRateLimiter('test', rate_per_second=1.0, burst=3)
+
+    waits = [limiter.acquire() for _ in range(3)]
+
+    assert waits == [0.0, 0.0, 0.0]
+
+
+def test_threads_share_the_budget():
+    limiter = TokenBucketRateLimiter('test', rate_per_second=20.0, burst=1)
+    started = time.monotonic()
+
+    threads = [threading.Thread(target=limiter.acquire) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # One token up front, the other four refill at 20/s -> about 0.2s in total
+    assert time.monotonic() - started >= 0.18
+
+
+def test_penalize_holds_callers_back():
+    limiter = TokenBucketRateLimiter('test', rate_per_second=100.0, burst=5)
+
+    limiter.penalize(0.1)
+
+    assert limiter.acquire() >= 0.09
+
+
+def test_callers_queued_during_cooldown_are_spread_out():
+    limiter = TokenBucketRateLimiter('test', rate_per_second=20.0, burst=5)
+    started = time.monotonic()
+    limiter.penalize(0.1)
+    finished = []
+    lock = threading.Lock()
+
+    def call():
+        limiter.acquire()
+        with lock:
+            finished.append(time.monotonic() - started)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # No refill during the cooldown: the four callers go one token interval (0.05s) apart after it
+    finished.sort()
+    assert finished[0] >= 0.1
+    assert finished[-1] >= 0.1 + 0.15
+    assert all(later - earlier >= 0.04 for earlier, later in zip(finished, finished[1:]))
+
+
+def test_registry_returns_one_limiter_per_provider():
+    assert get_rate_limiter('kraken') is get_rate_limiter('kraken')
+    assert get_rate_limiter('kraken') is not get_rate_limiter('coingecko')
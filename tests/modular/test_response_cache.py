@@ -0,0 +1,92 @@
+# tests/modular/test_response_cache.py
+
+import sys
+import os
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend import config
+from backend.http_transport import HostTransport
+from backend.response_cache import ResponseCacheMiss, normalize_request_url
+
+
+@pytest.fixture
+def counting_server():
+    """Local server answering every GET with 200 and a JSON body naming the request number."""
+    state = {'requests': 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            state['requests'] += 1
+            body = f'{{"request": {state["requests"]}}}'.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", state
+    server.shutdown()
+
+
+@pytest.fixture
+def transport(tmp_path, monkeypatch):
+    monkeypatch.setitem(config.PROVIDER_RATE_LIMITS, 'cache_test', {'rate_per_second': 1000.0, 'burst': 10, 'max_concurrency': 1})
+    monkeypatch.setattr(config, 'HTTP_RESPONSE_CACHE_DIR', str(tmp_path / 'response_cache'))
+    monkeypatch.setattr(config, 'HTTP_RESPONSE_CACHE_MODE', 'record')
+    return HostTransport('127.0.0.1', 'cache_test')
+
+
+def test_normalized_url_ignores_param_order_and_location():
+    assert (normalize_request_url('HTTP://Example.com/h?date=01-02-2024&localization=false')
+            == normalize_request_url('http://example.com/h', {'localization': 'false', 'date': '01-02-2024'}))
+
+
+def test_record_serves_repeat_calls_from_disk_then_replay_works_offline(counting_server, transport, monkeypatch):
+    base_url, state = counting_server
+
+    first = transport.get(f"{base_url}/ohlc", params={'since': 1, 'pair': 'X'}, cache_endpoint='kraken_ohlc', cache_permanent=True)
+    again = transport.get(f"{base_url}/ohlc", params={'pair': 'X', 'since': 1}, cache_endpoint='kraken_ohlc', cache_permanent=True)
+    uncached = transport.get(f"{base_url}/ohlc", params={'since': 1, 'pair': 'X'})  # No cache_endpoint: always live
+
+    assert first.json() == again.json() == {'request': 1}
+    assert uncached.json() == {'request': 2}
+    assert state['requests'] == 2
+    assert transport.metrics.as_dict()['cache_hits'] == 1
+
+    monkeypatch.setattr(config, 'HTTP_RESPONSE_CACHE_MODE', 'replay')
+    assert transport.get(f"{base_url}/ohlc", params={'since': 1, 'pair': 'X'}, cache_endpoint='kraken_ohlc').json() == {'request': 1}
+    with pytest.raises(ResponseCacheMiss):
+        transport.get(f"{base_url}/ohlc", params={'since': 2, 'pair': 'X'}, cache_endpoint='kraken_ohlc')
+    assert state['requests'] == 2
+
+
+def test_ttl_entries_expire_and_validator_can_veto(counting_server, transport, monkeypatch):
+    base_url, state = counting_server
+    monkeypatch.setitem(config.HTTP_RESPONSE_CACHE_TTL_SECONDS, 'kraken_ohlc', 60)
+
+    transport.get(f"{base_url}/today", cache_endpoint='kraken_ohlc')
+    assert transport.get(f"{base_url}/today", cache_endpoint='kraken_ohlc').json() == {'request': 1}
+    real_time = time.time
+    monkeypatch.setattr(time, 'time', lambda: real_time() + 61)
+    assert transport.get(f"{base_url}/today", cache_endpoint='kraken_ohlc').json() == {'request': 2}
+
+    transport.get(f"{base_url}/error", cache_endpoint='kraken_ohlc', cache_validator=lambda response: False)
+    assert transport.get(f"{base_url}/error", cache_endpoint='kraken_ohlc', cache_validator=lambda response: False).json() == {'request': 4}
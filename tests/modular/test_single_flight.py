@@ -0,0 +1,83 @@
+# tests/modular/test_single_flight.py
+
+import sys
+import os
+import time
+import threading
+
+import pytest
+
+# Adjust Python path
+current_file_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_file_dir, '..', '..'))
+
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.single_flight import SingleFlight, SingleFlightTimeout
+
+
+def _run_in_threads(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight('test')
+    calls, results = [], []
+
+    def slow_compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return {'price': 42}
+
+    _run_in_threads(5, lambda: results.append(flight.do('2024-01-01', slow_compute, timeout=5)))
+
+    assert len(calls) == 1
+    assert results == [{'price': 42}] * 5
+
+
+def test_leader_exception_reaches_waiters_and_key_is_released():
+    flight = SingleFlight('test')
+    errors = []
+
+    def failing_compute():
+        time.sleep(0.1)
+        raise ValueError('provider down')
+
+    def caller():
+        try:
+            flight.do('2024-01-01', failing_compute, timeout=5)
+        except ValueError as e:
+            errors.append(str(e))
+
+    _run_in_threads(3, caller)
+
+    assert errors == ['provider down'] * 3
+    assert flight.do('2024-01-01', lambda: 'fresh') == 'fresh'  # Nothing is cached after the call ends
+
+
+def test_waiter_times_out():
+    flight = SingleFlight('test')
+    leader_started = threading.Event()
+
+    def slow_compute():
+        leader_started.set()
+        time.sleep(0.3)
+        return 1
+
+    leader = threading.Thread(target=lambda: flight.do('k', slow_compute))
+    leader.start()
+    leader_started.wait()
+    with pytest.raises(SingleFlightTimeout):
+        flight.do('k', slow_compute, timeout=0.05)
+    leader.join()
+
+
+def test_reentrant_call_from_leader_does_not_deadlock():
+    flight = SingleFlight('test')
+
+    assert flight.do('k', lambda: flight.do('k', lambda: 'inner')) == 'inner'